@@ -1,18 +1,33 @@
 import os
+import shutil
+import tempfile
+import threading
+from typing import Literal
+
 from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 import pandas as pd
 
-from config import setup_logger, REPORT_DIR
-from data_loader.csv_loader import CSVLoader
-from data_loader.data_validator import DataValidator
-from data_processor.cleaner import DataCleaner
+from config import setup_logger, REPORT_DIR, SHARED_DATASET, SHARED_DATA_DIR, SQL_BACKEND, SQL_DB_FILE
+from data_loader.loaders import SUPPORTED_EXTENSIONS, file_format
+from data_loader.shared_dataset import SharedDataset
+from data_loader.sql_store import SQLStore
 from data_processor.aggregator import DataAggregator
+from data_processor.sql_backend import SQLAggregator, SQLStatistics
 from data_processor.statistics import StatisticsCalculator
-from visualization.chart_builder import ChartBuilder
-from visualization.report_generator import ReportGenerator
-
-from .schemas import HealthResponse, LoadRequest, MessageResponse, PreviewResponse, StatsResponse, ReportResponse
+from monitoring.metrics import REGISTRY, instrument_endpoint
+from pipeline.engine import Pipeline
+from pipeline.stages import load_stage, preparation_stages
+
+from .schemas import (
+    GroupedStatsResponse,
+    HealthResponse,
+    LoadRequest,
+    MessageResponse,
+    PreviewResponse,
+    ReportResponse,
+    StatsResponse,
+)
 
 app = FastAPI(title="Plateforme Analyse Ventes API", version="1.0.0")
 logger = setup_logger("api")
@@ -22,17 +37,40 @@ STATE = {
     "df_raw": None,
     "df_valid": None,
     "df_clean": None,
+    "version": None,
 }
 
+# Mode multi-workers : df_clean publié une fois, projeté en mémoire par chaque worker
+SHARED = SharedDataset(SHARED_DATA_DIR) if SHARED_DATASET else None
+
+# Backend SQL : df_clean chargé dans une base SQLite indexée, lisible par tous les workers
+SQL_STORE = SQLStore(SQL_DB_FILE) if SQL_BACKEND else None
+
+Backend = Literal["pandas", "sql"]
+
+_REPORT_LOCK = threading.Lock()
+
+# Même moteur que main.py : validate + clean, mémorisés par empreinte du DataFrame
+PREPARATION = Pipeline(preparation_stages(), memory_cache_size=4)
+# Mode partagé : rien n'est mémorisé par worker, seule la version publiée reste en mémoire
+PREPARATION_UNCACHED = Pipeline(preparation_stages(), memory_cache_size=0)
+
 
 def run_pipeline(df: pd.DataFrame) -> pd.DataFrame:
     """Applique validate + clean et met à jour STATE."""
     try:
-        validator = DataValidator(df)
-        df_valid = validator.validate()
-
-        cleaner = DataCleaner(df_valid)
-        df_clean = cleaner.clean() if hasattr(cleaner, "clean") else cleaner.get()
+        pipeline = PREPARATION if SHARED is None else PREPARATION_UNCACHED
+        results = pipeline.run(targets=["df_clean"], df_raw=df)
+        df_valid, df_clean = results["df_valid"], results["df_clean"]
+
+        if SHARED is not None:
+            # Les autres workers verront la nouvelle version à leur prochaine requête ;
+            # les DataFrames intermédiaires ne sont pas conservés en mémoire
+            version = SHARED.publish(df_clean)
+            df, df_valid, df_clean = None, None, SHARED.open(version)
+            STATE["version"] = version
+        if SQL_STORE is not None:
+            SQL_STORE.load(df_clean)
 
         STATE["df_raw"] = df
         STATE["df_valid"] = df_valid
@@ -44,27 +82,94 @@ def run_pipeline(df: pd.DataFrame) -> pd.DataFrame:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _rows_loaded():
+    df_clean = STATE.get("df_clean")
+    return None if df_clean is None else int(len(df_clean))
+
+
+def instrumented(name: str):
+    """Mesure temps / CPU / mémoire / lignes de l'endpoint (voir /metrics)."""
+    return instrument_endpoint(name, REGISTRY, rows_in=_rows_loaded)
+
+
+def sync_shared_dataset() -> None:
+    """Projette la dernière version publiée (par n'importe quel worker) si elle a changé."""
+    version = SHARED.current_version()
+    if version is not None and version != STATE["version"]:
+        # Relit le pointeur si la version a été supprimée entre-temps
+        version, df_clean = SHARED.open_current()
+        STATE["df_clean"] = df_clean
+        STATE["df_raw"] = STATE["df_valid"] = None
+        STATE["version"] = version
+
+
 def require_df_clean() -> pd.DataFrame:
+    if SHARED is not None:
+        sync_shared_dataset()
     df_clean = STATE.get("df_clean")
     if df_clean is None or df_clean.empty:
         raise HTTPException(status_code=400, detail="Aucune donnée chargée. Utilise /load ou /upload d'abord.")
     return df_clean
 
 
+def to_records(df: pd.DataFrame) -> list:
+    """
+    Lignes pour la réponse JSON, au format des fichiers sources : dates
+    "AAAA-MM-JJ" (et non datetime ISO), entiers nullables en int, <NA> -> null.
+    """
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_datetime64_dtype(values.dtype):
+            values = values.dt.strftime("%Y-%m-%d").astype(object).where(values.notna(), None)
+        elif isinstance(values.dtype, pd.Int64Dtype):
+            values = values.astype(object).where(values.notna(), None)
+        out[col] = values
+    return pd.DataFrame(out, index=df.index).to_dict(orient="records")
+
+
+def require_sql_store() -> SQLStore:
+    if SQL_STORE is None:
+        raise HTTPException(status_code=400, detail="Backend SQL désactivé (PMN_SQL_BACKEND=1 pour l'activer).")
+    if not SQL_STORE.exists():
+        raise HTTPException(status_code=400, detail="Aucune donnée chargée. Utilise /load ou /upload d'abord.")
+    return SQL_STORE
+
+
+def aggregator(backend: str):
+    """DataAggregator (pandas) ou SQLAggregator (SQLite) : mêmes méthodes, mêmes résultats."""
+    if backend == "sql":
+        return SQLAggregator(require_sql_store())
+    return DataAggregator(require_df_clean())
+
+
+def statistics(backend: str):
+    if backend == "sql":
+        return SQLStatistics(require_sql_store())
+    return StatisticsCalculator(require_df_clean())
+
+
 @app.get("/health", response_model=HealthResponse)
 def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Mesures des étapes du pipeline et des endpoints (format texte Prometheus)."""
+    return PlainTextResponse(REGISTRY.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/load", response_model=MessageResponse)
+@instrumented("/load")
 def load_csv(payload: LoadRequest):
-    """Charge un CSV depuis un chemin local (serveur)."""
+    """Charge un fichier de ventes (CSV, CSV compressé, Parquet, Excel) depuis un chemin local (serveur)."""
     csv_path = payload.csv_path
     if not os.path.exists(csv_path):
         raise HTTPException(status_code=404, detail=f"Fichier introuvable: {csv_path}")
 
     try:
-        df = CSVLoader(csv_path).load()
+        df = load_stage(csv_path)
         run_pipeline(df)
         return {"message": f"CSV chargé et traité: {csv_path}"}
     except Exception as e:
@@ -73,20 +178,23 @@ def load_csv(payload: LoadRequest):
 
 
 @app.post("/upload", response_model=MessageResponse)
+@instrumented("/upload")
 def upload_csv(file: UploadFile = File(...)):
-    """Upload d'un CSV (cas SaaS classique)."""
-    if not file.filename.lower().endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Le fichier doit être un .csv")
+    """Upload d'un fichier de ventes (cas SaaS classique) : CSV, CSV compressé, Parquet ou Excel."""
+    if file_format(file.filename) is None:
+        raise HTTPException(status_code=400,
+                            detail=f"Format non supporté (attendu : {', '.join(SUPPORTED_EXTENSIONS)})")
 
     tmp_dir = os.path.join(REPORT_DIR, "uploads")
     os.makedirs(tmp_dir, exist_ok=True)
     tmp_path = os.path.join(tmp_dir, file.filename)
 
     try:
+        # Copie par blocs : le fichier n'est jamais entièrement en mémoire
         with open(tmp_path, "wb") as f:
-            f.write(file.file.read())
+            shutil.copyfileobj(file.file, f, 1 << 20)
 
-        df = CSVLoader(tmp_path).load()
+        df = load_stage(tmp_path)
         run_pipeline(df)
         return {"message": f"Fichier uploadé, chargé et traité: {file.filename}"}
     except Exception as e:
@@ -95,68 +203,94 @@ def upload_csv(file: UploadFile = File(...)):
 
 
 @app.get("/data/preview", response_model=PreviewResponse)
+@instrumented("/data/preview")
 def preview(limit: int = 5):
     df_clean = require_df_clean()
     return {
         "rows": int(len(df_clean)),
         "columns": list(df_clean.columns),
-        "preview": df_clean.head(limit).to_dict(orient="records"),
+        "preview": to_records(df_clean.head(limit)),
     }
 
 
 @app.get("/sales/by-category")
-def sales_by_category():
-    df_clean = require_df_clean()
-    agg = DataAggregator(df_clean)
-    out = agg.ventes_par_categorie_et_source()
-    return out.to_dict(orient="records")
+@instrumented("/sales/by-category")
+def sales_by_category(backend: Backend = "pandas"):
+    out = aggregator(backend).ventes_par_categorie_et_source()
+    return to_records(out)
 
 
 @app.get("/sales/by-city")
-def sales_by_city():
-    df_clean = require_df_clean()
-    agg = DataAggregator(df_clean)
-    out = agg.chiffre_affaires_par_ville()
-    return out.to_dict(orient="records")
+@instrumented("/sales/by-city")
+def sales_by_city(backend: Backend = "pandas"):
+    out = aggregator(backend).chiffre_affaires_par_ville()
+    return to_records(out)
 
 
 @app.get("/sales/top-products")
-def top_products(n: int = 10):
-    df_clean = require_df_clean()
-    agg = DataAggregator(df_clean)
-    out = agg.top_produits_par_revenu(n=n)
-    return out.to_dict(orient="records")
+@instrumented("/sales/top-products")
+def top_products(n: int = 10, backend: Backend = "pandas"):
+    out = aggregator(backend).top_produits_par_revenu(n=n)
+    return to_records(out)
 
 
 @app.get("/stats/basic", response_model=StatsResponse)
-def basic_stats():
-    df_clean = require_df_clean()
-    stats = StatisticsCalculator(df_clean).basic_stats()
+@instrumented("/stats/basic")
+def basic_stats(backend: Backend = "pandas"):
+    stats = statistics(backend).basic_stats()
     return {"stats": stats.reset_index().rename(columns={"index": "column"}).to_dict(orient="records")}
 
 
-@app.post("/report/pdf", response_model=ReportResponse)
-def generate_pdf():
-    df_clean = require_df_clean()
+@app.get("/stats/grouped", response_model=GroupedStatsResponse)
+@instrumented("/stats/grouped")
+def grouped_stats(by: str = "categorie", backend: Backend = "pandas"):
+    """Statistiques par groupe ; `by` : une ou plusieurs colonnes séparées par des virgules."""
+    calculator = statistics(backend)
+    keys = [k.strip() for k in by.split(",") if k.strip()]
+    try:
+        stats = calculator.grouped_stats(keys)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # NaN (groupe sans valeur) -> null en JSON
+    stats = stats.astype(object).where(stats.notna(), None)
+    return {"by": keys, "stats": stats.to_dict(orient="records")}
 
-    charts_output = os.path.join(REPORT_DIR, "charts")
-    os.makedirs(charts_output, exist_ok=True)
 
-    # charts
-    cb = ChartBuilder(df_clean)
-    cb.plot_sales_by_category(save_path=os.path.join(charts_output, "ventes_par_categorie.png"))
-    cb.plot_sales_by_city(save_path=os.path.join(charts_output, "ventes_par_ville.png"))
-    cb.plot_top_products(n=10, save_path=os.path.join(charts_output, "top_produits.png"))
+@app.post("/report/pdf", response_model=ReportResponse)
+@instrumented("/report/pdf")
+def generate_pdf():
+    # Import différé : matplotlib / reportlab ne sont chargés que par ce endpoint
+    from visualization.chart_builder import ChartBuilder, _pyplot
+    from visualization.report_generator import ReportGenerator
 
-    # report
+    df_clean = require_df_clean()
     report_file = os.path.join(REPORT_DIR, "rapport_ventes_api.pdf")
-    report = ReportGenerator(df_clean, output_dir=REPORT_DIR)
-    report.generate_pdf_report("rapport_ventes_api.pdf", charts_dir=charts_output)
+    os.makedirs(REPORT_DIR, exist_ok=True)
+
+    # pyplot (état global) n'est pas thread-safe : un rendu à la fois par worker.
+    # Graphiques et PDF sont écrits dans un dossier propre à la requête, puis le
+    # PDF remplace atomiquement le précédent (requêtes concurrentes, autres workers).
+    with _REPORT_LOCK, tempfile.TemporaryDirectory(dir=REPORT_DIR) as workdir:
+        charts_output = os.path.join(workdir, "charts")
+        os.makedirs(charts_output)
+
+        # charts
+        cb = ChartBuilder(df_clean)
+        cb.plot_sales_by_category(save_path=os.path.join(charts_output, "ventes_par_categorie.png"))
+        cb.plot_sales_by_city(save_path=os.path.join(charts_output, "ventes_par_ville.png"))
+        cb.plot_top_products(n=10, save_path=os.path.join(charts_output, "top_produits.png"))
+        _pyplot().close("all")
+
+        # report
+        report = ReportGenerator(df_clean, output_dir=workdir)
+        report.generate_pdf_report("rapport_ventes_api.pdf", charts_dir=charts_output)
+        os.replace(os.path.join(workdir, "rapport_ventes_api.pdf"), report_file)
 
     return {"pdf_path": report_file}
 
 
 @app.get("/report/pdf/download")
+@instrumented("/report/pdf/download")
 def download_pdf():
     pdf_path = os.path.join(REPORT_DIR, "rapport_ventes_api.pdf")
     if not os.path.exists(pdf_path):
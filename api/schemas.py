@@ -24,5 +24,10 @@ class StatsResponse(BaseModel):
     stats: List[Dict[str, Any]] 
 
 
+class GroupedStatsResponse(BaseModel):
+    by: List[str]
+    stats: List[Dict[str, Any]]
+
+
 class ReportResponse(BaseModel):
     pdf_path: str
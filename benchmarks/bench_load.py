@@ -0,0 +1,292 @@
+"""
+Test de charge local de l'API : uvicorn démarré dans un processus séparé,
+jeu de données généré, trafic concurrent mélangé sur les endpoints de lecture
+et la génération de PDF.
+
+Mesures par endpoint et globales : p50 / p95 / p99 (ms), débit (requêtes/s),
+erreurs. `--check` compare aux seuils de `load_thresholds.json` et échoue
+(code 1) si un seuil est dépassé ; `--update-thresholds` les régénère à
+partir du run courant, avec une marge (`--headroom`).
+
+Usage :
+    python -m benchmarks.bench_load --rows 1000000 --concurrency 16 --duration 30
+    python -m benchmarks.bench_load --rows 200000 --check
+    python -m benchmarks.bench_load --rows 200000 --update-thresholds --headroom 1.5
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .data_generator import SalesDataGenerator
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_thresholds.json")
+
+# (méthode, chemin) -> poids dans le trafic
+TRAFFIC_MIX: Dict[Tuple[str, str], int] = {
+    ("GET", "/sales/by-category"): 20,
+    ("GET", "/sales/by-city"): 20,
+    ("GET", "/sales/top-products?n=10"): 20,
+    ("GET", "/stats/basic"): 15,
+    ("GET", "/data/preview?limit=20"): 20,
+    ("POST", "/report/pdf"): 5,
+}
+
+TOTAL = "TOTAL"
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    seconds: float
+    ok: bool
+
+
+def endpoint_name(method: str, path: str) -> str:
+    return f"{method} {path.split('?')[0]}"
+
+
+# --------------------------------------------------------------
+# Serveur
+# --------------------------------------------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(workers: int = 1, env: Optional[Dict[str, str]] = None,
+                   startup_timeout: float = 60.0) -> Iterator[str]:
+    """Démarre `uvicorn api.app:app` et retourne son URL ; arrêté à la sortie du bloc."""
+    import httpx
+
+    port = free_port()
+    cmd = [sys.executable, "-m", "uvicorn", "api.app:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **(env or {})})
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn s'est arrêté (code {process.returncode})")
+            try:
+                if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"API non disponible après {startup_timeout}s")
+            time.sleep(0.2)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# --------------------------------------------------------------
+# Trafic
+# --------------------------------------------------------------
+def run_load(url: str, concurrency: int = 8, duration: float = 20.0, mix: Dict[Tuple[str, str], int] = None,
+             seed: int = 0, timeout: float = 120.0) -> Tuple[List[Sample], float]:
+    """
+    `concurrency` clients enchaînent des requêtes tirées selon `mix` pendant
+    `duration` secondes. Retourne les échantillons et la durée réelle.
+    """
+    import httpx
+
+    mix = mix or TRAFFIC_MIX
+    requests, weights = list(mix), list(mix.values())
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client_loop(index: int):
+        rng = random.Random(seed + index)
+        local = []
+        with httpx.Client(base_url=url, timeout=timeout) as client:
+            while time.perf_counter() < stop_at:
+                method, path = rng.choices(requests, weights)[0]
+                start = time.perf_counter()
+                try:
+                    ok = client.request(method, path).status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                local.append(Sample(endpoint_name(method, path), time.perf_counter() - start, ok))
+        with lock:
+            samples.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Dict[str, float]]:
+    """Par endpoint (et TOTAL) : requêtes, erreurs, débit, p50 / p95 / p99 en ms."""
+    groups: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        groups.setdefault(sample.endpoint, []).append(sample)
+    groups[TOTAL] = samples
+
+    summary = {}
+    for name, group in sorted(groups.items()):
+        latencies = np.array([s.seconds for s in group]) * 1000.0
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+        summary[name] = {
+            "requests": len(group),
+            "errors": sum(not s.ok for s in group),
+            "rps": len(group) / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+        }
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'endpoint':<28} {'requêtes':>9} {'erreurs':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for name, s in summary.items():
+        lines.append(f"{name:<28} {s['requests']:>9} {s['errors']:>8} {s['rps']:>8.1f} "
+                     f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}")
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------
+# Seuils
+# --------------------------------------------------------------
+def _key(rows: int, name: str, concurrency: int = 8, workers: int = 1) -> str:
+    # Latences et débit dépendent autant de la charge et des workers que du volume
+    return f"{rows}:c{concurrency}:w{workers}:{name}"
+
+
+def load_thresholds(path: str = THRESHOLDS_FILE) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_thresholds(summary: Dict[str, Dict[str, float]], rows: int, headroom: float = 1.5,
+                    path: str = THRESHOLDS_FILE, concurrency: int = 8, workers: int = 1) -> str:
+    """Seuils = latences x headroom, débit / headroom (fusionnés dans le fichier)."""
+    thresholds = load_thresholds(path)
+    for name, s in summary.items():
+        thresholds[_key(rows, name, concurrency, workers)] = {
+            "p50_ms": round(s["p50_ms"] * headroom, 1),
+            "p95_ms": round(s["p95_ms"] * headroom, 1),
+            "p99_ms": round(s["p99_ms"] * headroom, 1),
+            "min_rps": round(s["rps"] / headroom, 2),
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(thresholds.items())), f, indent=2)
+        f.write("\n")
+    return path
+
+
+def check_thresholds(summary: Dict[str, Dict[str, float]], rows: int,
+                     path: str = THRESHOLDS_FILE, concurrency: int = 8, workers: int = 1) -> List[str]:
+    """
+    Liste des dépassements : latence au-dessus du seuil, débit en dessous,
+    ou requêtes en erreur. Les seuils sont ceux enregistrés pour le même
+    volume, la même concurrence et le même nombre de workers ; les endpoints
+    sans seuil ne sont pas vérifiés (hormis les erreurs).
+    """
+    thresholds = load_thresholds(path)
+    failures = []
+    for name, s in summary.items():
+        if s["errors"]:
+            failures.append(f"{name}: {s['errors']} requêtes en erreur")
+        limit = thresholds.get(_key(rows, name, concurrency, workers))
+        if limit is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if metric in limit and s[metric] > limit[metric]:
+                failures.append(f"{name}: {metric} {s[metric]:.1f} > {limit[metric]:.1f}")
+        if "min_rps" in limit and s["rps"] < limit["min_rps"]:
+            failures.append(f"{name}: {s['rps']:.2f} req/s < {limit['min_rps']:.2f}")
+    return failures
+
+
+# --------------------------------------------------------------
+# Exécution
+# --------------------------------------------------------------
+def load_test(rows: int, concurrency: int = 8, duration: float = 20.0, workers: int = 1,
+              warmup: int = 1, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Génère le jeu de données, démarre l'API, la charge via /load, puis mesure."""
+    import httpx
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = SalesDataGenerator(seed=seed).write_csv(os.path.join(workdir, "ventes.csv"), rows)
+        # Rapports PDF, uploads et logs du serveur dans le dossier temporaire, pas dans le dépôt
+        env = {"PMN_LOG_LEVEL": "WARNING", "PMN_REPORT_DIR": os.path.join(workdir, "reports"),
+               "PMN_LOG_DIR": os.path.join(workdir, "logs")}
+        if workers > 1:
+            # /load n'est traité que par un worker : les autres lisent le jeu publié
+            env.update(PMN_SHARED_DATASET="1", PMN_SHARED_DATA_DIR=os.path.join(workdir, "shared"))
+
+        with running_server(workers=workers, env=env) as url:
+            with httpx.Client(base_url=url, timeout=600.0) as client:
+                client.post("/load", json={"csv_path": csv_path}).raise_for_status()
+                # Premiers appels hors mesure (imports différés, caches)
+                for _ in range(warmup):
+                    for method, path in TRAFFIC_MIX:
+                        client.request(method, path)
+            samples, elapsed = run_load(url, concurrency=concurrency, duration=duration, seed=seed)
+    return summarize(samples, elapsed)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Test de charge de l'API (uvicorn)")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="Secondes de trafic mesuré")
+    parser.add_argument("--workers", type=int, default=1, help="Workers uvicorn")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="Échoue si un seuil est dépassé")
+    parser.add_argument("--update-thresholds", action="store_true")
+    parser.add_argument("--headroom", type=float, default=1.5)
+    parser.add_argument("--json", help="Écrit aussi le résumé en JSON")
+    args = parser.parse_args(argv)
+
+    summary = load_test(args.rows, concurrency=args.concurrency, duration=args.duration,
+                        workers=args.workers, seed=args.seed)
+    print(f"{args.rows:,} lignes, {args.concurrency} clients, {args.workers} worker(s), {args.duration:g}s")
+    print(format_summary(summary))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    setup = dict(concurrency=args.concurrency, workers=args.workers)
+    if args.update_thresholds:
+        print(f"Seuils mis à jour : {save_thresholds(summary, args.rows, headroom=args.headroom, **setup)}")
+    if args.check:
+        failures = check_thresholds(summary, args.rows, **setup)
+        for line in failures:
+            print(f"RÉGRESSION {line}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Coût du logging sur le chemin critique (temps passé dans le thread appelant).
+
+Scénarios :
+- écriture synchrone (handler fichier) vs file + QueueListener (async)
+- format texte vs JSON
+- aperçu de DataFrame formaté à chaque appel vs aperçu paresseux (Lazy)
+  avec DEBUG désactivé
+
+Usage :
+    python -m benchmarks.bench_logging --records 20000 --compare
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from typing import List
+
+from monitoring.logs import JsonFormatter, attach_queue, detach_queue, preview
+
+from .common import BenchResult, compare_to_baseline, format_results, load_baseline, measure, save_baseline
+from .data_generator import SalesDataGenerator
+
+
+def _logger(name: str, path: str, json_format: bool, async_mode: bool, level: int = logging.DEBUG) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    if async_mode:
+        attach_queue(logger, [handler])
+    else:
+        logger.addHandler(handler)
+    return logger
+
+
+def _close(logger: logging.Logger) -> None:
+    detach_queue(logger)
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+def run_benchmarks(records: int = 20_000, repeat: int = 3) -> List[BenchResult]:
+    df = SalesDataGenerator(seed=0).generate(1_000)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, json_format, async_mode in (
+            ("sync texte", False, False),
+            ("async texte", False, True),
+            ("sync JSON", True, False),
+            ("async JSON", True, True),
+        ):
+            logger = _logger(name.replace(" ", "_"), os.path.join(tmp, f"{name}.log"), json_format, async_mode)
+
+            def emit():
+                for i in range(records):
+                    logger.info("Étape %s : %d lignes", "clean", i, extra={"stage": "clean"})
+
+            seconds, peak, _ = measure(emit, repeat)
+            _close(logger)
+            results.append(BenchResult(f"logging {name}", records, seconds, peak))
+
+        # Aperçus : formatés à chaque appel (INFO) vs paresseux avec DEBUG désactivé
+        previews = max(1, records // 100)
+        logger = _logger("apercu", os.path.join(tmp, "apercu.log"), False, False, level=logging.INFO)
+
+        def eager():
+            for _ in range(previews):
+                logger.info("Aperçu df_clean:\n%s", df.head())
+
+        def lazy():
+            for _ in range(previews):
+                logger.debug("Aperçu df_clean:\n%s", preview(df))
+
+        for name, func in (("aperçu INFO (formaté)", eager), ("aperçu DEBUG paresseux (désactivé)", lazy)):
+            seconds, peak, _ = measure(func, repeat)
+            results.append(BenchResult(f"logging {name}", previews, seconds, peak))
+        _close(logger)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Surcoût du logging dans le thread appelant")
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.records, args.repeat)
+    print(format_results(results, load_baseline()))
+
+    if args.update_baseline:
+        save_baseline(results)
+    failures = compare_to_baseline(results, tolerance=args.tolerance) if args.compare else []
+    for line in failures:
+        print(f"ÉCHEC {line}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Empreinte mémoire : DataFrame pandas classique vs SalesTable compacte.
+
+Le fichier CSV est généré (ou fourni), puis chargé de deux façons :
+- CSVLoader.load() : DataFrame avec colonnes texte en objets Python
+- SalesTable.from_chunks(CSVLoader.iter_chunks()) : codes + dictionnaires
+
+Usage :
+    python -m benchmarks.bench_memory --rows 10000000
+    python -m benchmarks.bench_memory --csv data/ventes_2025.csv --json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from data_loader.csv_loader import CSVLoader
+from data_processor.aggregator import DataAggregator
+from data_processor.sales_table import SalesTable
+
+from .data_generator import SalesDataGenerator
+
+
+def _mib(n_bytes: float) -> str:
+    return f"{n_bytes / 2 ** 20:,.1f} Mio"
+
+
+def memory_report(csv_path: str, chunksize: int = 1_000_000) -> pd.DataFrame:
+    """
+    Octets par colonne pour les deux représentations, plus le temps d'une
+    agrégation (chiffre d'affaires par ville) sur chacune.
+    """
+    df = CSVLoader(csv_path).load()
+    frame_usage = df.memory_usage(deep=True, index=False)
+    start = time.perf_counter()
+    DataAggregator(df).chiffre_affaires_par_ville()
+    frame_seconds = time.perf_counter() - start
+    del df
+
+    table = SalesTable.from_chunks(CSVLoader(csv_path).iter_chunks(chunksize=chunksize))
+    table_usage = table.memory_usage()
+    start = time.perf_counter()
+    DataAggregator(table).chiffre_affaires_par_ville()
+    table_seconds = time.perf_counter() - start
+
+    report = pd.DataFrame({"dataframe": frame_usage, "sales_table": table_usage})
+    report.loc["TOTAL"] = report.sum()
+    report["ratio"] = report["dataframe"] / report["sales_table"]
+    report.attrs.update(rows=len(table), dataframe_seconds=frame_seconds, sales_table_seconds=table_seconds)
+    return report
+
+
+def format_report(report: pd.DataFrame) -> str:
+    lines = [f"{report.attrs['rows']:,} lignes", f"{'colonne':<12} {'DataFrame':>14} {'SalesTable':>14} {'ratio':>8}"]
+    for name, row in report.iterrows():
+        lines.append(f"{name:<12} {_mib(row['dataframe']):>14} {_mib(row['sales_table']):>14} {row['ratio']:>7.1f}x")
+    lines.append(
+        f"chiffre_affaires_par_ville : DataFrame {report.attrs['dataframe_seconds']:.3f}s, "
+        f"SalesTable {report.attrs['sales_table_seconds']:.3f}s"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Empreinte mémoire DataFrame vs SalesTable")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--csv", help="Fichier existant (sinon généré dans un dossier temporaire)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv or SalesDataGenerator().write_csv(os.path.join(tmp, "ventes.csv"), args.rows)
+        report = memory_report(csv_path)
+
+    if args.json:
+        payload = {"rows": report.attrs["rows"], "columns": report.reset_index(names="colonne").to_dict(orient="records"),
+                   "dataframe_seconds": report.attrs["dataframe_seconds"],
+                   "sales_table_seconds": report.attrs["sales_table_seconds"]}
+        print(json.dumps(payload, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Rapports par tranche : ReportGenerator + ChartBuilder par tranche (chacun
+copie et reparcourt le jeu de données) vs BatchReportGenerator (un passage
+groupé, rendu parallèle). Débit en rapports par minute.
+
+Usage :
+    python -m benchmarks.bench_reports --rows 1000000 --slices ville=* categorie=*
+    python -m benchmarks.bench_reports --rows 200000 --workers 1 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from data_loader.data_validator import DataValidator
+from data_processor.cleaner import DataCleaner
+from visualization.batch_reports import BatchReportGenerator, _key_frame, expand_slices
+
+from .data_generator import SalesDataGenerator
+
+
+def per_slice_reports(df, slices, output_dir: str) -> float:
+    """Approche d'origine : un ReportGenerator (+ ChartBuilder) par tranche. Retourne la durée."""
+    from visualization.chart_builder import ChartBuilder
+    from visualization.report_generator import ReportGenerator
+
+    start = time.perf_counter()
+    for s in slices:
+        keys = _key_frame(df, list(s.columns))
+        mask = (keys == dict(s.filters)).all(axis=1)
+        part = df[mask.to_numpy()]
+        charts_dir = os.path.join(output_dir, "charts", s.name)
+        os.makedirs(charts_dir, exist_ok=True)
+        cb = ChartBuilder(part)
+        cb.plot_sales_by_category(save_path=os.path.join(charts_dir, "ventes_par_categorie.png"))
+        cb.plot_sales_by_city(save_path=os.path.join(charts_dir, "ventes_par_ville.png"))
+        cb.plot_top_products(n=10, save_path=os.path.join(charts_dir, "top_produits.png"))
+        plt.close("all")
+        ReportGenerator(part, output_dir=output_dir).generate_pdf_report(s.filename, charts_dir=charts_dir)
+    return time.perf_counter() - start
+
+
+def run_benchmarks(rows: int, specs: Sequence[str], workers: Sequence[int], workdir: str,
+                   with_baseline: bool = True) -> List[Dict[str, float]]:
+    df = DataCleaner(DataValidator(SalesDataGenerator().generate(rows)).validate()).clean()
+    slices = expand_slices(df, specs)
+    results = []
+    if with_baseline:
+        seconds = per_slice_reports(df, slices, os.path.join(workdir, "per_slice"))
+        results.append({"methode": "ReportGenerator par tranche", "rapports": len(slices), "secondes": seconds,
+                        "rapports_par_minute": len(slices) * 60 / seconds})
+    for n in workers:
+        batch = BatchReportGenerator(df, output_dir=os.path.join(workdir, f"batch_{n}"), max_workers=n)
+        result = batch.generate(slices)
+        results.append({"methode": f"BatchReportGenerator ({n} processus)", "rapports": len(result.paths),
+                        "secondes": result.seconds, "rapports_par_minute": result.reports_per_minute})
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Débit de génération des rapports par tranche")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--slices", nargs="+", default=["ville=*", "categorie=*", "mois=*"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--no-baseline", action="store_true", help="Ne mesure pas l'approche par tranche")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_benchmarks(args.rows, args.slices, sorted(set(args.workers)), workdir,
+                                 with_baseline=not args.no_baseline)
+
+    print(f"{args.rows:,} lignes, tranches : {' '.join(args.slices)}")
+    print(f"{'méthode':<36} {'rapports':>9} {'temps (s)':>10} {'rapports/min':>13}")
+    for r in results:
+        print(f"{r['methode']:<36} {r['rapports']:>9} {r['secondes']:>10.2f} {r['rapports_par_minute']:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
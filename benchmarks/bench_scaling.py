@@ -0,0 +1,66 @@
+"""
+Accélération de l'exécution parallèle (ParallelAggregator / ParallelStatistics)
+en fonction du nombre de processus.
+
+Usage :
+    python -m benchmarks.bench_scaling --rows 10000000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import sys
+import time
+
+from data_processor.aggregator import DataAggregator
+from data_processor.parallel import ParallelAggregator, ParallelStatistics
+from data_processor.statistics import StatisticsCalculator
+
+from .data_generator import SalesDataGenerator
+
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Scalabilité multi-cœurs des agrégations et statistiques")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, 16, 32, cpus} & set(range(1, cpus + 1))))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    df = SalesDataGenerator().generate(args.rows)
+
+    def single_core():
+        DataAggregator(df).chiffre_affaires_par_ville()
+        DataAggregator(df).ventes_par_categorie_et_source()
+        DataAggregator(df).top_produits_par_revenu(10)
+        StatisticsCalculator(df).basic_stats()
+
+    reference = _best(single_core, args.repeat)
+    print(f"{args.rows} lignes, {cpus} cœurs disponibles")
+    print(f"{'pandas (1 cœur)':<20} {reference:>9.4f}s {'1.00x':>8}")
+
+    for n in args.workers:
+        # Le pool et la mémoire partagée sont créés une fois, hors mesure
+        with ParallelAggregator(df, n_workers=n) as agg, ParallelStatistics(df, n_workers=n) as stats:
+            def parallel():
+                agg.chiffre_affaires_par_ville()
+                agg.ventes_par_categorie_et_source()
+                agg.top_produits_par_revenu(10)
+                stats.basic_stats()
+
+            parallel()  # démarrage des processus
+            seconds = _best(parallel, args.repeat)
+        print(f"{f'{n} processus':<20} {seconds:>9.4f}s {reference / seconds:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
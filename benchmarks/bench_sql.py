@@ -0,0 +1,121 @@
+"""
+Backend SQL (SQLite indexé) vs pandas : mêmes agrégations, mêmes endpoints.
+
+- chargement en masse de df_clean dans la base (temps, taille du fichier)
+- chaque agrégation / statistique sur les deux backends (temps, pic mémoire
+  Python : pour SQLite, seul le résultat est matérialisé côté Python)
+- endpoints de l'API avec ?backend=pandas puis ?backend=sql
+
+Usage :
+    python -m benchmarks.bench_sql --rows 1000000
+    python -m benchmarks.bench_sql --rows 100000 --json sql.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from data_loader.sql_store import SQLStore
+from data_processor.aggregator import DataAggregator
+from data_processor.sql_backend import SQLAggregator, SQLStatistics
+from data_processor.statistics import StatisticsCalculator
+
+from .common import BenchResult, format_results, measure, results_to_json
+from .data_generator import SalesDataGenerator
+
+
+OPERATIONS = {
+    "chiffre_affaires_par_ville": lambda agg, stats: agg.chiffre_affaires_par_ville(),
+    "ventes_par_categorie_et_source": lambda agg, stats: agg.ventes_par_categorie_et_source(),
+    "top_produits_par_revenu": lambda agg, stats: agg.top_produits_par_revenu(n=10),
+    "pivot_quantite": lambda agg, stats: agg.pivot_quantite("ville", "categorie"),
+    "basic_stats": lambda agg, stats: stats.basic_stats(),
+    "grouped_stats": lambda agg, stats: stats.grouped_stats("ville"),
+}
+
+API_ENDPOINTS = [
+    "/sales/by-category",
+    "/sales/by-city",
+    "/sales/top-products?n=10",
+    "/stats/basic",
+    "/stats/grouped?by=ville",
+]
+
+
+def run_benchmarks(rows: int, workdir: str, repeat: int = 3, with_api: bool = True) -> List[BenchResult]:
+    df = SalesDataGenerator().generate(rows)
+    store = SQLStore(os.path.join(workdir, "ventes.sqlite"))
+
+    results: List[BenchResult] = []
+    seconds, peak, _ = measure(lambda: store.load(df), repeat=1)
+    results.append(BenchResult(f"SQLStore.load ({store.nbytes / 1e6:.0f} Mo sur disque)", rows, seconds, peak))
+
+    backends = {
+        "pandas": (DataAggregator(df), StatisticsCalculator(df)),
+        "sql": (SQLAggregator(store), SQLStatistics(store)),
+    }
+    for name, operation in OPERATIONS.items():
+        for backend, (agg, stats) in backends.items():
+            seconds, peak, _ = measure(lambda: operation(agg, stats), repeat=repeat)
+            results.append(BenchResult(f"{backend}:{name}", rows, seconds, peak))
+
+    if with_api:
+        results += bench_api(df, store, repeat=repeat)
+    return results
+
+
+def bench_api(df, store: SQLStore, repeat: int = 3) -> List[BenchResult]:
+    """Latence d'un GET (meilleur de `repeat`) par endpoint et par backend."""
+    from fastapi.testclient import TestClient
+
+    from api import app as api_app
+
+    api_app.STATE.update(df_raw=None, df_valid=None, df_clean=df)
+    previous, api_app.SQL_STORE = api_app.SQL_STORE, store
+    results = []
+    try:
+        with TestClient(api_app.app) as client:
+            for endpoint in API_ENDPOINTS:
+                for backend in ("pandas", "sql"):
+                    url = f"{endpoint}{'&' if '?' in endpoint else '?'}backend={backend}"
+
+                    def call():
+                        response = client.get(url)
+                        response.raise_for_status()
+
+                    best = float("inf")
+                    for _ in range(max(1, repeat)):
+                        start = time.perf_counter()
+                        call()
+                        best = min(best, time.perf_counter() - start)
+                    results.append(BenchResult(f"API GET {endpoint.split('?')[0]} [{backend}]", len(df), best, 0))
+    finally:
+        api_app.SQL_STORE = previous
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Backend SQLite vs pandas")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-api", action="store_true")
+    parser.add_argument("--json", help="Écrit aussi les résultats bruts en JSON")
+    args = parser.parse_args(argv)
+
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            results += run_benchmarks(rows, workdir, repeat=args.repeat, with_api=not args.no_api)
+
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results_to_json(results), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
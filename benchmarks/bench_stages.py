@@ -0,0 +1,165 @@
+"""
+Benchmarks temps / mémoire de chaque étape du pipeline et des endpoints de l'API.
+
+Usage :
+    python -m benchmarks.bench_stages --rows 10000 100000
+    python -m benchmarks.bench_stages --rows 100000 --compare          # échoue si régression
+    python -m benchmarks.bench_stages --rows 100000 --update-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from data_loader.csv_loader import CSVLoader
+from data_loader.data_validator import DataValidator
+from data_processor.cleaner import DataCleaner
+from data_processor.aggregator import DataAggregator
+from data_processor.statistics import StatisticsCalculator
+
+from .common import (
+    BenchResult, compare_to_baseline, format_results, load_baseline, measure, results_to_json, save_baseline,
+)
+from .data_generator import SalesDataGenerator
+
+
+def bench_pipeline(rows: int, workdir: str, repeat: int = 3, with_charts: bool = True) -> List[BenchResult]:
+    """Mesure chaque étape : chargement, validation, nettoyage, agrégations, statistiques, graphiques, PDF."""
+    from visualization.chart_builder import ChartBuilder
+    from visualization.report_generator import ReportGenerator
+
+    results: List[BenchResult] = []
+
+    def run(name, func, n=repeat):
+        seconds, peak, out = measure(func, repeat=n)
+        results.append(BenchResult(name, rows, seconds, peak))
+        return out
+
+    csv_path = os.path.join(workdir, f"ventes_{rows}.csv")
+    if not os.path.exists(csv_path):
+        SalesDataGenerator().write_csv(csv_path, rows)
+
+    df_raw = run("CSVLoader.load", lambda: CSVLoader(csv_path).load())
+    df_valid = run("DataValidator.validate", lambda: DataValidator(df_raw).validate())
+    df_clean = run("DataCleaner.clean", lambda: DataCleaner(df_valid).clean())
+
+    agg = DataAggregator(df_clean)
+    aggregations = {
+        "groupby_multiple": lambda: agg.groupby_multiple(["ville", "categorie"], {"prix": ["mean"], "quantite": ["sum"]}),
+        "pivot_quantite": lambda: agg.pivot_quantite("ville", "categorie"),
+        "pivot_chiffre_affaires": lambda: agg.pivot_chiffre_affaires("ville", "categorie"),
+        "total_quantite_par_produit": agg.total_quantite_par_produit,
+        "quantity_distribution": agg.quantity_distribution,
+        "chiffre_affaires_par_ville": agg.chiffre_affaires_par_ville,
+        "ventes_par_categorie_et_source": agg.ventes_par_categorie_et_source,
+        "detecter_doublons": agg.detecter_doublons,
+        "taux_valeurs_manquantes": agg.taux_valeurs_manquantes,
+        "top_produits_par_revenu": lambda: agg.top_produits_par_revenu(n=10),
+    }
+    for name, func in aggregations.items():
+        run(f"DataAggregator.{name}", func)
+
+    stats = StatisticsCalculator(df_clean)
+    run("StatisticsCalculator.basic_stats", stats.basic_stats)
+    run("StatisticsCalculator.correlation_matrix", stats.correlation_matrix)
+    run("StatisticsCalculator.grouped_stats", lambda: stats.grouped_stats(["categorie", "ville", "source"]))
+
+    if with_charts:
+        charts_dir = os.path.join(workdir, "charts")
+        os.makedirs(charts_dir, exist_ok=True)
+
+        def charts():
+            cb = ChartBuilder(df_clean)
+            cb.plot_sales_by_category(save_path=os.path.join(charts_dir, "ventes_par_categorie.png"))
+            cb.plot_sales_by_city(save_path=os.path.join(charts_dir, "ventes_par_ville.png"))
+            cb.plot_top_products(n=10, save_path=os.path.join(charts_dir, "top_produits.png"))
+            plt.close("all")
+
+        run("ChartBuilder.charts", charts, n=1)
+        run("ReportGenerator.generate_pdf_report",
+            lambda: ReportGenerator(df_clean, output_dir=workdir).generate_pdf_report("bench.pdf", charts_dir=charts_dir),
+            n=1)
+    return results
+
+
+API_ENDPOINTS = [
+    "/sales/by-category",
+    "/sales/by-city",
+    "/sales/top-products?n=10",
+    "/stats/basic",
+    "/stats/grouped?by=ville",
+    "/data/preview?limit=20",
+]
+
+
+def bench_api(rows: int, concurrency: int = 8, requests_per_endpoint: int = 20) -> List[BenchResult]:
+    """
+    Charge concurrente sur les endpoints de lecture (TestClient, un client par thread).
+    `seconds` = latence moyenne par requête sous charge.
+    """
+    from fastapi.testclient import TestClient
+
+    from api import app as api_app
+
+    api_app.run_pipeline(SalesDataGenerator().generate(rows))
+    results = []
+    for endpoint in API_ENDPOINTS:
+        def call(_):
+            with TestClient(api_app.app) as client:
+                start = time.perf_counter()
+                response = client.get(endpoint)
+                response.raise_for_status()
+                return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(call, range(requests_per_endpoint)))
+        name = f"API GET {endpoint.split('?')[0]} (x{concurrency})"
+        results.append(BenchResult(name, rows, sum(latencies) / len(latencies), 0))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline de ventes")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-charts", action="store_true")
+    parser.add_argument("--no-api", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--compare", action="store_true", help="Échoue si régression vs baseline.json")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", help="Écrit aussi les résultats bruts en JSON")
+    args = parser.parse_args(argv)
+
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            results += bench_pipeline(rows, workdir, repeat=args.repeat, with_charts=not args.no_charts)
+            if not args.no_api:
+                results += bench_api(rows, concurrency=args.concurrency)
+
+    print(format_results(results, load_baseline()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results_to_json(results), f, indent=2)
+    if args.update_baseline:
+        print(f"Référence mise à jour : {save_baseline(results)}")
+    if args.compare:
+        regressions = compare_to_baseline(results, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"RÉGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Temps de démarrage (import à froid) des points d'entrée.
+
+Chaque mesure lance un nouvel interpréteur : c'est le coût payé par un
+worker uvicorn au démarrage ou par la collecte pytest.
+
+Usage :
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --compare
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List
+
+from .common import BenchResult, compare_to_baseline, format_results, load_baseline, save_baseline
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Point d'entrée -> modules lourds qui ne doivent PAS être importés au démarrage
+ENTRY_POINTS = {
+    "api.app": ["matplotlib", "plotly", "reportlab"],
+    "data_processor.statistics": ["matplotlib", "plotly", "reportlab", "fastapi"],
+    "pipeline.stages": ["matplotlib", "plotly", "reportlab"],
+    "visualization.report_generator": ["matplotlib", "plotly", "reportlab"],
+}
+
+
+def heavy_modules_loaded(module: str, forbidden: List[str]) -> List[str]:
+    """Importe `module` dans un interpréteur neuf et retourne les modules interdits chargés."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def import_time(module: str, repeat: int = 5) -> float:
+    """Meilleur temps d'import à froid de `module` (interpréteur compris)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Temps de démarrage des points d'entrée")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = [BenchResult(f"import {m}", 0, import_time(m, args.repeat), 0) for m in ENTRY_POINTS]
+    print(format_results(results, load_baseline()))
+
+    failures = []
+    for module, forbidden in ENTRY_POINTS.items():
+        loaded = heavy_modules_loaded(module, forbidden)
+        if loaded:
+            failures.append(f"{module} importe au démarrage : {', '.join(loaded)}")
+
+    if args.update_baseline:
+        save_baseline(results)
+    if args.compare:
+        failures += compare_to_baseline(results, tolerance=args.tolerance)
+    for line in failures:
+        print(f"ÉCHEC {line}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class BenchResult:
+    """Résultat d'un benchmark : meilleur temps sur `repeat` essais et pic mémoire."""
+
+    name: str
+    rows: int
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.rows}:{self.name}"
+
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> Tuple[float, int, Any]:
+    """
+    Mesure `func` : meilleur temps sur `repeat` exécutions (sans tracemalloc,
+    qui fausserait les temps), puis une exécution sous tracemalloc pour le pic
+    mémoire alloué par l'appel.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[BenchResult], path: str = BASELINE_FILE) -> str:
+    """Fusionne les résultats dans le fichier de référence."""
+    baseline = load_baseline(path)
+    for r in results:
+        baseline[r.key] = {"seconds": round(r.seconds, 6), "peak_bytes": r.peak_bytes}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+    return path
+
+
+def compare_to_baseline(results: List[BenchResult], tolerance: float = 1.5,
+                        path: str = BASELINE_FILE) -> List[str]:
+    """
+    Compare aux valeurs de référence. Retourne la liste des régressions
+    (temps ou mémoire > tolerance x référence) ; les benchmarks sans
+    référence sont ignorés.
+    """
+    baseline = load_baseline(path)
+    regressions = []
+    for r in results:
+        ref = baseline.get(r.key)
+        if ref is None:
+            continue
+        if r.seconds > ref["seconds"] * tolerance:
+            regressions.append(f"{r.key}: {r.seconds:.4f}s > {tolerance} x {ref['seconds']:.4f}s")
+        if r.peak_bytes > ref["peak_bytes"] * tolerance:
+            regressions.append(f"{r.key}: {r.peak_bytes} octets > {tolerance} x {ref['peak_bytes']} octets")
+    return regressions
+
+
+def format_results(results: List[BenchResult], baseline: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    """Tableau texte des résultats (avec ratio par rapport à la référence si fournie)."""
+    lines = [f"{'benchmark':<45} {'lignes':>10} {'temps (s)':>10} {'pic (Mo)':>9} {'vs réf':>7}"]
+    for r in results:
+        ratio = ""
+        if baseline and r.key in baseline and baseline[r.key]["seconds"] > 0:
+            ratio = f"{r.seconds / baseline[r.key]['seconds']:.2f}x"
+        lines.append(f"{r.name:<45} {r.rows:>10} {r.seconds:>10.4f} {r.peak_bytes / 1e6:>9.1f} {ratio:>7}")
+    return "\n".join(lines)
+
+
+def results_to_json(results: List[BenchResult]) -> List[Dict[str, Any]]:
+    return [asdict(r) for r in results]
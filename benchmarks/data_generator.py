@@ -0,0 +1,136 @@
+import argparse
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ["date", "produit", "categorie", "prix", "quantite", "ville", "source"]
+
+_CATEGORIES = [
+    "Fournitures", "Electronique", "Informatique", "Maison", "Jardin", "Sport",
+    "Textile", "Jouets", "Livres", "Beaute", "Alimentation", "Bricolage",
+]
+_CITIES = [
+    "Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Strasbourg",
+    "Montpellier", "Bordeaux", "Lille", "Rennes", "Reims", "Toulon", "Grenoble",
+    "Dijon", "Angers", "Nimes", "Brest", "Tours", "Limoges",
+]
+
+
+class SalesDataGenerator:
+    """
+    Générateur reproductible de données `ventes` réalistes.
+
+    - chaque produit appartient à une catégorie et a un prix de base (log-normal)
+    - popularité des produits et des villes selon une loi de Zipf
+    - quantités Poisson(2) + 1, canal web / magasin
+    - une petite part de doublons et de quantités manquantes, pour exercer
+      DataValidator comme sur les exports réels
+
+    La génération se fait par morceaux de CHUNK_ROWS lignes, chacun avec sa
+    propre graine (SeedSequence) : `generate()` et `write_csv()` produisent
+    les mêmes lignes pour une même graine, quelle que soit la taille totale.
+
+    Parameters
+    ----------
+    n_products, n_cities, n_categories : int
+        Cardinalités des colonnes catégorielles.
+    seed : int
+        Graine globale.
+    start : str
+        Première date ; les dates couvrent `days` jours.
+    duplicate_rate, missing_rate : float
+        Part de lignes dupliquées / de quantités manquantes.
+    """
+
+    CHUNK_ROWS = 1_000_000
+
+    def __init__(self, n_products: int = 500, n_cities: int = 20, n_categories: int = 12, seed: int = 0,
+                 start: str = "2023-01-01", days: int = 730, duplicate_rate: float = 0.001,
+                 missing_rate: float = 0.001):
+        self.seed = seed
+        self.start = np.datetime64(start, "D")
+        self.days = days
+        self.duplicate_rate = duplicate_rate
+        self.missing_rate = missing_rate
+
+        rng = np.random.default_rng(seed)
+        categories = [_CATEGORIES[i % len(_CATEGORIES)] + ("" if i < len(_CATEGORIES) else f"_{i}")
+                      for i in range(n_categories)]
+        self.cities = np.array([_CITIES[i % len(_CITIES)] + ("" if i < len(_CITIES) else f"_{i}")
+                                for i in range(n_cities)])
+        self.products = np.array([f"Produit_{i:07d}" for i in range(n_products)])
+        self.product_category = np.array(categories)[rng.integers(0, n_categories, n_products)]
+        self.product_price = np.round(rng.lognormal(mean=3.0, sigma=1.0, size=n_products), 2)
+        self.product_weights = self._zipf_weights(n_products, 1.1)
+        self.city_weights = self._zipf_weights(n_cities, 0.8)
+
+    @staticmethod
+    def _zipf_weights(n: int, s: float) -> np.ndarray:
+        w = 1.0 / np.arange(1, n + 1) ** s
+        return w / w.sum()
+
+    def _chunk(self, n_rows: int, chunk_index: int) -> pd.DataFrame:
+        rng = np.random.default_rng(np.random.SeedSequence([self.seed, chunk_index]))
+        product_idx = rng.choice(len(self.products), size=n_rows, p=self.product_weights)
+        dates = self.start + rng.integers(0, self.days, n_rows).astype("timedelta64[D]")
+        # ±10 % autour du prix de base (promotions, arrondis)
+        prix = np.round(self.product_price[product_idx] * rng.uniform(0.9, 1.1, n_rows), 2)
+        quantite = (rng.poisson(2.0, n_rows) + 1).astype(np.float64)
+        quantite[rng.random(n_rows) < self.missing_rate] = np.nan
+
+        df = pd.DataFrame(
+            {
+                "date": np.datetime_as_string(dates, unit="D"),
+                "produit": self.products[product_idx],
+                "categorie": self.product_category[product_idx],
+                "prix": prix,
+                "quantite": quantite,
+                "ville": self.cities[rng.choice(len(self.cities), size=n_rows, p=self.city_weights)],
+                "source": np.where(rng.random(n_rows) < 0.55, "web", "magasin"),
+            },
+            columns=COLUMNS,
+        )
+        # Doublons : la ligne reprend la précédente non dupliquée
+        dup = rng.random(n_rows) < self.duplicate_rate
+        dup[0] = False
+        if dup.any():
+            source_row = np.maximum.accumulate(np.where(dup, 0, np.arange(n_rows)))
+            df = df.iloc[source_row].reset_index(drop=True)
+        return df
+
+    def iter_chunks(self, n_rows: int) -> Iterator[pd.DataFrame]:
+        """Produit les `n_rows` lignes par morceaux de CHUNK_ROWS."""
+        for index, start in enumerate(range(0, n_rows, self.CHUNK_ROWS)):
+            yield self._chunk(min(self.CHUNK_ROWS, n_rows - start), index)
+
+    def generate(self, n_rows: int) -> pd.DataFrame:
+        """Jeu de données complet en mémoire (jusqu'à ~10^7 lignes)."""
+        return pd.concat(list(self.iter_chunks(n_rows)), ignore_index=True)
+
+    def write_csv(self, path: str, n_rows: int) -> str:
+        """Écrit le CSV en flux (mémoire constante, adapté à 10^8 lignes)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        for i, chunk in enumerate(self.iter_chunks(n_rows)):
+            chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un CSV de ventes synthétique")
+    parser.add_argument("output")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--categories", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = SalesDataGenerator(args.products, args.cities, args.categories, seed=args.seed)
+    print(generator.write_csv(args.output, args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,36 +2,75 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler
 
+from monitoring.logs import JsonFormatter, attach_queue
+
 # Chemins 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
-REPORT_DIR = os.path.join(BASE_DIR, "reports")
-LOG_DIR = os.path.join(BASE_DIR, "logs")
+# PMN_REPORT_DIR / PMN_LOG_DIR : sorties hors du dépôt (tests de charge, déploiement)
+REPORT_DIR = os.environ.get("PMN_REPORT_DIR", os.path.join(BASE_DIR, "reports"))
+LOG_DIR = os.environ.get("PMN_LOG_DIR", os.path.join(BASE_DIR, "logs"))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache", "pipeline")
+# Limites du cache disque du pipeline (entrées les moins récemment utilisées supprimées d'abord)
+CACHE_MAX_BYTES = int(float(os.environ.get("PMN_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+CACHE_MAX_AGE = float(os.environ.get("PMN_CACHE_MAX_DAYS", "30")) * 86400
+
+# Jeu de données partagé entre workers de l'API (fichiers projetés en mémoire).
+# Activé avec PMN_SHARED_DATASET=1, ex : uvicorn api.app:app --workers 4
+SHARED_DATASET = os.environ.get("PMN_SHARED_DATASET", "0") == "1"
+SHARED_DATA_DIR = os.environ.get("PMN_SHARED_DATA_DIR", os.path.join(BASE_DIR, ".cache", "shared"))
+
+# Base SQLite locale (indexée) alimentée à chaque chargement, interrogée avec ?backend=sql.
+# Activée avec PMN_SQL_BACKEND=1
+SQL_BACKEND = os.environ.get("PMN_SQL_BACKEND", "0") == "1"
+SQL_DB_FILE = os.environ.get("PMN_SQL_DB", os.path.join(BASE_DIR, ".cache", "ventes.sqlite"))
+
+
+def ensure_dirs():
+    """
+    Crée les dossiers de travail si non existants.
+    Appelé à l'usage (pas à l'import) pour garder un démarrage rapide.
+    """
+    for directory in (DATA_DIR, REPORT_DIR, LOG_DIR):
+        os.makedirs(directory, exist_ok=True)
 
-# Créer les dossiers si non existants
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(REPORT_DIR, exist_ok=True)
-os.makedirs(LOG_DIR, exist_ok=True)
 
 #  Fichiers 
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 CSV_FILE = os.path.join(DATA_DIR, "ventes_2025.csv")
 
 #  Logging 
-def setup_logger(name: str = "projet-python-pmn"):
+# PMN_LOG_ASYNC=1 : écriture des logs dans un thread dédié (file + QueueListener)
+# PMN_LOG_JSON=1  : une ligne JSON par enregistrement
+# PMN_LOG_LEVEL   : niveau minimal (DEBUG par défaut ; INFO évite le calcul des aperçus)
+LOG_ASYNC = os.environ.get("PMN_LOG_ASYNC", "0") == "1"
+LOG_JSON = os.environ.get("PMN_LOG_JSON", "0") == "1"
+LOG_LEVEL = os.environ.get("PMN_LOG_LEVEL", "DEBUG").upper()
+
+
+def setup_logger(name: str = "projet-python-pmn", async_mode: bool = None, json_format: bool = None):
     """
     Configure le logger avec rotation de fichiers.
     DEBUG -> INFO -> WARNING -> ERROR
+
+    async_mode / json_format : par défaut, valeurs de PMN_LOG_ASYNC / PMN_LOG_JSON.
     """
+    async_mode = LOG_ASYNC if async_mode is None else async_mode
+    json_format = LOG_JSON if json_format is None else json_format
+
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
 
     # Format du log
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    if json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
 
     # Handler fichier avec rotation
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=3,encoding="utf-8")
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
@@ -43,8 +82,10 @@ def setup_logger(name: str = "projet-python-pmn"):
 
     # Ajouter handlers si pas déjà présent
     if not logger.hasHandlers():
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        if async_mode:
+            attach_queue(logger, [file_handler, console_handler])
+        else:
+            logger.addHandler(file_handler)
+            logger.addHandler(console_handler)
 
     return logger
- 
\ No newline at end of file
@@ -1,18 +1,71 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
 import pandas as pd
 
+from .schema import DateRange, apply_schema, empty_frame, filter_dates, select_columns
+
 
 class CSVLoader:
     """
     The CSV Loader take a CSV file and returns a pandas DataFrame
+
+    Compressed files (.csv.gz, .csv.bz2, .csv.xz, .csv.zip, .csv.zst) are
+    decompressed on the fly while parsing, compression being inferred from
+    the extension (.zst needs the `zstandard` package).
+
+    Optional, as for the other loaders of data_loader.loaders:
+    - `columns`: only these columns are parsed (the others are skipped);
+      a ValueError names the missing ones
+    - `schema`: typed conversion, see data_loader.schema.SALES_SCHEMA
+    - `date_range`: (start, end) inclusive filter on the `date` column,
+      applied chunk by chunk so memory follows the selected rows
     """
 
-    def __init__(self, filepath: str, separator: str = ","):
+    def __init__(self, filepath: str, separator: str = ",", columns: Optional[List[str]] = None,
+                 schema: Optional[Dict[str, str]] = None, date_range: Optional[DateRange] = None):
         self.filepath = filepath
         self.separator = separator
+        self.columns = columns
+        self.schema = schema
+        self.date_range = date_range
+
+    def _usecols(self):
+        # Filtre plutôt que liste : une colonne absente est signalée par select_columns
+        if self.columns is None:
+            return None
+        wanted = set(self.columns)
+        return lambda name: name in wanted
+
+    def _finish(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = select_columns(df, self.columns, os.path.basename(self.filepath))
+        if self.schema is not None:
+            df = apply_schema(df, self.schema)
+        if self.date_range is not None:
+            df = filter_dates(apply_schema(df, {"date": "datetime64[ns]"}), self.date_range)
+        return df
 
     def load(self) -> pd.DataFrame:
         """
         Loads a CSV file using pandas.
         Raises LoaderError if loading fails.
         """
-        return pd.read_csv(self.filepath, sep=self.separator)
\ No newline at end of file
+        if self.date_range is not None:
+            chunks = list(self.iter_chunks())
+            if not chunks:
+                return empty_frame(self.columns or [], self.schema or {})
+            return pd.concat(chunks, ignore_index=True)
+        return self._finish(pd.read_csv(self.filepath, sep=self.separator, usecols=self._usecols()))
+
+    def iter_chunks(self, chunksize: int = 100_000, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Reads the CSV file lazily, `chunksize` rows at a time.
+        Useful for files larger than the available memory.
+        """
+        if self.columns is not None:
+            kwargs.setdefault("usecols", self._usecols())
+        with pd.read_csv(self.filepath, sep=self.separator, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                chunk = self._finish(chunk)
+                if len(chunk) or self.date_range is None:
+                    yield chunk
@@ -0,0 +1,44 @@
+import os
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from .schema import DateRange, apply_schema, filter_dates, select_columns
+
+
+class ExcelLoader:
+    """
+    Loads one sheet of an Excel workbook (.xlsx via openpyxl, .xls via xlrd).
+
+    Excel files cannot be read partially: the sheet is parsed once, only
+    `columns` being converted into the DataFrame; `iter_chunks` then slices
+    the result so callers can treat every format the same way.
+    """
+
+    def __init__(self, filepath: str, columns: Optional[List[str]] = None,
+                 schema: Optional[Dict[str, str]] = None, date_range: Optional[DateRange] = None,
+                 sheet_name: Union[int, str] = 0):
+        self.filepath = filepath
+        self.columns = columns
+        self.schema = schema
+        self.date_range = date_range
+        self.sheet_name = sheet_name
+
+    def load(self) -> pd.DataFrame:
+        try:
+            wanted = None if self.columns is None else set(self.columns)
+            df = pd.read_excel(self.filepath, sheet_name=self.sheet_name,
+                               usecols=None if wanted is None else (lambda name: name in wanted))
+        except ImportError as e:  # moteur optionnel absent
+            raise ImportError(f"La lecture Excel nécessite openpyxl (.xlsx) ou xlrd (.xls) : {e}") from e
+        df = select_columns(df, self.columns, os.path.basename(self.filepath))
+        if self.schema is not None:
+            df = apply_schema(df, self.schema)
+        if self.date_range is not None:
+            df = filter_dates(apply_schema(df, {"date": "datetime64[ns]"}), self.date_range)
+        return df.reset_index(drop=True)
+
+    def iter_chunks(self, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        df = self.load()
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
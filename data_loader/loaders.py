@@ -0,0 +1,67 @@
+"""
+Choix du loader selon l'extension du fichier.
+
+Tous les loaders ont la même interface (`load()`, `iter_chunks(chunksize)`)
+et, via `open_loader`, renvoient les mêmes colonnes aux mêmes types
+(SALES_SCHEMA) quel que soit le format : le reste du pipeline ne voit pas
+de différence entre un CSV, un CSV compressé, un Parquet ou un classeur Excel.
+Le pipeline lit avec `schema=None` et applique SALES_SCHEMA après la
+validation (voir pipeline.stages.clean_stage).
+
+Example:
+    df = open_loader("exports/ventes_2024.parquet", date_range=("2024-01-01", "2024-06-30")).load()
+"""
+import os
+from typing import Dict, List, Optional
+
+from .csv_loader import CSVLoader
+from .excel_loader import ExcelLoader
+from .parquet_loader import ParquetLoader
+from .schema import SALES_COLUMNS, SALES_SCHEMA, DateRange
+
+
+# Extension -> classe de loader ; la compression des CSV est déduite de l'extension
+LOADERS = {
+    ".csv": CSVLoader,
+    ".csv.gz": CSVLoader,
+    ".csv.bz2": CSVLoader,
+    ".csv.xz": CSVLoader,
+    ".csv.zip": CSVLoader,
+    ".csv.zst": CSVLoader,
+    ".parquet": ParquetLoader,
+    ".pq": ParquetLoader,
+    ".xlsx": ExcelLoader,
+    ".xls": ExcelLoader,
+}
+SUPPORTED_EXTENSIONS = tuple(LOADERS)
+
+
+def file_format(path: str) -> Optional[str]:
+    """Extension reconnue de `path` (".csv.gz", ".parquet"...), None sinon."""
+    name = os.path.basename(path).lower()
+    # Les extensions doubles (.csv.gz) avant les simples
+    for ext in sorted(LOADERS, key=len, reverse=True):
+        if name.endswith(ext):
+            return ext
+    return None
+
+
+def open_loader(path: str, columns: Optional[List[str]] = SALES_COLUMNS,
+                schema: Optional[Dict[str, str]] = SALES_SCHEMA, date_range: Optional[DateRange] = None):
+    """
+    Loader adapté au format de `path`.
+
+    - `columns` : colonnes lues (par défaut celles que garde DataCleaner.clean ;
+      None = toutes)
+    - `schema` : types appliqués (None = types déduits par le format)
+    - `date_range` : (début, fin) inclus sur la colonne date ; en Parquet, les
+      row groups hors de l'intervalle ne sont pas lus
+
+    Lève ValueError pour un format non supporté.
+    """
+    ext = file_format(path)
+    if ext is None:
+        raise ValueError(f"Format non supporté : {os.path.basename(path)} "
+                         f"(attendu : {', '.join(SUPPORTED_EXTENSIONS)})")
+    return LOADERS[ext](path, columns=list(columns) if columns is not None else None, schema=schema,
+                        date_range=date_range)
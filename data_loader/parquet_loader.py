@@ -0,0 +1,107 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .schema import DateRange, apply_schema, date_bounds, empty_frame, filter_dates, require_columns
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:  # dépendance optionnelle
+        raise ImportError("La lecture Parquet nécessite pyarrow (pip install pyarrow)") from e
+    return pq
+
+
+def _timestamp(value) -> Optional[pd.Timestamp]:
+    """Statistique min / max d'un row group en Timestamp (date, datetime, texte ISO...)."""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", "replace")
+    try:
+        return pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParquetLoader:
+    """
+    Loads a Parquet file (pyarrow) with pruning:
+
+    - only `columns` are read from disk (column chunks of the other columns
+      are never decompressed)
+    - with `date_range`, the row groups whose min / max statistics on the
+      `date` column fall outside the range are skipped entirely; the rows of
+      the remaining groups are then filtered
+    - `iter_chunks` reads one row group at a time (record batches of at most
+      `chunksize` rows), so memory follows the selected groups, not the file
+
+    Example:
+        ParquetLoader("exports/ventes.parquet", columns=SALES_COLUMNS, schema=SALES_SCHEMA,
+                      date_range=("2024-01-01", "2024-03-31")).load()
+    """
+
+    def __init__(self, filepath: str, columns: Optional[List[str]] = None,
+                 schema: Optional[Dict[str, str]] = None, date_range: Optional[DateRange] = None,
+                 date_column: str = "date"):
+        self.filepath = filepath
+        self.columns = columns
+        self.schema = schema
+        self.date_range = date_range
+        self.date_column = date_column
+
+    def _file(self):
+        pf = _parquet().ParquetFile(self.filepath)
+        require_columns(pf.schema_arrow.names, self.columns, os.path.basename(self.filepath))
+        return pf
+
+    def row_groups(self, parquet_file=None) -> List[int]:
+        """Row groups à lire : tous, sauf ceux que les statistiques de date excluent."""
+        pf = parquet_file or self._file()
+        metadata = pf.metadata
+        start, end = date_bounds(self.date_range)
+        names = pf.schema_arrow.names
+        if (start is None and end is None) or self.date_column not in names:
+            return list(range(metadata.num_row_groups))
+
+        position = names.index(self.date_column)
+        selected = []
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(position).statistics
+            if stats is None or not stats.has_min_max:
+                selected.append(i)  # pas de statistiques : lu et filtré ligne à ligne
+                continue
+            low, high = _timestamp(stats.min), _timestamp(stats.max)
+            if low is not None and high is not None and low.tzinfo is None and high.tzinfo is None:
+                if (end is not None and low > end) or (start is not None and high < start):
+                    continue
+            selected.append(i)
+        return selected
+
+    def _finish(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.schema is not None:
+            df = apply_schema(df, self.schema)
+        if self.date_range is not None:
+            df = filter_dates(apply_schema(df, {self.date_column: "datetime64[ns]"}), self.date_range,
+                              column=self.date_column)
+        return df
+
+    def load(self) -> pd.DataFrame:
+        pf = self._file()
+        groups = self.row_groups(pf)
+        if not groups:
+            return empty_frame(self.columns or pf.schema_arrow.names, self.schema or {})
+        table = pf.read_row_groups(groups, columns=self.columns)
+        return self._finish(table.to_pandas()).reset_index(drop=True)
+
+    def iter_chunks(self, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        pf = self._file()
+        groups = self.row_groups(pf)
+        if not groups:
+            return
+        for batch in pf.iter_batches(batch_size=chunksize, row_groups=groups, columns=self.columns):
+            chunk = self._finish(batch.to_pandas())
+            if len(chunk) or self.date_range is None:
+                yield chunk
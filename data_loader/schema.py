@@ -0,0 +1,132 @@
+"""
+Schéma typé du jeu de ventes, commun à tous les formats d'import.
+
+Les colonnes sont celles que garde DataCleaner.clean ; chaque loader ne lit
+que celles-ci (par défaut) et les convertit aux mêmes types, quel que soit
+le format source (CSV compressé ou non, Parquet, Excel).
+
+Dans le pipeline (pipeline.stages), le schéma n'est appliqué qu'après la
+validation : une valeur invalide devient manquante après le ffill de
+DataValidator, au lieu d'être remplacée par la valeur de la ligne précédente.
+"""
+import logging
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("data_loader.schema")
+
+
+SALES_SCHEMA: Dict[str, str] = {
+    "date": "datetime64[ns]",
+    "produit": "object",
+    "categorie": "object",
+    "prix": "float64",
+    "quantite": "Int64",
+    "ville": "object",
+    "source": "object",
+}
+SALES_COLUMNS = list(SALES_SCHEMA)
+
+DateLike = Union[str, pd.Timestamp]
+DateRange = Tuple[Optional[DateLike], Optional[DateLike]]
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    if values.dtype == object:
+        return values
+    # Catégories, nombres (codes produit lus comme entiers)... -> str, manquants conservés
+    text = values.astype(object)
+    mask = text.notna()
+    text[mask] = text[mask].astype(str)
+    return text
+
+
+def _as_datetime(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_dtype(values.dtype):
+        return values.astype("datetime64[ns]")
+    # Conversion par valeur distincte (cache) : peu de dates différentes par fichier
+    return pd.to_datetime(values, errors="coerce", cache=True).astype("datetime64[ns]")
+
+
+def _as_integer(values: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(values, errors="coerce")
+    if pd.api.types.is_integer_dtype(numbers.dtype):
+        return numbers.astype("Int64")
+    # Entier nullable : les manquants restent <NA>, les valeurs non entières sont invalides
+    numbers = numbers.astype("float64")
+    return numbers.where(np.isfinite(numbers) & (numbers % 1 == 0)).astype("Int64")
+
+
+_CONVERTERS = {
+    "datetime64[ns]": _as_datetime,
+    "Int64": _as_integer,
+    "float64": lambda values: pd.to_numeric(values, errors="coerce").astype("float64"),
+    "object": _as_text,
+}
+
+
+def require_columns(available: Sequence[str], columns: Optional[Sequence[str]], source: str) -> None:
+    """ValueError explicite si des colonnes attendues manquent dans `source`."""
+    missing = [c for c in (columns or []) if c not in set(available)]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {source} : {', '.join(missing)} "
+                         f"(colonnes présentes : {', '.join(map(str, available))})")
+
+
+def select_columns(df: pd.DataFrame, columns: Optional[Sequence[str]], source: str) -> pd.DataFrame:
+    """`columns` de `df`, dans cet ordre (None = toutes) ; voir require_columns."""
+    if columns is None:
+        return df
+    require_columns(list(df.columns), columns, source)
+    return df if list(df.columns) == list(columns) else df[list(columns)]
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str] = SALES_SCHEMA) -> pd.DataFrame:
+    """
+    Convertit les colonnes présentes de `df` aux types de `schema` (valeurs
+    invalides -> manquantes, comptées dans un avertissement : dates ou prix
+    illisibles, quantités non entières) ; les colonnes hors schéma sont
+    laissées telles quelles.
+    """
+    for col, dtype in schema.items():
+        if col in df.columns and df[col].dtype != dtype:
+            converted = _CONVERTERS[dtype](df[col])
+            rejected = int((converted.isna() & df[col].notna()).sum())
+            if rejected:
+                logger.warning("Colonne %s : %d valeur(s) invalide(s) pour le type %s, remplacée(s) par NA",
+                               col, rejected, dtype)
+            df[col] = converted
+    return df
+
+
+def date_bounds(date_range: Optional[DateRange]) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """Bornes incluses (None = pas de borne) ; une fin "2025-03-31" couvre toute la journée."""
+    if date_range is None:
+        return None, None
+    start, end = date_range
+    start = pd.Timestamp(start) if start is not None else None
+    if end is not None:
+        end = pd.Timestamp(end)
+        if end == end.normalize():
+            end = end + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+    return start, end
+
+
+def filter_dates(df: pd.DataFrame, date_range: Optional[DateRange], column: str = "date") -> pd.DataFrame:
+    """Lignes dont `column` (déjà typée) est dans `date_range` ; dates manquantes exclues."""
+    start, end = date_bounds(date_range)
+    if start is None and end is None:
+        return df
+    mask = df[column].notna()
+    if start is not None:
+        mask &= df[column] >= start
+    if end is not None:
+        mask &= df[column] <= end
+    return df[mask.to_numpy()]
+
+
+def empty_frame(columns: Sequence[str], schema: Dict[str, str] = SALES_SCHEMA) -> pd.DataFrame:
+    """DataFrame vide aux colonnes et types attendus (aucune ligne sélectionnée)."""
+    return pd.DataFrame({c: pd.Series(dtype=schema.get(c, "object")) for c in columns})
@@ -0,0 +1,166 @@
+import json
+import os
+import shutil
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SharedDataset:
+    """
+    Jeu de données publié une fois sur disque, au format colonnaire, et
+    projeté en mémoire (memmap, lecture seule) par chaque processus.
+
+    Tous les workers uvicorn qui ouvrent la même version partagent les
+    mêmes pages du cache du système : une seule copie physique des
+    données, quel que soit le nombre de workers.
+
+    Organisation du dossier :
+        <root>/CURRENT              pointeur vers la dernière version
+        <root>/<version>/meta.json  schéma (noms, types, catégories)
+        <root>/<version>/<i>.npy    une colonne par fichier
+
+    - colonnes numériques / booléennes : tableau NumPy tel quel
+    - entiers nullables (Int64) : valeurs int64 + masque booléen des manquants
+    - dates : int64 (nanosecondes), relues en datetime64[ns]
+    - texte : codes de dictionnaire (int8/16/32) + catégories dans meta.json,
+      relues en `pd.Categorical` sans copie des codes
+
+    Le pointeur est remplacé atomiquement (`os.replace`) après l'écriture
+    complète d'une version : un lecteur voit l'ancienne ou la nouvelle
+    version, jamais une version partielle.
+
+    Parameters
+    ----------
+    root : str
+        Dossier partagé par les workers.
+    keep_versions : int
+        Nombre de versions conservées (les plus anciennes sont supprimées ;
+        sous POSIX, un worker qui les projette encore garde ses pages).
+    grace_seconds : float
+        Une version n'est supprimée que si elle est remplacée depuis au moins
+        ce délai : un worker qui vient de lire l'ancien pointeur peut encore
+        l'ouvrir.
+    """
+
+    POINTER = "CURRENT"
+
+    def __init__(self, root: str, keep_versions: int = 2, grace_seconds: float = 30.0):
+        self.root = root
+        self.keep_versions = keep_versions
+        self.grace_seconds = grace_seconds
+
+    # --------------------------------------------------------------
+    # Écriture
+    # --------------------------------------------------------------
+    def publish(self, df: pd.DataFrame) -> str:
+        """Écrit `df` dans une nouvelle version et la rend courante."""
+        os.makedirs(self.root, exist_ok=True)
+        version = f"{time.time_ns():020d}-{os.getpid()}"
+        tmp_dir = os.path.join(self.root, f".{version}.tmp")
+        os.makedirs(tmp_dir)
+
+        columns = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            entry = {"name": str(name), "file": f"{i}.npy"}
+            if pd.api.types.is_datetime64_dtype(series.dtype):
+                entry["kind"] = "datetime"
+                values = series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            elif isinstance(series.dtype, pd.Int64Dtype):
+                # Entier nullable : valeurs int64 + masque des manquants (fichier à part)
+                entry["kind"] = "nullable_int"
+                entry["mask"] = f"{i}.mask.npy"
+                mask = series.isna().to_numpy()
+                np.save(os.path.join(tmp_dir, entry["mask"]), mask, allow_pickle=False)
+                values = series.to_numpy(dtype=np.int64, na_value=0)
+            elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                entry["kind"] = "numeric"
+                values = series.to_numpy()
+            else:
+                entry["kind"] = "category"
+                cat = pd.Categorical(series)
+                entry["categories"] = [str(c) for c in cat.categories]
+                values = cat.codes
+            np.save(os.path.join(tmp_dir, entry["file"]), np.ascontiguousarray(values), allow_pickle=False)
+            columns.append(entry)
+
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": version, "rows": int(len(df)), "columns": columns}, f)
+        os.rename(tmp_dir, os.path.join(self.root, version))
+
+        pointer_tmp = os.path.join(self.root, f".{self.POINTER}.{os.getpid()}")
+        with open(pointer_tmp, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(pointer_tmp, os.path.join(self.root, self.POINTER))
+
+        self._cleanup(version)
+        return version
+
+    def _cleanup(self, current: str) -> None:
+        versions = sorted(
+            d for d in os.listdir(self.root)
+            if not d.startswith(".") and os.path.isdir(os.path.join(self.root, d))
+        )
+        now_ns = time.time_ns()
+        for old, successor in zip(versions[:-self.keep_versions], versions[1:]):
+            # Le nom d'une version commence par sa date de publication (ns)
+            replaced_for = (now_ns - int(successor.split("-")[0])) / 1e9
+            if old != current and replaced_for >= self.grace_seconds:
+                shutil.rmtree(os.path.join(self.root, old), ignore_errors=True)
+
+    # --------------------------------------------------------------
+    # Lecture
+    # --------------------------------------------------------------
+    def current_version(self) -> Optional[str]:
+        """Version courante (None si rien n'a encore été publié)."""
+        try:
+            with open(os.path.join(self.root, self.POINTER), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def open_current(self, retries: int = 3) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """
+        (version, DataFrame) de la version courante ; (None, None) si rien
+        n'est publié. Si la version lue disparaît avant d'être ouverte
+        (supprimée après une publication concurrente), le pointeur est relu.
+        """
+        for attempt in range(retries + 1):
+            version = self.current_version()
+            if version is None:
+                return None, None
+            try:
+                return version, self.open(version)
+            except FileNotFoundError:
+                if attempt == retries:
+                    raise
+        return None, None  # pragma: no cover
+
+    def open(self, version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Projette une version (la courante par défaut) en DataFrame.
+        Les colonnes sont des vues en lecture seule sur les fichiers.
+        """
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Aucun jeu de données publié dans {self.root}")
+        directory = os.path.join(self.root, version)
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        data = {}
+        for entry in meta["columns"]:
+            values = np.load(os.path.join(directory, entry["file"]), mmap_mode="r", allow_pickle=False)
+            if entry["kind"] == "datetime":
+                values = values.view("datetime64[ns]")
+            elif entry["kind"] == "nullable_int":
+                mask = np.load(os.path.join(directory, entry["mask"]), mmap_mode="r", allow_pickle=False)
+                values = pd.arrays.IntegerArray(values, mask)
+            elif entry["kind"] == "category":
+                values = pd.Categorical.from_codes(values, categories=pd.Index(entry["categories"], dtype=object))
+            data[entry["name"]] = values
+        # copy=False : pas de consolidation en blocs 2D, les memmaps restent partagés
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,145 @@
+import math
+import os
+import sqlite3
+import tempfile
+from typing import List, Sequence
+
+import pandas as pd
+
+
+def _sqrt(x):
+    return math.sqrt(x) if x is not None and x >= 0 else None
+
+
+class SQLStore:
+    """
+    Jeu de données nettoyé stocké dans une base SQLite locale (fichier unique,
+    module `sqlite3` de la bibliothèque standard), indexée sur les colonnes
+    de regroupement / filtre (index couvrants, voir INDEXES).
+
+    - chargement en masse dans un fichier temporaire (journal et fsync
+      désactivés pendant l'écriture), index + ANALYZE, puis remplacement
+      atomique (`os.replace`) : un lecteur voit l'ancienne ou la nouvelle base ;
+      chaque appel a son propre fichier temporaire (chargements concurrents
+      depuis les threads de l'API : le dernier remplacement l'emporte)
+    - lecture par connexions en lecture seule, une par requête : la base est
+      lisible par plusieurs threads / processus (workers uvicorn) à la fois
+
+    Example:
+        store = SQLStore(".cache/ventes.sqlite")
+        store.load(df_clean)
+        store.query("SELECT ville, SUM(prix * quantite) AS revenu FROM ventes GROUP BY ville")
+    """
+
+    # Index par colonne de regroupement / filtre ; les mesures (prix, quantite)
+    # y sont ajoutées pour que les GROUP BY lisent l'index seul (index couvrant)
+    INDEXES = {
+        "date": ("date",),
+        "ville": ("ville", "prix", "quantite"),
+        "categorie": ("categorie", "source", "prix", "quantite"),
+        "produit": ("produit", "prix", "quantite"),
+    }
+
+    def __init__(self, path: str, table: str = "ventes"):
+        self.path = path
+        self.table = table
+        self._schema = None  # (inode, mtime_ns, schéma) : relu si la base est remplacée
+
+    # --------------------------------------------------------------
+    # Écriture
+    # --------------------------------------------------------------
+    def load(self, df: pd.DataFrame, chunksize: int = 100_000) -> str:
+        """Remplace le contenu de la base par `df` ; retourne le chemin du fichier."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Nom unique par appel (et non par processus) : les threads d'un worker ne se marchent pas dessus
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(self.path)}.", suffix=".tmp")
+        os.close(fd)
+
+        # Texte catégoriel -> objets : to_sql n'écrit pas les Categorical
+        frame = df.copy(deep=False)
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                frame[col] = frame[col].astype(object)
+
+        try:
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute("PRAGMA journal_mode = OFF")
+                conn.execute("PRAGMA synchronous = OFF")
+                frame.to_sql(self.table, conn, index=False, chunksize=chunksize)
+                for name, columns in self.INDEXES.items():
+                    if name in frame.columns:
+                        indexed = ", ".join(f'"{c}"' for c in columns if c in frame.columns)
+                        conn.execute(f'CREATE INDEX "idx_{self.table}_{name}" ON "{self.table}" ({indexed})')
+                conn.execute("ANALYZE")
+                conn.commit()
+            finally:
+                conn.close()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self.path
+
+    # --------------------------------------------------------------
+    # Lecture
+    # --------------------------------------------------------------
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def connect(self) -> sqlite3.Connection:
+        """Connexion en lecture seule (à fermer par l'appelant)."""
+        conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, check_same_thread=False)
+        # SQRT n'existe que si SQLite est compilé avec les fonctions mathématiques
+        conn.create_function("SQRT", 1, _sqrt, deterministic=True)
+        return conn
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        conn = self.connect()
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+
+    def scalar(self, sql: str, params: Sequence = ()):
+        conn = self.connect()
+        try:
+            return conn.execute(sql, params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def schema(self) -> pd.DataFrame:
+        """Colonnes de la table : nom et type SQLite déclaré."""
+        st = os.stat(self.path)
+        if self._schema is None or self._schema[:2] != (st.st_ino, st.st_mtime_ns):
+            info = self.query(f'PRAGMA table_info("{self.table}")')[["name", "type"]]
+            self._schema = (st.st_ino, st.st_mtime_ns, info)
+        return self._schema[2]
+
+    def columns(self) -> List[str]:
+        return self.schema()["name"].tolist()
+
+    def numeric_columns(self) -> List[str]:
+        info = self.schema()
+        return info.loc[info["type"].isin(["INTEGER", "REAL"]), "name"].tolist()
+
+    def quote(self, *names: str) -> str:
+        """
+        Identifiants échappés, séparés par des virgules ; seules les colonnes
+        de la table sont acceptées (les noms viennent parfois de l'API).
+        """
+        known = set(self.columns())
+        unknown = [n for n in names if n not in known]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues : {unknown}")
+        return ", ".join(f'"{n}"' for n in names)
+
+    def __len__(self) -> int:
+        return int(self.scalar(f'SELECT COUNT(*) FROM "{self.table}"'))
+
+    @property
+    def nbytes(self) -> int:
+        """Taille du fichier de base (données + index)."""
+        return os.path.getsize(self.path)
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+from .sales_table import SalesTable
+from .sketches import HyperLogLog, SpaceSaving
+
 class DataAggregator:
     """
     Performs complex aggregations on ventes_2025.csv data.
@@ -15,7 +18,10 @@ class DataAggregator:
     """
 
     def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+        if isinstance(df, SalesTable):
+            df = df.to_frame()
+        # Copie superficielle : les méthodes ajoutent des colonnes sans modifier les valeurs
+        self.df = df.copy(deep=False)
 
     # --------------------------------------------------------------
     # 1) AGRÉGATIONS MULTIPLES (groupby)
@@ -30,7 +36,7 @@ class DataAggregator:
                 {"prix": ["mean"], "quantite": ["sum", "mean"]}
             )
         """
-        return self.df.groupby(group_cols).agg(agg_dict).reset_index()
+        return self.df.groupby(group_cols, observed=True).agg(agg_dict).reset_index()
 
     # --------------------------------------------------------------
     # 2) TABLEAUX CROISÉS (PIVOT TABLES)
@@ -46,32 +52,39 @@ class DataAggregator:
             index=index,
             columns=columns,
             values="quantite",
-            aggfunc=aggfunc
+            aggfunc=aggfunc,
+            observed=True,
         )
 
     def pivot_chiffre_affaires(self, index: str, columns: str, aggfunc: str = "sum") -> pd.DataFrame:
         """
         Pivot table for revenue = prix × quantite.
         """
-        df = self.df.copy()
+        df = self.df.copy(deep=False)
         df["revenu"] = df["prix"] * df["quantite"]
         return pd.pivot_table(
             df,
             index=index,
             columns=columns,
             values="revenu",
-            aggfunc=aggfunc
+            aggfunc=aggfunc,
+            observed=True,
         )
 
     # --------------------------------------------------------------
     # 3) AGRÉGATIONS SPÉCIFIQUES AU PROJET
     # --------------------------------------------------------------
-    def total_quantite_par_produit(self) -> pd.DataFrame:
+    def total_quantite_par_produit(self, approx: bool = False, n: int = 100, capacity: int = None) -> pd.DataFrame:
         """
         Total sold quantity by product.
+
+        approx=True: only the `n` largest products, estimated with a Space-Saving
+        sketch (see top_produits_par_revenu); adds an `erreur_max` column.
         """
+        if approx:
+            return self._approx_top("quantite", self.df["quantite"], n, capacity)
         return (
-            self.df.groupby("produit")["quantite"]
+            self.df.groupby("produit", observed=True)["quantite"]
             .sum()
             .reset_index()
             .sort_values("quantite", ascending=False)
@@ -90,16 +103,16 @@ class DataAggregator:
         """
         Sum of revenue per city.
         """
-        df = self.df.copy()
+        df = self.df.copy(deep=False)
         df["revenu"] = df["prix"] * df["quantite"]
-        return df.groupby("ville")["revenu"].sum().reset_index()
+        return df.groupby("ville", observed=True)["revenu"].sum().reset_index()
 
     def ventes_par_categorie_et_source(self) -> pd.DataFrame:
         """
         Quantity sold by category and sales channel (web/magasin).
         """
         return (
-            self.df.groupby(["categorie", "source"])["quantite"]
+            self.df.groupby(["categorie", "source"], observed=True)["quantite"]
             .sum()
             .reset_index()
         )
@@ -119,16 +132,53 @@ class DataAggregator:
         """
         return (self.df.isna().mean() * 100).reset_index(name="taux_manquant (%)")
 
-    def top_produits_par_revenu(self, n: int = 5) -> pd.DataFrame:
+    def top_produits_par_revenu(self, n: int = 5, approx: bool = False, capacity: int = None) -> pd.DataFrame:
         """
         Find the N highest-revenue products.
-        """
-        df = self.df.copy()
+
+        approx=True: one pass with a Space-Saving heavy-hitters sketch of
+        `capacity` counters (default 50 x n) instead of a full groupby + sort.
+        Each estimate over-counts by at most `erreur_max` (<= total / capacity);
+        `garanti` is True when the product is certainly in the exact top N.
+        """
+        if approx:
+            revenu = self.df["prix"] * self.df["quantite"]
+            return self._approx_top("revenu", revenu, n, capacity)
+        df = self.df.copy(deep=False)
         df["revenu"] = df["prix"] * df["quantite"]
         return (
-            df.groupby("produit")["revenu"]
+            df.groupby("produit", observed=True)["revenu"]
             .sum()
             .reset_index()
             .sort_values("revenu", ascending=False)
             .head(n)
         )
+
+    def produits_distincts_par(self, group_col: str, approx: bool = False, precision: int = 12) -> pd.DataFrame:
+        """
+        Number of distinct products per group (e.g. per ville or categorie).
+
+        approx=True: HyperLogLog with 2^precision registers per group
+        (relative error ~ 1.04 / sqrt(2^precision), reported in `erreur_relative`).
+        """
+        if not approx:
+            out = self.df.groupby(group_col, observed=True)["produit"].nunique().reset_index(name="produits_distincts")
+            out["erreur_relative"] = 0.0
+            return out
+        hll = HyperLogLog(p=precision).update(self.df["produit"], self.df[group_col])
+        out = hll.estimate().rename_axis(group_col).reset_index(name="produits_distincts")
+        out["erreur_relative"] = hll.relative_error
+        return out.sort_values(group_col).reset_index(drop=True)
+
+    def _approx_top(self, value_name: str, values: pd.Series, n: int, capacity: int = None) -> pd.DataFrame:
+        sketch = SpaceSaving(capacity or max(50 * n, 1000))
+        sketch.update(self.df["produit"], values)
+        top = sketch.top(n)
+        return pd.DataFrame(
+            {
+                "produit": top["cle"],
+                value_name: top["estimation"],
+                "erreur_max": top["erreur_max"],
+                "garanti": top["garanti"],
+            }
+        )
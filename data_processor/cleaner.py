@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+from .outliers import OutlierDetector
+from .transforms import get_transform
+
 class DataCleaner:
     """
     Applies cleaning operations on a DataFrame:
@@ -24,19 +27,54 @@ applies custom transformations
         return self
 
     def apply_transform(self, column: str, func) -> "DataCleaner":
-        """Apply a custom function to a column."""
+        """
+        Apply a transformation to a column.
+
+        - str: name of a registered vectorized transform (see transforms.TRANSFORMS)
+        - np.ufunc: applied once on the underlying NumPy array
+        - any other callable: row-by-row fallback with Series.apply (slow)
+        """
+        if isinstance(func, str):
+            return self.transform(column, func)
+        if isinstance(func, np.ufunc):
+            values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.df[column] = func(values)
+            return self
         self.df[column] = self.df[column].apply(func)
         return self
+
+    def transform(self, column: str, name: str, **kwargs) -> "DataCleaner":
+        """
+        Apply a registered vectorized transform on a whole column.
+
+        Example:
+            cleaner.transform("ville", "normalize").transform("prix", "to_numeric", decimal=",")
+        """
+        self.df[column] = get_transform(name)(self.df[column], **kwargs)
+        return self
     
-    def remove_outliers_zscore(self, column, threshold=3):
+    def remove_outliers_zscore(self, column, threshold=3, by: str = None):
         """Detect and  delete extreme values(outliers) in column with Z-score = (x - mean) / standard deviation
-    A value is considered as outlier if |Z| > threshold."""
-        data = self.df[column].to_numpy()
-        z = np.abs((data - data.mean()) / data.std())
-        mask = z < threshold
-        self.df = self.df[mask]
+    A value is considered as outlier if |Z| > threshold. NaN values are ignored (kept)."""
+        return self.remove_outliers(column, method="zscore", threshold=threshold, by=by)
+
+    def remove_outliers(self, column: str, method: str = "zscore", threshold: float = None, by: str = None) -> pd.DataFrame:
+        """
+        Delete outliers of `column` with the given method ("zscore", "mad", "iqr"),
+        optionally computed per group (`by="categorie"`). See outliers.OutlierDetector.
+        """
+        kept, _ = self._outlier_detector(column, method, threshold, by).split(self.df)
+        self.df = kept
         return self.df
-        
+
+    def flag_outliers(self, column: str, method: str = "zscore", threshold: float = None, by: str = None) -> pd.DataFrame:
+        """Return the flagged rows without removing them from the cleaner."""
+        _, flagged = self._outlier_detector(column, method, threshold, by).split(self.df)
+        return flagged
+
+    def _outlier_detector(self, column, method, threshold, by) -> OutlierDetector:
+        return OutlierDetector(column, method=method, threshold=threshold, by=by).fit(self.df)
+
     def clean(self) -> pd.DataFrame:
         """
         Default cleaning for the sales dataset.
@@ -0,0 +1,174 @@
+from typing import Dict, Hashable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class _Moments:
+    """
+    Statistiques suffisantes par paire de colonnes (observations complètes
+    par paire) : n[i, j], somme de x_i, somme de x_i², somme de x_i·x_j,
+    toutes restreintes aux lignes où x_i ET x_j sont présents.
+    """
+
+    def __init__(self, p: int):
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))    # sx[i, j] = Σ x_i (lignes où i et j présents)
+        self.sxx = np.zeros((p, p))   # sxx[i, j] = Σ x_i²
+        self.sxy = np.zeros((p, p))   # sxy[i, j] = Σ x_i x_j
+
+    def add(self, x: np.ndarray) -> None:
+        present = ~np.isnan(x)
+        m = present.astype(np.float64)
+        x0 = np.where(present, x, 0.0)
+        # Produits matriciels BLAS : une passe par morceau, sans boucle sur les paires
+        self.n += m.T @ m
+        self.sx += x0.T @ m
+        self.sxx += (x0 * x0).T @ m
+        self.sxy += x0.T @ x0
+
+    def cross_products(self):
+        """(n, co-moment centré, somme des carrés centrée de i, de j) par paire."""
+        n = self.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            comoment = self.sxy - self.sx * self.sx.T / n
+            ss_i = self.sxx - self.sx ** 2 / n
+            ss_j = ss_i.T
+        return n, comoment, ss_i, ss_j
+
+
+class CorrelationAccumulator:
+    """
+    Matrices de corrélation (Pearson) et de covariance calculées par
+    accumulation incrémentale de statistiques suffisantes, avec gestion
+    des NaN par paire (comme `DataFrame.corr`).
+
+    - `partial_fit(chunk)` peut être appelé morceau par morceau (fichiers,
+      flux) ; `merge()` combine deux accumulateurs
+    - avec `by`, une matrice par groupe (ex : par ville) en une seule passe
+
+    Les colonnes sont recentrées sur la moyenne du premier morceau avant
+    accumulation pour limiter les erreurs d'arrondi (la covariance est
+    invariante par translation).
+
+    Parameters
+    ----------
+    columns : list
+        Colonnes numériques à corréler.
+    by : str, optional
+        Colonne de regroupement.
+    """
+
+    def __init__(self, columns: Sequence[str], by: Optional[str] = None):
+        self.columns = list(columns)
+        self.by = by
+        self.shift: Optional[np.ndarray] = None
+        self._groups: Dict[Hashable, _Moments] = {}
+
+    def _matrix(self, df: pd.DataFrame) -> np.ndarray:
+        return df[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def partial_fit(self, chunk: pd.DataFrame) -> "CorrelationAccumulator":
+        """Ajoute un morceau de données."""
+        x = self._matrix(chunk)
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(x, axis=0)) if len(x) else np.zeros(len(self.columns))
+        x = x - self.shift
+
+        if self.by is None:
+            self._groups.setdefault(None, _Moments(len(self.columns))).add(x)
+            return self
+
+        codes, uniques = pd.factorize(chunk[self.by], sort=True)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for g, key in enumerate(uniques):
+            rows = order[bounds[g]:bounds[g + 1]]
+            self._groups.setdefault(key, _Moments(len(self.columns))).add(x[rows])
+        return self
+
+    def fit(self, df: pd.DataFrame) -> "CorrelationAccumulator":
+        self._groups, self.shift = {}, None
+        return self.partial_fit(df)
+
+    def merge(self, other: "CorrelationAccumulator") -> "CorrelationAccumulator":
+        """Combine un autre accumulateur (mêmes colonnes) dans celui-ci."""
+        if other.columns != self.columns or other.by != self.by:
+            raise ValueError("Accumulateurs incompatibles (colonnes ou regroupement différents)")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        delta = other.shift - self.shift  # x_self = x_other + delta
+        for key, m in other._groups.items():
+            target = self._groups.setdefault(key, _Moments(len(self.columns)))
+            d_i, d_j = delta[:, None], delta[None, :]
+            sx_shifted = m.sx + d_i * m.n
+            target.n += m.n
+            target.sx += sx_shifted
+            target.sxx += m.sxx + 2 * d_i * m.sx + d_i ** 2 * m.n
+            target.sxy += m.sxy + d_i * m.sx.T + d_j * m.sx + d_i * d_j * m.n
+        return self
+
+    # --------------------------------------------------------------
+    # Résultats
+    # --------------------------------------------------------------
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def _result(self, key, kind: str, min_periods: int) -> pd.DataFrame:
+        n, comoment, ss_i, ss_j = self._groups[key].cross_products()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if kind == "cov":
+                values = comoment / (n - 1)
+            else:
+                values = comoment / np.sqrt(ss_i * ss_j)
+                values = np.clip(values, -1.0, 1.0)
+        values[n < max(min_periods, 2 if kind == "cov" else 1)] = np.nan
+        return self._frame(values)
+
+    def _collect(self, kind: str, min_periods: int) -> pd.DataFrame:
+        if self.by is None:
+            if None not in self._groups:
+                return self._frame(np.full((len(self.columns),) * 2, np.nan))
+            return self._result(None, kind, min_periods)
+        frames = {key: self._result(key, kind, min_periods) for key in sorted(self._groups)}
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(frames, names=[self.by, "colonne"])
+
+    def correlation(self, min_periods: int = 1) -> pd.DataFrame:
+        """Matrice de corrélation de Pearson (par groupe : index (groupe, colonne))."""
+        return self._collect("corr", min_periods)
+
+    def covariance(self, min_periods: int = 2) -> pd.DataFrame:
+        """Matrice de covariance (ddof=1, comme DataFrame.cov)."""
+        return self._collect("cov", min_periods)
+
+
+def spearman_matrix(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Corrélation de Spearman avec observations complètes par paire.
+
+    Spearman = Pearson sur les rangs, et les rangs dépendent des lignes
+    retenues : sans valeur manquante, les colonnes sont rangées une seule
+    fois ; sinon chaque paire est rangée sur ses lignes communes.
+    Nécessite les données en mémoire (non incrémental).
+    """
+    x = df[list(columns)].apply(pd.to_numeric, errors="coerce")
+    if not x.isna().to_numpy().any():
+        return CorrelationAccumulator(columns).fit(x.rank()).correlation()
+
+    values = np.full((len(columns),) * 2, np.nan)
+    for i, a in enumerate(columns):
+        for j in range(i, len(columns)):
+            b = columns[j]
+            pair = x[[a, b]].dropna()
+            if len(pair) < 2:
+                continue
+            ranks = pair.rank().to_numpy()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                r = np.corrcoef(ranks[:, 0], ranks[:, 1])[0, 1]
+            values[i, j] = values[j, i] = r
+    return pd.DataFrame(values, index=list(columns), columns=list(columns))
@@ -0,0 +1,282 @@
+import os
+import pickle
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from data_loader.loaders import open_loader
+from .aggregator import DataAggregator
+from .sketches import SpaceSaving
+
+
+ChunkSource = Union[str, Sequence[str], Callable[[], Iterable[pd.DataFrame]]]
+
+
+class OutOfCoreAggregator:
+    """
+    Same aggregations as DataAggregator, for datasets larger than RAM.
+
+    Each call streams the source by chunks, partitions the rows by hash of
+    the group key into on-disk spill files, aggregates each partition
+    separately with DataAggregator and merges the results. Every group
+    lives in exactly one partition, so the result is exact; peak memory is
+    roughly one chunk plus one partition.
+
+    For decomposable aggregations (sums), each chunk is pre-aggregated
+    before spilling (map-side combine), so the spill files stay small.
+
+    Parameters
+    ----------
+    source : str | list[str] | callable
+        CSV path(s), or a callable returning a fresh iterable of DataFrame chunks.
+    n_partitions : int
+        Number of spill partitions (more partitions = less memory per partition).
+    chunksize : int
+        Rows per chunk when reading CSV files.
+    spill_dir : str, optional
+        Where spill files are written (system temp dir by default).
+    transform : callable, optional
+        Applied to each chunk before aggregation (e.g. cleaning).
+
+    Example:
+        agg = OutOfCoreAggregator(["ventes_2023.csv", "ventes_2024.csv"], n_partitions=32)
+        agg.chiffre_affaires_par_ville()
+    """
+
+    def __init__(self, source: ChunkSource, n_partitions: int = 16, chunksize: int = 500_000,
+                 spill_dir: Optional[str] = None, transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None):
+        self.source = source
+        self.n_partitions = n_partitions
+        self.chunksize = chunksize
+        self.spill_dir = spill_dir
+        self.transform = transform
+
+    # --------------------------------------------------------------
+    # Lecture et partitionnement
+    # --------------------------------------------------------------
+    def _chunks(self, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Chunks of the source; files (CSV, Parquet...) only read the needed columns."""
+        if callable(self.source):
+            chunks = self.source()
+        else:
+            paths = [self.source] if isinstance(self.source, str) else list(self.source)
+            usecols = columns if self.transform is None else None
+            chunks = (
+                chunk
+                for path in paths
+                for chunk in open_loader(path, columns=usecols, schema=None).iter_chunks(self.chunksize)
+            )
+
+        offset = 0
+        for chunk in chunks:
+            # index global pour conserver l'ordre d'origine des lignes
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            if self.transform is not None:
+                chunk = self.transform(chunk)
+            yield chunk if columns is None else chunk[columns]
+
+    def _spill(self, directory: str, key_cols: List[str], columns: List[str],
+               combine: Optional[Callable[[pd.DataFrame], pd.DataFrame]]) -> List[str]:
+        """Writes each chunk's rows into the partition file of their key hash."""
+        paths = [os.path.join(directory, f"part_{i:04d}.pkl") for i in range(self.n_partitions)]
+        files = [open(path, "wb") for path in paths]
+        try:
+            for chunk in self._chunks(columns):
+                if combine is not None:
+                    chunk = combine(chunk)
+                if chunk.empty:
+                    continue
+                hashes = pd.util.hash_pandas_object(chunk[key_cols], index=False).to_numpy()
+                part_ids = (hashes % np.uint64(self.n_partitions)).astype(np.int64)
+                for part_id, part in chunk.groupby(part_ids, sort=False):
+                    pickle.dump(part, files[part_id], protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            for f in files:
+                f.close()
+        return paths
+
+    @staticmethod
+    def _read_partition(path: str) -> Optional[pd.DataFrame]:
+        frames = []
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    frames.append(pickle.load(f))
+                except EOFError:
+                    break
+        return pd.concat(frames) if frames else None
+
+    def _map_partitions(self, key_cols: List[str], columns: List[str],
+                        reduce: Callable[[pd.DataFrame], pd.DataFrame],
+                        combine: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> List[pd.DataFrame]:
+        """Partitions by `key_cols`, then applies `reduce` on each non-empty partition."""
+        columns = list(dict.fromkeys(key_cols + columns))
+        results = []
+        with tempfile.TemporaryDirectory(prefix="ooc_", dir=self.spill_dir) as directory:
+            for path in self._spill(directory, key_cols, columns, combine):
+                part = self._read_partition(path)
+                os.remove(path)
+                if part is not None:
+                    results.append(reduce(part))
+        return results
+
+    @staticmethod
+    def _sum_by(key_cols: List[str], value_cols: List[str]) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        """Map-side combine: partial sums per key (exact for sums)."""
+        def combine(chunk: pd.DataFrame) -> pd.DataFrame:
+            return chunk.groupby(key_cols, as_index=False)[value_cols].sum()
+        return combine
+
+    @staticmethod
+    def _with_revenue(chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = chunk.copy()
+        chunk["revenu"] = chunk["prix"] * chunk["quantite"]
+        return chunk
+
+    # --------------------------------------------------------------
+    # 1) AGRÉGATIONS MULTIPLES (groupby)
+    # --------------------------------------------------------------
+    def groupby_multiple(self, group_cols: list, agg_dict: dict) -> pd.DataFrame:
+        """Out-of-core equivalent of DataAggregator.groupby_multiple (any aggregation)."""
+        parts = self._map_partitions(
+            list(group_cols), list(agg_dict),
+            lambda part: DataAggregator(part).groupby_multiple(group_cols, agg_dict),
+        )
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts).sort_values(list(group_cols)).reset_index(drop=True)
+
+    # --------------------------------------------------------------
+    # 2) TABLEAUX CROISÉS (PIVOT TABLES)
+    # --------------------------------------------------------------
+    def _pivot(self, index: str, columns: str, value_cols: List[str], aggfunc: str,
+               reduce: Callable[[DataAggregator], pd.DataFrame]) -> pd.DataFrame:
+        combine = self._sum_by([index, columns], value_cols) if aggfunc == "sum" else None
+        parts = self._map_partitions([index], [columns] + value_cols, lambda part: reduce(DataAggregator(part)), combine)
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts).sort_index().sort_index(axis=1)
+
+    def pivot_quantite(self, index: str, columns: str, aggfunc: str = "sum") -> pd.DataFrame:
+        """Pivot table for quantite, partitioned by `index`."""
+        return self._pivot(index, columns, ["quantite"], aggfunc,
+                           lambda agg: agg.pivot_quantite(index, columns, aggfunc))
+
+    def pivot_chiffre_affaires(self, index: str, columns: str, aggfunc: str = "sum") -> pd.DataFrame:
+        """Pivot table for revenue = prix × quantite, partitioned by `index`."""
+        if aggfunc == "sum":
+            # revenu précalculé par ligne, puis sommes partielles
+            combine = lambda chunk: self._sum_by([index, columns], ["revenu"])(self._with_revenue(chunk))
+            parts = self._map_partitions(
+                [index], [columns, "prix", "quantite"],
+                lambda part: pd.pivot_table(part, index=index, columns=columns, values="revenu", aggfunc="sum"),
+                combine,
+            )
+            if not parts:
+                return pd.DataFrame()
+            return pd.concat(parts).sort_index().sort_index(axis=1)
+        return self._pivot(index, columns, ["prix", "quantite"], aggfunc,
+                           lambda agg: agg.pivot_chiffre_affaires(index, columns, aggfunc))
+
+    # --------------------------------------------------------------
+    # 3) AGRÉGATIONS SPÉCIFIQUES AU PROJET
+    # --------------------------------------------------------------
+    def total_quantite_par_produit(self) -> pd.DataFrame:
+        """Total sold quantity by product."""
+        parts = self._map_partitions(
+            ["produit"], ["quantite"],
+            lambda part: DataAggregator(part).total_quantite_par_produit(),
+            self._sum_by(["produit"], ["quantite"]),
+        )
+        if not parts:
+            return pd.DataFrame(columns=["produit", "quantite"])
+        return pd.concat(parts).sort_values("quantite", ascending=False).reset_index(drop=True)
+
+    def quantity_distribution(self) -> dict:
+        """Distribution of quantities (streamed, no partitioning needed)."""
+        counts = pd.Series(dtype=np.int64)
+        for chunk in self._chunks(["quantite"]):
+            vals = chunk["quantite"].fillna(0).to_numpy(dtype=np.int32)
+            unique, c = np.unique(vals, return_counts=True)
+            counts = counts.add(pd.Series(c, index=unique), fill_value=0)
+        counts = counts.sort_index().astype(np.int64)
+        return dict(zip(counts.index.to_numpy(dtype=np.int32), counts.to_numpy()))
+
+    def chiffre_affaires_par_ville(self) -> pd.DataFrame:
+        """Sum of revenue per city."""
+        combine = lambda chunk: self._sum_by(["ville"], ["revenu"])(self._with_revenue(chunk))
+        parts = self._map_partitions(
+            ["ville"], ["prix", "quantite"],
+            lambda part: part.groupby("ville")["revenu"].sum().reset_index(),
+            combine,
+        )
+        if not parts:
+            return pd.DataFrame(columns=["ville", "revenu"])
+        return pd.concat(parts).sort_values("ville").reset_index(drop=True)
+
+    def ventes_par_categorie_et_source(self) -> pd.DataFrame:
+        """Quantity sold by category and sales channel (web/magasin)."""
+        keys = ["categorie", "source"]
+        parts = self._map_partitions(
+            keys, ["quantite"],
+            lambda part: DataAggregator(part).ventes_par_categorie_et_source(),
+            self._sum_by(keys, ["quantite"]),
+        )
+        if not parts:
+            return pd.DataFrame(columns=keys + ["quantite"])
+        return pd.concat(parts).sort_values(keys).reset_index(drop=True)
+
+    # --------------------------------------------------------------
+    # 4) MÉTRIQUES AVANCÉES
+    # --------------------------------------------------------------
+    def detecter_doublons(self) -> pd.DataFrame:
+        """
+        Duplicated rows, partitioned by hash of the whole row.
+        The original row order (global index) is preserved.
+        """
+        columns = list(next(iter(self._chunks())).columns)
+        parts = self._map_partitions(
+            columns, [],
+            lambda part: part.sort_index().pipe(lambda p: p[p.duplicated()]),
+        )
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(parts).sort_index()
+
+    def taux_valeurs_manquantes(self) -> pd.DataFrame:
+        """Percentage of missing values per column (streamed counts)."""
+        missing, total = None, 0
+        for chunk in self._chunks():
+            counts = chunk.isna().sum()
+            missing = counts if missing is None else missing.add(counts, fill_value=0)
+            total += len(chunk)
+        if missing is None:
+            return pd.DataFrame(columns=["index", "taux_manquant (%)"])
+        return (missing / max(total, 1) * 100).reset_index(name="taux_manquant (%)")
+
+    def top_produits_par_revenu(self, n: int = 5, approx: bool = False, capacity: int = None) -> pd.DataFrame:
+        """
+        Find the N highest-revenue products (top N per partition, then global top N).
+
+        approx=True: single streaming pass with a Space-Saving sketch, no spill files
+        (see DataAggregator.top_produits_par_revenu for the error columns).
+        """
+        if approx:
+            sketch = SpaceSaving(capacity or max(50 * n, 1000))
+            for chunk in self._chunks(["produit", "prix", "quantite"]):
+                sketch.update(chunk["produit"], chunk["prix"] * chunk["quantite"])
+            top = sketch.top(n)
+            return pd.DataFrame({"produit": top["cle"], "revenu": top["estimation"],
+                                 "erreur_max": top["erreur_max"], "garanti": top["garanti"]})
+        combine = lambda chunk: self._sum_by(["produit"], ["revenu"])(self._with_revenue(chunk))
+        parts = self._map_partitions(
+            ["produit"], ["prix", "quantite"],
+            lambda part: part.groupby("produit")["revenu"].sum().nlargest(n).reset_index(),
+            combine,
+        )
+        if not parts:
+            return pd.DataFrame(columns=["produit", "revenu"])
+        return pd.concat(parts).sort_values("revenu", ascending=False).head(n).reset_index(drop=True)
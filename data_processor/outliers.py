@@ -0,0 +1,198 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Seuils par défaut de chaque méthode
+DEFAULT_THRESHOLDS = {
+    "zscore": 3.0,   # |x - moyenne| / écart-type
+    "mad": 3.5,      # |x - médiane| / (1.4826 * MAD)
+    "iqr": 1.5,      # en dehors de [Q1 - k*IQR, Q3 + k*IQR]
+}
+
+_GLOBAL = "__all__"
+
+
+def _merge_moments(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fusionne deux tables (n, mean, m2) par groupe avec la formule de Chan,
+    numériquement stable (pas de somme des carrés).
+    """
+    a, b = a.align(b, join="outer")
+    a, b = a.fillna(0.0), b.fillna(0.0)
+    n = a["n"] + b["n"]
+    delta = b["mean"] - a["mean"]
+    mean = a["mean"] + delta * (b["n"] / n)
+    m2 = a["m2"] + b["m2"] + delta ** 2 * a["n"] * b["n"] / n
+    return pd.DataFrame({"n": n, "mean": mean, "m2": m2})
+
+
+class OutlierDetector:
+    """
+    Détection des valeurs extrêmes d'une colonne numérique, globalement
+    ou par groupe (ex : par `categorie`).
+
+    Deux modes d'utilisation :
+
+    - en mémoire : `fit(df)` puis `flag(df)` / `split(df)`
+    - en flux (fichiers plus gros que la RAM) : une première passe
+      `partial_fit(chunk)` sur chaque morceau pour les statistiques,
+      puis une seconde passe `filter_chunks(chunks)` pour le filtrage.
+
+    Les NaN sont ignorés dans les statistiques et ne sont jamais signalés.
+
+    Parameters
+    ----------
+    column : str
+        Colonne numérique à analyser.
+    method : str
+        "zscore", "mad" ou "iqr".
+    threshold : float, optional
+        Seuil de la méthode (voir DEFAULT_THRESHOLDS).
+    by : str, optional
+        Colonne de regroupement ; les bornes sont calculées par groupe.
+    sample_size : int, optional
+        Pour "mad" et "iqr" en flux : taille maximale de l'échantillon
+        uniforme conservé par groupe (mémoire bornée). None = exact : toutes
+        les valeurs de la colonne sont conservées (morceaux mis de côté,
+        concaténés une seule fois au calcul des bornes).
+    random_state : int
+        Graine de l'échantillonnage.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        method: str = "zscore",
+        threshold: Optional[float] = None,
+        by: Optional[str] = None,
+        sample_size: Optional[int] = None,
+        random_state: int = 0,
+    ):
+        if method not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Méthode inconnue : {method!r} (attendu : {sorted(DEFAULT_THRESHOLDS)})")
+        self.column = column
+        self.method = method
+        self.threshold = DEFAULT_THRESHOLDS[method] if threshold is None else float(threshold)
+        self.by = by
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(random_state)
+        self.reset()
+
+    def reset(self) -> "OutlierDetector":
+        """Oublie les statistiques accumulées."""
+        self._moments: Optional[pd.DataFrame] = None
+        self._sample: Optional[pd.DataFrame] = None
+        self._parts: List[pd.DataFrame] = []  # mode exact : morceaux pas encore concaténés
+        self.bounds_: Optional[pd.DataFrame] = None
+        return self
+
+    # --------------------------------------------------------------
+    # Passe 1 : statistiques
+    # --------------------------------------------------------------
+    def _keys(self, df: pd.DataFrame) -> pd.Series:
+        if self.by is None:
+            return pd.Series(_GLOBAL, index=df.index)
+        return df[self.by]
+
+    def partial_fit(self, chunk: pd.DataFrame) -> "OutlierDetector":
+        """Accumule les statistiques d'un morceau de données."""
+        values = pd.to_numeric(chunk[self.column], errors="coerce")
+        part = pd.DataFrame({"key": self._keys(chunk), "value": values}).dropna()
+        self.bounds_ = None
+
+        if self.method == "zscore":
+            grouped = part.groupby("key", observed=True)["value"]
+            moments = pd.DataFrame({"n": grouped.size(), "mean": grouped.mean(), "m2": grouped.var(ddof=0)})
+            moments["m2"] *= moments["n"]
+            self._moments = moments if self._moments is None else _merge_moments(self._moments, moments)
+            return self
+
+        # mad / iqr : quantiles -> échantillon (borné ou non) par groupe
+        if self.sample_size is None:
+            # Exact : une seule concaténation, dans bounds() (pas de recopie à chaque morceau)
+            self._parts.append(part)
+            return self
+        part = part.assign(rkey=self._rng.random(len(part)))
+        merged = part if self._sample is None else pd.concat([self._sample, part], ignore_index=True)
+        # Échantillon uniforme fusionnable : on garde les plus petites clés aléatoires
+        self._sample = (
+            merged.sort_values("rkey")
+            .groupby("key", sort=False, observed=True)
+            .head(self.sample_size)
+            .reset_index(drop=True)
+        )
+        return self
+
+    def _collect(self) -> Optional[pd.DataFrame]:
+        if self._parts:
+            parts = ([self._sample] if self._sample is not None else []) + self._parts
+            self._sample = pd.concat(parts, ignore_index=True)
+            self._parts = []
+        return self._sample
+
+    def fit(self, df: pd.DataFrame) -> "OutlierDetector":
+        """Calcule les statistiques sur un DataFrame complet."""
+        return self.reset().partial_fit(df)
+
+    def bounds(self) -> pd.DataFrame:
+        """
+        Bornes [lower, upper] par groupe (index = groupe).
+        """
+        if self.bounds_ is not None:
+            return self.bounds_
+
+        t = self.threshold
+        if self.method == "zscore":
+            if self._moments is None:
+                raise ValueError("Aucune statistique : appeler fit() ou partial_fit() d'abord.")
+            m = self._moments
+            mean = m["mean"]
+            # écart-type de population (ddof=0) comme np.std
+            std = np.sqrt(m["m2"] / m["n"])
+            lower, upper = mean - t * std, mean + t * std
+        else:
+            sample = self._collect()
+            if sample is None:
+                raise ValueError("Aucune statistique : appeler fit() ou partial_fit() d'abord.")
+            grouped = sample.groupby("key", observed=True)["value"]
+            if self.method == "mad":
+                median = grouped.median()
+                deviation = (sample["value"] - sample["key"].map(median)).abs()
+                mad = deviation.groupby(sample["key"], observed=True).median() * 1.4826
+                lower, upper = median - t * mad, median + t * mad
+            else:
+                q1, q3 = grouped.quantile(0.25), grouped.quantile(0.75)
+                iqr = q3 - q1
+                lower, upper = q1 - t * iqr, q3 + t * iqr
+
+        self.bounds_ = pd.DataFrame({"lower": lower, "upper": upper})
+        return self.bounds_
+
+    # --------------------------------------------------------------
+    # Passe 2 : filtrage
+    # --------------------------------------------------------------
+    def flag(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Masque booléen (index de df) : True si la ligne est un outlier.
+        Les groupes inconnus lors du fit ne sont pas signalés.
+        """
+        b = self.bounds()
+        keys = self._keys(df)
+        values = pd.to_numeric(df[self.column], errors="coerce").to_numpy(dtype=np.float64)
+        lower = keys.map(b["lower"]).to_numpy(dtype=np.float64)
+        upper = keys.map(b["upper"]).to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            mask = (values < lower) | (values > upper)
+        return pd.Series(mask, index=df.index, name="is_outlier")
+
+    def split(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Retourne (lignes conservées, lignes signalées)."""
+        mask = self.flag(df)
+        return df[~mask], df[mask]
+
+    def filter_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Seconde passe en flux : produit (conservées, signalées) pour chaque morceau."""
+        for chunk in chunks:
+            yield self.split(chunk)
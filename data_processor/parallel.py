@@ -0,0 +1,315 @@
+import contextlib
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+Arrays = Dict[str, np.ndarray]
+
+
+# --------------------------------------------------------------
+# Mémoire partagée
+# --------------------------------------------------------------
+class SharedColumns:
+    """
+    Publie des tableaux NumPy dans des segments de mémoire partagée.
+
+    Les processus du pool s'y attachent par nom : aucune copie ni
+    sérialisation (pickle) des données, seules les bornes des partitions
+    transitent entre processus.
+
+    Les segments sont libérés par `close()` (ou en sortie de bloc `with`) ;
+    à défaut, un finaliseur les supprime quand l'objet est collecté ou à la
+    fin de l'interpréteur, y compris si la création échoue en cours de route.
+    """
+
+    def __init__(self, arrays: Arrays):
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release_segments, self._segments)
+        self.spec: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+        # Vues du processus principal sur les segments
+        self.arrays: Arrays = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            view[...] = array
+            self._segments.append(shm)
+            self.arrays[name] = view
+            self.spec[name] = (shm.name, array.dtype.str, array.shape)
+
+    def __enter__(self) -> "SharedColumns":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libère les segments (à appeler une fois le pool arrêté)."""
+        self.arrays = {}
+        self._finalizer()
+
+
+def _release_segments(segments: List[shared_memory.SharedMemory]) -> None:
+    # Sans référence à SharedColumns : appelable par weakref.finalize
+    while segments:
+        shm = segments.pop()
+        with contextlib.suppress(FileNotFoundError):
+            shm.unlink()
+        # Des vues NumPy encore vivantes empêchent close() ; le nom est déjà supprimé
+        with contextlib.suppress(BufferError):
+            shm.close()
+
+
+# État d'un processus du pool : segments attachés une seule fois par processus
+_WORKER_SEGMENTS: List[shared_memory.SharedMemory] = []
+_WORKER_ARRAYS: Arrays = {}
+
+
+def _init_worker(spec: Dict[str, Tuple[str, str, Tuple[int, ...]]]) -> None:
+    for name, (shm_name, dtype, shape) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER_SEGMENTS.append(shm)
+        _WORKER_ARRAYS[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _run_in_worker(func: Callable, start: int, stop: int, *args):
+    return func(_WORKER_ARRAYS, start, stop, *args)
+
+
+# --------------------------------------------------------------
+# Calculs partiels (une partition de lignes [start, stop))
+# --------------------------------------------------------------
+def partial_group_sums(arrays: Arrays, start: int, stop: int, key: str, n_groups: int,
+                       values: Sequence[str]) -> np.ndarray:
+    """
+    Par groupe : nombre de lignes puis somme de chaque colonne de `values`
+    (NaN ignorés, clé manquante = code -1 exclue, comme pandas).
+    Retourne un tableau (1 + len(values), n_groups).
+    """
+    codes = arrays[key][start:stop]
+    valid = codes >= 0
+    codes = codes[valid]
+    out = np.empty((1 + len(values), n_groups), dtype=np.float64)
+    out[0] = np.bincount(codes, minlength=n_groups)
+    for i, name in enumerate(values, start=1):
+        v = arrays[name][start:stop][valid]
+        out[i] = np.bincount(codes, weights=np.where(np.isnan(v), 0.0, v), minlength=n_groups)
+    return out
+
+
+def partial_moments(arrays: Arrays, start: int, stop: int, values: Sequence[str]) -> np.ndarray:
+    """
+    Moments partiels par colonne : (n, moyenne, M2, min, max).
+    M2 = somme des carrés des écarts à la moyenne de la partition.
+    """
+    out = np.full((len(values), 5), np.nan)
+    for i, name in enumerate(values):
+        v = arrays[name][start:stop]
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            out[i, 0] = 0
+            continue
+        mean = v.mean()
+        out[i] = (len(v), mean, ((v - mean) ** 2).sum(), v.min(), v.max())
+    return out
+
+
+def merge_moments(parts: Sequence[np.ndarray]) -> np.ndarray:
+    """Fusionne des moments partiels (n, moyenne, M2, min, max) avec la formule de Chan."""
+    total = parts[0].copy()
+    for p in parts[1:]:
+        for i in range(len(total)):
+            na, nb = total[i, 0], p[i, 0]
+            if nb == 0:
+                continue
+            if na == 0:
+                total[i] = p[i]
+                continue
+            n = na + nb
+            delta = p[i, 1] - total[i, 1]
+            total[i, 1] += delta * nb / n
+            total[i, 2] += p[i, 2] + delta ** 2 * na * nb / n
+            total[i, 3] = min(total[i, 3], p[i, 3])
+            total[i, 4] = max(total[i, 4], p[i, 4])
+            total[i, 0] = n
+    return total
+
+
+# --------------------------------------------------------------
+# Exécution partitionnée
+# --------------------------------------------------------------
+class ParallelExecutor:
+    """
+    Pool de processus travaillant sur des colonnes en mémoire partagée.
+
+    Le DataFrame nettoyé est converti une seule fois en tableaux NumPy
+    (colonnes numériques en float64, clés de regroupement en codes
+    entiers) ; chaque tâche traite une partition de lignes et retourne un
+    petit résultat partiel, fusionné dans le processus principal.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Données nettoyées.
+    n_workers : int, optional
+        Nombre de processus (par défaut : nombre de cœurs).
+    group_keys : list, optional
+        Clés de regroupement : nom de colonne ou tuple de colonnes (clé
+        combinée). Par défaut : produit, categorie, ville, source et
+        (categorie, source).
+    min_rows_per_partition : int
+        En dessous, pas de découpage (le coût du pool dominerait).
+    """
+
+    DEFAULT_KEYS = ["produit", "categorie", "ville", "source", ("categorie", "source")]
+
+    def __init__(self, df: pd.DataFrame, n_workers: Optional[int] = None,
+                 group_keys: Optional[Sequence[Union[str, Tuple[str, ...]]]] = None,
+                 min_rows_per_partition: int = 50_000):
+        self.n_rows = len(df)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.min_rows_per_partition = min_rows_per_partition
+
+        arrays: Arrays = {}
+        self.groups: Dict[str, pd.Index] = {}
+        key_cols = set()
+        for key in group_keys or self.DEFAULT_KEYS:
+            cols = (key,) if isinstance(key, str) else tuple(key)
+            if set(cols).issubset(df.columns):
+                key_cols.update(cols)
+                self._add_key(df, cols, arrays)
+
+        for col in df.columns:
+            if col not in key_cols and pd.api.types.is_numeric_dtype(df[col]):
+                arrays[col] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        if {"prix", "quantite"}.issubset(arrays):
+            arrays["revenu"] = arrays["prix"] * arrays["quantite"]
+        self.numeric_columns = [c for c in arrays if c not in self.groups]
+
+        self._shared = SharedColumns(arrays)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _add_key(self, df: pd.DataFrame, cols: Tuple[str, ...], arrays: Arrays) -> None:
+        codes = np.zeros(len(df), dtype=np.int64)
+        levels = []
+        for col in cols:
+            col_codes, uniques = pd.factorize(df[col], sort=True)
+            # -1 (clé manquante) se propage à la clé combinée
+            codes = np.where((codes < 0) | (col_codes < 0), -1, codes * len(uniques) + col_codes)
+            levels.append(pd.Index(uniques, name=col))
+        name = "|".join(cols)
+        arrays[name] = codes
+        self.groups[name] = levels[0] if len(levels) == 1 else pd.MultiIndex.from_product(levels)
+
+    def __enter__(self) -> "ParallelExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Arrête le pool et libère la mémoire partagée."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _partitions(self) -> List[Tuple[int, int]]:
+        n_parts = max(1, min(self.n_workers, self.n_rows // max(self.min_rows_per_partition, 1)))
+        bounds = np.linspace(0, self.n_rows, n_parts + 1).astype(int)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _map(self, func: Callable, *args) -> list:
+        """Applique `func(arrays, start, stop, *args)` à chaque partition."""
+        parts = self._partitions()
+        if len(parts) == 1:
+            # Petit volume : calcul direct dans le processus courant
+            return [func(self._shared.arrays, start, stop, *args) for start, stop in parts]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers, initializer=_init_worker, initargs=(self._shared.spec,)
+            )
+        futures = [self._pool.submit(_run_in_worker, func, start, stop, *args) for start, stop in parts]
+        return [f.result() for f in futures]
+
+    # --------------------------------------------------------------
+    # Primitives
+    # --------------------------------------------------------------
+    def group_sum(self, key: Union[str, Sequence[str]], values: Sequence[str]) -> pd.DataFrame:
+        """
+        Somme de `values` par groupe ; seuls les groupes observés sont
+        retournés (comme groupby). `key` : colonne ou liste de colonnes
+        déclarée dans `group_keys`.
+        """
+        name = key if isinstance(key, str) else "|".join(key)
+        if name not in self.groups:
+            raise KeyError(f"Clé de regroupement non préparée : {key!r}")
+        index = self.groups[name]
+        total = np.sum(self._map(partial_group_sums, name, len(index), list(values)), axis=0)
+        out = pd.DataFrame(total[1:].T, index=index, columns=list(values))
+        return out[total[0] > 0]
+
+    def moments(self, values: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Moments fusionnés (n, mean, m2, min, max) par colonne numérique."""
+        values = list(values or [c for c in self.numeric_columns if c != "revenu"])
+        merged = merge_moments(self._map(partial_moments, values))
+        return pd.DataFrame(merged, index=values, columns=["n", "mean", "m2", "min", "max"])
+
+
+class ParallelAggregator(ParallelExecutor):
+    """
+    Agrégations de DataAggregator calculées en parallèle (sommes partielles
+    par partition de lignes, fusionnées dans le processus principal).
+
+    Example:
+        with ParallelAggregator(df_clean, n_workers=32) as agg:
+            agg.chiffre_affaires_par_ville()
+    """
+
+    def chiffre_affaires_par_ville(self) -> pd.DataFrame:
+        """Sum of revenue per city."""
+        return self.group_sum("ville", ["revenu"]).reset_index()
+
+    def ventes_par_categorie_et_source(self) -> pd.DataFrame:
+        """Quantity sold by category and sales channel (web/magasin)."""
+        return self.group_sum(["categorie", "source"], ["quantite"]).reset_index()
+
+    def total_quantite_par_produit(self) -> pd.DataFrame:
+        """Total sold quantity by product."""
+        out = self.group_sum("produit", ["quantite"]).reset_index()
+        return out.sort_values("quantite", ascending=False, kind="stable").reset_index(drop=True)
+
+    def top_produits_par_revenu(self, n: int = 5) -> pd.DataFrame:
+        """Find the N highest-revenue products."""
+        out = self.group_sum("produit", ["revenu"]).reset_index()
+        return out.sort_values("revenu", ascending=False, kind="stable").head(n).reset_index(drop=True)
+
+
+class ParallelStatistics(ParallelExecutor):
+    """Statistiques descriptives par fusion de moments partiels."""
+
+    def basic_stats(self) -> pd.DataFrame:
+        """
+        Moyenne, écart-type (population, comme np.nanstd), min et max en
+        parallèle ; la médiane, non décomposable, est calculée dans le
+        processus principal sur les tableaux partagés.
+        """
+        m = self.moments()
+        stats = pd.DataFrame(
+            {
+                "mean": m["mean"],
+                "median": [float(np.nanmedian(self._shared.arrays[c])) for c in m.index],
+                "std": np.sqrt(m["m2"] / m["n"]),
+                "min": m["min"],
+                "max": m["max"],
+            }
+        )
+        return stats
@@ -0,0 +1,180 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# Jour manquant (NaT) dans les colonnes de dates encodées en int32
+MISSING_DAY = np.iinfo(np.int32).min
+
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    """Plus petit type de codes (mêmes seuils que pandas : Categorical sans copie)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _compact_numeric(values: np.ndarray) -> np.ndarray:
+    """Entiers (sans NaN) dans le plus petit type signé ; sinon float64 inchangé."""
+    if values.dtype.kind == "f":
+        if len(values) == 0 or np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+            return values
+    elif values.dtype.kind not in "iu":
+        return values
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+class SalesTable:
+    """
+    Représentation compacte (colonnaire) de la table des ventes nettoyée.
+
+    - texte (produit, categorie, ville, source) : dictionnaire trié +
+      codes int8/int16/int32 (-1 = manquant)
+    - numériques : tableaux à largeur fixe (entiers réduits au plus petit
+      type quand la colonne n'a ni décimales ni NaN, float64 sinon)
+    - dates : numéro de jour int32 depuis 1970-01-01 (MISSING_DAY = NaT)
+
+    DataAggregator, StatisticsCalculator et ChartBuilder l'acceptent à la
+    place d'un DataFrame : `to_frame()` en donne une vue pandas dont les
+    colonnes texte sont des `Categorical` construits sur les codes (sans
+    copie ni objets Python par ligne).
+
+    Example:
+        table = SalesTable.from_chunks(CSVLoader(path).iter_chunks())
+        DataAggregator(table).chiffre_affaires_par_ville()
+    """
+
+    def __init__(self, columns: List[str], codes: Dict[str, np.ndarray], categories: Dict[str, pd.Index],
+                 numeric: Dict[str, np.ndarray], days: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.codes = codes
+        self.categories = categories
+        self.numeric = numeric
+        self.days = days
+
+    # --------------------------------------------------------------
+    # Construction
+    # --------------------------------------------------------------
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, date_columns: Sequence[str] = ("date",)) -> "SalesTable":
+        return cls.from_chunks([df], date_columns)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], date_columns: Sequence[str] = ("date",)) -> "SalesTable":
+        """
+        Encode des morceaux successifs (ex : CSVLoader.iter_chunks) sans
+        jamais matérialiser la table complète en objets Python.
+        """
+        columns: Optional[List[str]] = None
+        kinds: Dict[str, str] = {}
+        parts: Dict[str, list] = {}
+        seen: Dict[str, pd.Index] = {}
+
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+                for col in columns:
+                    dtype = chunk[col].dtype
+                    if col in date_columns or pd.api.types.is_datetime64_any_dtype(dtype):
+                        kinds[col] = "date"
+                    elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                        kinds[col] = "numeric"
+                    else:
+                        kinds[col] = "category"
+                    parts[col] = []
+                    seen[col] = pd.Index([], dtype=object)
+
+            for col in columns:
+                series = chunk[col]
+                if kinds[col] == "date":
+                    parts[col].append(cls._encode_days(series))
+                elif kinds[col] == "numeric":
+                    values = pd.to_numeric(series, errors="coerce")
+                    parts[col].append(values.to_numpy(dtype=np.float64, na_value=np.nan))
+                else:
+                    # Dictionnaire global : les nouvelles valeurs sont ajoutées à la fin
+                    local_codes, uniques = pd.factorize(series)
+                    uniques = pd.Index(uniques, dtype=object)
+                    new = uniques.difference(seen[col], sort=False)
+                    if len(new):
+                        seen[col] = seen[col].append(new)
+                    mapping = seen[col].get_indexer(uniques)
+                    parts[col].append(np.where(local_codes >= 0, mapping[local_codes], -1))
+
+        columns = columns or []
+        codes, categories, numeric, days = {}, {}, {}, {}
+        for col in columns:
+            values = np.concatenate(parts.pop(col))
+            if kinds[col] == "date":
+                days[col] = values.astype(np.int32)
+            elif kinds[col] == "numeric":
+                numeric[col] = _compact_numeric(values)
+            else:
+                # Dictionnaire trié : même ordre de groupes que groupby sur des chaînes
+                order = np.argsort(seen[col].to_numpy(dtype=object).astype(str), kind="stable")
+                rank = np.empty(len(order), dtype=np.int64)
+                rank[order] = np.arange(len(order))
+                remapped = np.where(values >= 0, rank[np.maximum(values, 0)], -1)
+                categories[col] = seen[col][order]
+                codes[col] = remapped.astype(_code_dtype(len(order)))
+        return cls(columns, codes, categories, numeric, days)
+
+    @staticmethod
+    def _encode_days(series: pd.Series) -> np.ndarray:
+        dates = pd.to_datetime(series, errors="coerce")
+        out = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+        out[dates.isna().to_numpy()] = MISSING_DAY
+        return out.astype(np.int32)
+
+    # --------------------------------------------------------------
+    # Accès
+    # --------------------------------------------------------------
+    def __len__(self) -> int:
+        for store in (self.codes, self.numeric, self.days):
+            for values in store.values():
+                return len(values)
+        return 0
+
+    def column(self, name: str) -> pd.Series:
+        """Une colonne sous forme de Series pandas (Categorical pour le texte)."""
+        if name in self.codes:
+            values = pd.Categorical.from_codes(self.codes[name], categories=self.categories[name])
+        elif name in self.days:
+            raw = self.days[name]
+            seconds = raw.astype(np.int64) * 86_400
+            values = np.where(raw == MISSING_DAY, np.datetime64("NaT", "s"), seconds.view("datetime64[s]"))
+        elif name in self.numeric:
+            values = self.numeric[name]
+        else:
+            raise KeyError(name)
+        return pd.Series(values, name=name, copy=False)
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Vue DataFrame (toutes les colonnes ou une sélection)."""
+        return pd.DataFrame({name: self.column(name) for name in (columns or self.columns)}, copy=False)
+
+    # --------------------------------------------------------------
+    # Empreinte mémoire
+    # --------------------------------------------------------------
+    def memory_usage(self) -> pd.Series:
+        """Octets par colonne (codes + dictionnaire pour le texte)."""
+        usage = {}
+        for name in self.columns:
+            if name in self.codes:
+                usage[name] = self.codes[name].nbytes + int(self.categories[name].memory_usage(deep=True))
+            elif name in self.days:
+                usage[name] = self.days[name].nbytes
+            else:
+                usage[name] = self.numeric[name].nbytes
+        return pd.Series(usage, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.memory_usage().sum())
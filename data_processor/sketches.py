@@ -0,0 +1,217 @@
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _hash64(values, seed: int = 0) -> np.ndarray:
+    """Hash 64 bits vectorisé (SipHash de pandas) d'un tableau de clés."""
+    values = np.asarray(values, dtype=object)
+    return pd.util.hash_array(values, hash_key=f"{seed:016d}"[-16:], categorize=True)
+
+
+def _aggregate(keys, weights=None) -> pd.Series:
+    """Poids cumulés par clé distincte d'un morceau (factorize + bincount)."""
+    codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+    valid = codes >= 0
+    w = np.ones(len(codes)) if weights is None else np.nan_to_num(np.asarray(weights, dtype=np.float64))
+    totals = np.bincount(codes[valid], weights=w[valid], minlength=len(uniques))
+    return pd.Series(totals, index=pd.Index(uniques, dtype=object))
+
+
+# --------------------------------------------------------------
+# Heavy hitters
+# --------------------------------------------------------------
+class SpaceSaving:
+    """
+    Résumé Space-Saving pondéré (top-K approximatif), fusionnable.
+
+    Au plus `capacity` compteurs sont conservés. Pour chaque clé suivie :
+    `count - error <= vraie valeur <= count`, et `error <= total / capacity`.
+    Les morceaux sont pré-agrégés puis fusionnés (Agarwal et al.,
+    "Mergeable summaries") : le résultat ne dépend pas du découpage au-delà
+    de ces bornes.
+
+    Parameters
+    ----------
+    capacity : int
+        Nombre de compteurs (plus grand = plus précis).
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.float64)
+        self.errors = pd.Series(dtype=np.float64)
+        self.total = 0.0
+
+    def _floor(self) -> float:
+        """Valeur maximale d'une clé non suivie."""
+        return float(self.counts.min()) if len(self.counts) >= self.capacity else 0.0
+
+    def update(self, keys, weights=None) -> "SpaceSaving":
+        """Ajoute un morceau de données (clés + poids, 1 par défaut)."""
+        chunk = _aggregate(keys, weights)
+        other = SpaceSaving(self.capacity)
+        other.counts, other.errors, other.total = chunk, pd.Series(0.0, index=chunk.index), float(chunk.sum())
+        return self.merge(other, _truncate_other=False)
+
+    def merge(self, other: "SpaceSaving", _truncate_other: bool = True) -> "SpaceSaving":
+        """Fusionne `other` dans ce résumé (en place)."""
+        floor_a, floor_b = self._floor(), (other._floor() if _truncate_other else 0.0)
+        index = self.counts.index.union(other.counts.index)
+        counts = self.counts.reindex(index, fill_value=floor_a) + other.counts.reindex(index, fill_value=floor_b)
+        errors = self.errors.reindex(index, fill_value=floor_a) + other.errors.reindex(index, fill_value=floor_b)
+        if len(counts) > self.capacity:
+            keep = counts.nlargest(self.capacity).index
+            counts, errors = counts[keep], errors[keep]
+        self.counts, self.errors = counts, errors
+        self.total += other.total
+        return self
+
+    @property
+    def error_bound(self) -> float:
+        """Surestimation maximale d'une clé : total / capacity."""
+        return self.total / self.capacity
+
+    def top(self, n: int) -> pd.DataFrame:
+        """
+        Les `n` clés les plus lourdes : estimation, borne basse, erreur max,
+        et `garanti` = la clé est certainement dans le vrai top-n.
+        """
+        order = self.counts.sort_values(ascending=False)
+        head = order.head(n)
+        threshold = float(order.iloc[n]) if len(order) > n else self._floor()
+        lower = head - self.errors[head.index]
+        return pd.DataFrame(
+            {
+                "cle": head.index,
+                "estimation": head.to_numpy(),
+                "borne_basse": lower.to_numpy(),
+                "erreur_max": self.errors[head.index].to_numpy(),
+                "garanti": (lower >= threshold).to_numpy(),
+            }
+        )
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch : estimation du poids de n'importe quelle clé.
+
+    Avec probabilité >= 1 - exp(-depth), `estimate(x) <= vrai(x) + e / width * total`
+    (jamais de sous-estimation). Fusion = somme des tables.
+    """
+
+    def __init__(self, width: int = 2 ** 16, depth: int = 4, seed: int = 0):
+        self.width, self.depth, self.seed = width, depth, seed
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self.total = 0.0
+
+    def _indices(self, keys) -> np.ndarray:
+        return np.stack([_hash64(keys, self.seed + d) % np.uint64(self.width) for d in range(self.depth)]).astype(np.int64)
+
+    def update(self, keys, weights=None) -> "CountMinSketch":
+        chunk = _aggregate(keys, weights)
+        for d, idx in enumerate(self._indices(chunk.index)):
+            self.table[d] += np.bincount(idx, weights=chunk.to_numpy(), minlength=self.width)
+        self.total += float(chunk.sum())
+        return self
+
+    def estimate(self, keys) -> np.ndarray:
+        idx = self._indices(keys)
+        return self.table[np.arange(self.depth)[:, None], idx].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Sketches Count-Min incompatibles (width, depth, seed)")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    @property
+    def error_bound(self) -> float:
+        return math.e / self.width * self.total
+
+
+# --------------------------------------------------------------
+# Cardinalité (distinct count)
+# --------------------------------------------------------------
+class HyperLogLog:
+    """
+    HyperLogLog groupé : nombre approximatif de valeurs distinctes par
+    groupe (ex : produits distincts par ville), en une passe vectorisée.
+
+    Erreur relative typique : 1.04 / sqrt(2^p). Fusion = max des registres.
+
+    Parameters
+    ----------
+    p : int
+        Précision (11 à 18) : 2^p registres par groupe.
+    """
+
+    def __init__(self, p: int = 12, seed: int = 0):
+        if not 11 <= p <= 18:
+            raise ValueError("p doit être compris entre 11 et 18")
+        self.p, self.m, self.seed = p, 1 << p, seed
+        self.groups = pd.Index([], dtype=object)
+        self.registers = np.zeros((0, self.m), dtype=np.uint8)
+
+    def _ensure_groups(self, groups: pd.Index) -> np.ndarray:
+        new = groups.difference(self.groups)
+        if len(new):
+            self.groups = self.groups.append(pd.Index(new, dtype=object))
+            self.registers = np.vstack([self.registers, np.zeros((len(new), self.m), dtype=np.uint8)])
+        return self.groups.get_indexer(groups)
+
+    def update(self, values, groups=None) -> "HyperLogLog":
+        """Ajoute des valeurs (et leur groupe ; groupe unique si None)."""
+        values = np.asarray(values, dtype=object)
+        if groups is None:
+            groups = np.full(len(values), "__all__", dtype=object)
+        group_codes, group_uniques = pd.factorize(np.asarray(groups, dtype=object))
+        valid = (group_codes >= 0) & ~pd.isna(values)
+        rows = self._ensure_groups(pd.Index(group_uniques, dtype=object))[group_codes[valid]]
+
+        h = _hash64(values[valid], self.seed)
+        bucket = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = h & np.uint64((1 << (64 - self.p)) - 1)
+        # rang = position du premier bit à 1 dans les (64 - p) bits restants
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (64 - self.p - bit_length + 1).astype(np.uint8)
+
+        flat = self.registers.reshape(-1)
+        np.maximum.at(flat, rows * self.m + bucket, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if (self.p, self.seed) != (other.p, other.seed):
+            raise ValueError("HyperLogLog incompatibles (p, seed)")
+        rows = self._ensure_groups(other.groups)
+        self.registers[rows] = np.maximum(self.registers[rows], other.registers)
+        return self
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def estimate(self) -> pd.Series:
+        """Nombre de valeurs distinctes estimé par groupe."""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        regs = self.registers.astype(np.float64)
+        raw = alpha * m * m / np.sum(np.power(2.0, -regs), axis=1)
+        zeros = (self.registers == 0).sum(axis=1)
+        # correction petites cardinalités : comptage linéaire
+        with np.errstate(divide="ignore"):
+            linear = m * np.log(m / np.where(zeros > 0, zeros, 1))
+        est = np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+        return pd.Series(np.round(est), index=self.groups, dtype=np.float64)
+
+
+def top_k(chunks: Iterable[pd.DataFrame], key: str, weight: Optional[str], n: int,
+          capacity: int = 1000) -> pd.DataFrame:
+    """Top-n approximatif en une passe sur des morceaux (fichiers, chunks CSV)."""
+    sketch = SpaceSaving(capacity)
+    for chunk in chunks:
+        sketch.update(chunk[key], None if weight is None else chunk[weight])
+    return sketch.top(n)
@@ -0,0 +1,256 @@
+import numpy as np
+import pandas as pd
+
+from data_loader.sql_store import SQLStore
+
+
+# Fonctions d'agrégation pandas -> SQL (std : ddof=1, comme pandas)
+_SQL_AGG = {"sum": "SUM({c})", "mean": "AVG({c})", "min": "MIN({c})", "max": "MAX({c})", "count": "COUNT({c})"}
+
+
+def _sql_agg(func: str, column: str, mean: str = None) -> str:
+    if func == "std":
+        # Deux passes : écarts à la moyenne du groupe (`mean`, calculée avant) ;
+        # SUM(x*x) - SUM(x)^2/n perd toute précision quand la moyenne est grande
+        if mean is None:
+            raise ValueError("std en SQL : moyenne du groupe requise")
+        return f"SQRT(SUM(({column} - {mean}) * ({column} - {mean})) / (COUNT({column}) - 1))"
+    if func not in _SQL_AGG:
+        raise ValueError(f"Agrégation non supportée en SQL : {func!r}")
+    return _SQL_AGG[func].format(c=column)
+
+
+def _not_null(store: SQLStore, keys) -> str:
+    """Clause WHERE excluant les clés manquantes (comme groupby(dropna=True))."""
+    return " AND ".join(f"{store.quote(k)} IS NOT NULL" for k in keys)
+
+
+class SQLAggregator:
+    """
+    Same aggregations as DataAggregator, computed by SQLite over a SQLStore.
+
+    Results have the same columns and row order as the pandas version, so
+    the API can switch backend per request. Only the (small) aggregated
+    result is materialized in Python; grouping runs in the database, using
+    the indexes on date / ville / categorie / produit.
+
+    Example:
+        agg = SQLAggregator(SQLStore(".cache/ventes.sqlite"))
+        agg.chiffre_affaires_par_ville()
+    """
+
+    def __init__(self, store: SQLStore):
+        self.store = store
+        self.table = f'"{store.table}"'
+
+    def _grouped(self, keys: list, select: str, order: str = None) -> pd.DataFrame:
+        cols = self.store.quote(*keys)
+        sql = (f"SELECT {cols}, {select} FROM {self.table} WHERE {_not_null(self.store, keys)} "
+               f"GROUP BY {cols} ORDER BY {order or cols}")
+        return self.store.query(sql)
+
+    def _aggregate(self, keys: list, items: list, order: str = None) -> pd.DataFrame:
+        """
+        `items` = [(expression SQL, fonction, alias)]. Avec un écart-type, les
+        moyennes par groupe sont calculées d'abord (CTE) puis jointes aux lignes.
+        """
+        stds = list(dict.fromkeys(expr for expr, func, _ in items if func == "std"))
+        if not stds:
+            return self._grouped(keys, ", ".join(f'{_sql_agg(func, expr)} AS "{alias}"' for expr, func, alias in items),
+                                 order)
+
+        quoted = [self.store.quote(k) for k in keys]
+        means = {expr: f'g."_moyenne{i}"' for i, expr in enumerate(stds)}
+        # Clés renommées dans la CTE : les colonnes non préfixées désignent la table
+        g_select = ", ".join([f'{k} AS "_cle{i}"' for i, k in enumerate(quoted)]
+                             + [f'AVG({expr}) AS "_moyenne{i}"' for i, expr in enumerate(stds)])
+        join = " AND ".join(f'v.{k} = g."_cle{i}"' for i, k in enumerate(quoted))
+        v_keys = ", ".join(f"v.{k}" for k in quoted)
+        select = ", ".join(f'{_sql_agg(func, expr, means.get(expr))} AS "{alias}"' for expr, func, alias in items)
+        sql = (f"WITH g AS (SELECT {g_select} FROM {self.table} WHERE {_not_null(self.store, keys)} "
+               f"GROUP BY {', '.join(quoted)}) "
+               f"SELECT {v_keys}, {select} FROM {self.table} AS v JOIN g ON {join} "
+               f"GROUP BY {v_keys} ORDER BY {order or v_keys}")
+        return self.store.query(sql)
+
+    # --------------------------------------------------------------
+    # 1) AGRÉGATIONS MULTIPLES (groupby)
+    # --------------------------------------------------------------
+    def groupby_multiple(self, group_cols: list, agg_dict: dict) -> pd.DataFrame:
+        """
+        General multi-column groupby (sum, mean, min, max, count, std);
+        same (column, function) MultiIndex columns as pandas.
+        """
+        items = [(col, func) for col, funcs in agg_dict.items()
+                 for func in ([funcs] if isinstance(funcs, str) else funcs)]
+        out = self._aggregate(list(group_cols), [(self.store.quote(col), func, f"{col}__{func}") for col, func in items])
+        out.columns = pd.MultiIndex.from_tuples([(k, "") for k in group_cols] + items)
+        return out
+
+    # --------------------------------------------------------------
+    # 2) TABLEAUX CROISÉS (PIVOT TABLES)
+    # --------------------------------------------------------------
+    def _pivot(self, index: str, columns: str, expression: str, aggfunc: str) -> pd.DataFrame:
+        long = self._aggregate([index, columns], [(expression, aggfunc, "valeur")])
+        return long.pivot(index=index, columns=columns, values="valeur")
+
+    def pivot_quantite(self, index: str, columns: str, aggfunc: str = "sum") -> pd.DataFrame:
+        """Pivot table for quantite."""
+        return self._pivot(index, columns, '"quantite"', aggfunc)
+
+    def pivot_chiffre_affaires(self, index: str, columns: str, aggfunc: str = "sum") -> pd.DataFrame:
+        """Pivot table for revenue = prix × quantite."""
+        return self._pivot(index, columns, '"prix" * "quantite"', aggfunc)
+
+    # --------------------------------------------------------------
+    # 3) AGRÉGATIONS SPÉCIFIQUES AU PROJET
+    # --------------------------------------------------------------
+    def total_quantite_par_produit(self) -> pd.DataFrame:
+        """Total sold quantity by product."""
+        return self._grouped(["produit"], 'SUM("quantite") AS quantite', order='quantite DESC, "produit"')
+
+    def quantity_distribution(self) -> dict:
+        """How many times each quantity appears."""
+        out = self.store.query(
+            f'SELECT CAST(COALESCE("quantite", 0) AS INTEGER) AS q, COUNT(*) AS n FROM {self.table} GROUP BY q ORDER BY q'
+        )
+        return dict(zip(out["q"].astype(np.int32), out["n"].astype(np.int64)))
+
+    def chiffre_affaires_par_ville(self) -> pd.DataFrame:
+        """Sum of revenue per city."""
+        return self._grouped(["ville"], 'TOTAL("prix" * "quantite") AS revenu')
+
+    def ventes_par_categorie_et_source(self) -> pd.DataFrame:
+        """Quantity sold by category and sales channel (web/magasin)."""
+        return self._grouped(["categorie", "source"], 'SUM("quantite") AS quantite')
+
+    # --------------------------------------------------------------
+    # 4) MÉTRIQUES AVANCÉES
+    # --------------------------------------------------------------
+    def detecter_doublons(self) -> pd.DataFrame:
+        """Duplicated rows (every occurrence after the first)."""
+        cols = self.store.quote(*self.store.columns())
+        return self.store.query(
+            f"SELECT {cols} FROM {self.table} WHERE rowid NOT IN "
+            f"(SELECT MIN(rowid) FROM {self.table} GROUP BY {cols}) ORDER BY rowid"
+        )
+
+    def taux_valeurs_manquantes(self) -> pd.DataFrame:
+        """Percentage of missing values per column."""
+        columns = self.store.columns()
+        select = ", ".join(f'AVG({self.store.quote(c)} IS NULL) * 100' for c in columns)
+        row = self.store.query(f"SELECT {select} FROM {self.table}").iloc[0].to_numpy(dtype=np.float64)
+        return pd.DataFrame({"index": columns, "taux_manquant (%)": row})
+
+    def top_produits_par_revenu(self, n: int = 5) -> pd.DataFrame:
+        """Find the N highest-revenue products."""
+        out = self._grouped(["produit"], 'TOTAL("prix" * "quantite") AS revenu', order='revenu DESC, "produit"')
+        return out.head(n)
+
+    def produits_distincts_par(self, group_col: str) -> pd.DataFrame:
+        """Number of distinct products per group (exact COUNT DISTINCT)."""
+        out = self._grouped([group_col], 'COUNT(DISTINCT "produit") AS produits_distincts')
+        out["erreur_relative"] = 0.0
+        return out
+
+
+class SQLStatistics:
+    """
+    Statistiques de StatisticsCalculator calculées par SQLite (même format
+    de résultat) : sommes, min / max en une requête par colonne, quantiles
+    par fonctions de fenêtre (ROW_NUMBER), seules les valeurs encadrant
+    chaque quantile remontant côté Python.
+    """
+
+    def __init__(self, store: SQLStore):
+        self.store = store
+        self.table = f'"{store.table}"'
+
+    def _moments(self, keys: list, column: str) -> pd.DataFrame:
+        """count, mean, std (population), min, max par groupe (deux passes : écart à la moyenne)."""
+        col = self.store.quote(column)
+        quoted = [self.store.quote(k) for k in keys]
+        where = f"WHERE {_not_null(self.store, keys)}" if keys else ""
+        group = f"GROUP BY {', '.join(quoted)}" if keys else ""
+        g_keys = ", ".join(f"g.{k}" for k in quoted)
+        join = " AND ".join(f"v.{k} = g.{k}" for k in quoted) or "1"
+        sql = (
+            f"WITH g AS (SELECT {''.join(k + ', ' for k in quoted)}COUNT({col}) AS count, AVG({col}) AS mean, "
+            f"MIN({col}) AS min, MAX({col}) AS max FROM {self.table} {where} {group}) "
+            f"SELECT {''.join(k + ', ' for k in (f'g.{q}' for q in quoted))}g.count, g.mean, "
+            f"AVG((v.{col} - g.mean) * (v.{col} - g.mean)) AS var, g.min, g.max "
+            f"FROM g JOIN {self.table} AS v ON {join} "
+            f"{'GROUP BY ' + g_keys + ' ORDER BY ' + g_keys if keys else ''}"
+        )
+        out = self.store.query(sql)
+        out["std"] = np.sqrt(out.pop("var").astype(np.float64))
+        return out
+
+    def _quantiles(self, keys: list, column: str, levels) -> pd.DataFrame:
+        """Quantiles (interpolation linéaire, comme numpy / pandas) par groupe."""
+        col = self.store.quote(column)
+        partition = f"PARTITION BY {self.store.quote(*keys)} " if keys else ""
+        key_cols = "".join(f"{self.store.quote(k)}, " for k in keys)
+        where = " AND ".join([f"{col} IS NOT NULL"] + ([_not_null(self.store, keys)] if keys else []))
+        positions = ", ".join(f"CAST({q!r} * (n - 1) AS INTEGER)" for q in levels)
+        sql = (
+            f"SELECT * FROM (SELECT {key_cols}{col} AS x, "
+            f"ROW_NUMBER() OVER ({partition}ORDER BY {col}) - 1 AS i, COUNT(*) OVER ({partition[:-1]}) AS n "
+            f"FROM {self.table} WHERE {where}) "
+            f"WHERE i IN ({positions}) OR i - 1 IN ({positions})"
+        )
+        ranked = self.store.query(sql)
+        index = keys + ["i"]
+        values = ranked.set_index(index)["x"]
+        groups = ranked.drop_duplicates(keys)[keys + ["n"]] if keys else ranked[["n"]].head(1)
+        out = groups.reset_index(drop=True)
+        n = out["n"].to_numpy(dtype=np.float64)
+        for q in levels:
+            pos = q * (n - 1)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, (n - 1).astype(np.int64))
+            lo_v = values.reindex(pd.MultiIndex.from_frame(out[keys].assign(i=lo)) if keys else lo).to_numpy()
+            hi_v = values.reindex(pd.MultiIndex.from_frame(out[keys].assign(i=hi)) if keys else hi).to_numpy()
+            out[q] = lo_v + (hi_v - lo_v) * (pos - lo)
+        return out.drop(columns="n")
+
+    def basic_stats(self) -> pd.DataFrame:
+        """Moyenne, médiane, écart-type (population), min, max des colonnes numériques."""
+        stats = {}
+        for col in self.store.numeric_columns():
+            moments = self._moments([], col).iloc[0]
+            median = self._quantiles([], col, [0.5])
+            stats[col] = {
+                "mean": float(moments["mean"]),
+                "median": float(median[0.5].iloc[0]) if len(median) else np.nan,
+                "std": float(moments["std"]),
+                "min": float(moments["min"]),
+                "max": float(moments["max"]),
+            }
+        return pd.DataFrame(stats).T
+
+    def grouped_stats(self, by, columns=None, quantiles=(0.25, 0.75)) -> pd.DataFrame:
+        """Même résultat que StatisticsCalculator.grouped_stats (format tidy)."""
+        keys = [by] if isinstance(by, str) else list(by)
+        unknown = [k for k in keys if k not in self.store.columns()]
+        if unknown:
+            raise ValueError(f"Colonnes de regroupement inconnues : {unknown}")
+        columns = [c for c in (columns or self.store.numeric_columns()) if c not in keys]
+        levels = sorted({0.5, *quantiles})
+        names = {q: "median" if q == 0.5 else f"q{q * 100:g}" for q in levels}
+
+        frames = []
+        for col in columns:
+            frame = self._moments(keys, col)
+            frame = frame.merge(self._quantiles(keys, col, levels), on=keys, how="left")
+            frame.insert(len(keys), "colonne", col)
+            frame["count"] = frame["count"].astype(np.int64)
+            frames.append(frame[keys + ["colonne", "count", "mean", "std", "min"] + levels + ["max"]]
+                          .rename(columns=names))
+
+        if not frames:
+            return pd.DataFrame(columns=keys + ["colonne", "count", "mean", "std", "min", "max"])
+        out = pd.concat(frames, ignore_index=True)
+        n_groups = len(frames[0])
+        order = np.argsort(np.tile(np.arange(n_groups), len(frames)), kind="stable")
+        return out.iloc[order].reset_index(drop=True)
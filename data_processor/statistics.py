@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+from .correlation import CorrelationAccumulator, spearman_matrix
+from .sales_table import SalesTable
+
 
 class StatisticsCalculator:
     """
@@ -12,8 +15,11 @@ class StatisticsCalculator:
     """
 
     def __init__(self, df: pd.DataFrame):
-        # On stocke une copie pour ne pas modifier le df d'origine
-        self.df = df.copy()
+        if isinstance(df, SalesTable):
+            df = df.to_frame()
+        # On stocke une copie (superficielle : aucune valeur n'est modifiée)
+        # pour ne pas modifier le df d'origine
+        self.df = df.copy(deep=False)
 
     def basic_stats(self) -> pd.DataFrame:
         """
@@ -37,32 +43,150 @@ class StatisticsCalculator:
 
         return pd.DataFrame(stats).T
 
-    def correlation_matrix(self) -> pd.DataFrame:
-        """
-        Calcule la matrice de corrélation de Pearson entre colonnes numériques.
+    def _numeric_columns(self) -> list:
+        return list(self.df.select_dtypes(include=[np.number]).columns)
+
+    def correlation_matrix(self, method: str = "pearson", min_periods: int = 1) -> pd.DataFrame:
         """
-        numeric_df = self.df.select_dtypes(include=[np.number])
+        Matrice de corrélation (Pearson ou Spearman) entre colonnes numériques.
 
-        if numeric_df.shape[1] == 0:
+        Les NaN sont ignorés paire par paire : une valeur manquante n'affecte
+        que les paires qui impliquent sa colonne.
+        """
+        columns = self._numeric_columns()
+        if not columns:
             return pd.DataFrame()
+        if method == "spearman":
+            return spearman_matrix(self.df, columns)
+        if method != "pearson":
+            raise ValueError(f"Méthode de corrélation inconnue : {method!r}")
+        return CorrelationAccumulator(columns).fit(self.df).correlation(min_periods)
+
+    def covariance_matrix(self, min_periods: int = 2) -> pd.DataFrame:
+        """Matrice de covariance (ddof=1) avec observations complètes par paire."""
+        columns = self._numeric_columns()
+        if not columns:
+            return pd.DataFrame()
+        return CorrelationAccumulator(columns).fit(self.df).covariance(min_periods)
 
-        data_np = numeric_df.to_numpy()
-        corr_np = np.corrcoef(data_np, rowvar=False)
-
-        return pd.DataFrame(
-            corr_np, index=numeric_df.columns, columns=numeric_df.columns
-        )
+    def correlation_by_group(self, by: str, columns=None) -> pd.DataFrame:
+        """
+        Matrice de corrélation de Pearson par groupe (ex : par ville), en une
+        seule passe. Index : (groupe, colonne).
+        """
+        columns = list(columns or [c for c in self._numeric_columns() if c != by])
+        return CorrelationAccumulator(columns, by=by).fit(self.df).correlation()
 
     def revenue_quantity_correlation(self) -> float:
         """
-        Corrélation entre le chiffre d'affaires (total) et la quantité vendue.
+        Corrélation entre le chiffre d'affaires (prix * quantite) et la quantité vendue.
         """
-        if "total" not in self.df.columns or "quantite" not in self.df.columns:
+        if not {"prix", "quantite"}.issubset(self.df.columns):
             return np.nan
 
-        subset = self.df[["total", "quantite"]].dropna()
-        if subset.empty:
-            return np.nan
+        df = pd.DataFrame({"revenu": self.df["prix"] * self.df["quantite"], "quantite": self.df["quantite"]})
+        corr = CorrelationAccumulator(["revenu", "quantite"]).fit(df).correlation()
+        return float(corr.loc["revenu", "quantite"])
 
-        corr_matrix = np.corrcoef(subset["total"], subset["quantite"])
-        return float(corr_matrix[0, 1])
+    def grouped_stats(self, by, columns=None, quantiles=(0.25, 0.75)) -> pd.DataFrame:
+        """
+        Statistiques descriptives par groupe (ex : par categorie, ville ou
+        source) pour toutes les colonnes numériques.
+
+        Une seule factorisation des clés, puis pour chaque colonne un tri
+        (groupe, valeur) : moyenne et écart-type par `np.bincount`, min, max,
+        médiane et quantiles par indexation directe dans le tableau trié.
+
+        Returns
+        -------
+        pd.DataFrame
+            Format "tidy" : une ligne par (groupe, colonne) avec count, mean,
+            std (population, comme basic_stats), min, q.., median, max.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        unknown = [k for k in keys if k not in self.df.columns]
+        if unknown:
+            raise ValueError(f"Colonnes de regroupement inconnues : {unknown}")
+        columns = [c for c in (columns or self._numeric_columns()) if c not in keys]
+
+        codes, groups = _group_codes(self.df, keys)
+        n_groups = len(groups)
+        levels = sorted({0.5, *quantiles})
+        names = {q: "median" if q == 0.5 else f"q{q * 100:g}" for q in levels}
+
+        frames = []
+        for col in columns:
+            metrics = _grouped_metrics(self.df[col].to_numpy(dtype=np.float64, na_value=np.nan), codes, n_groups, levels)
+            frame = groups.copy()
+            frame["colonne"] = col
+            frame["count"] = metrics.pop("count")
+            frame["mean"] = metrics.pop("mean")
+            frame["std"] = metrics.pop("std")
+            frame["min"] = metrics.pop("min")
+            for q in levels:
+                frame[names[q]] = metrics[q]
+            frame["max"] = metrics.pop("max")
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=keys + ["colonne", "count", "mean", "std", "min", "max"])
+        out = pd.concat(frames, ignore_index=True)
+        # Regroupe les lignes d'un même groupe (colonnes dans l'ordre d'origine)
+        order = np.argsort(np.tile(np.arange(n_groups), len(frames)), kind="stable")
+        return out.iloc[order].reset_index(drop=True)
+
+
+def _group_codes(df: pd.DataFrame, keys: list):
+    """
+    Code entier compact par groupe observé (-1 si une clé manque) et
+    DataFrame des valeurs de clés correspondantes, triées.
+    """
+    combined = np.zeros(len(df), dtype=np.int64)
+    level_values = []
+    for key in keys:
+        key_codes, uniques = pd.factorize(df[key], sort=True)
+        combined = np.where((combined < 0) | (key_codes < 0), -1, combined * len(uniques) + key_codes)
+        level_values.append(uniques)
+
+    valid = combined >= 0
+    codes = np.full(len(df), -1, dtype=np.int64)
+    codes[valid], observed = pd.factorize(combined[valid], sort=True)
+    shape = [len(u) for u in level_values]
+    positions = np.unravel_index(observed, shape) if len(observed) else [np.array([], dtype=np.int64)] * len(keys)
+    groups = pd.DataFrame({key: np.asarray(u)[pos] for key, u, pos in zip(keys, level_values, positions)})
+    return codes, groups
+
+
+def _grouped_metrics(values: np.ndarray, codes: np.ndarray, n_groups: int, quantiles) -> dict:
+    """Métriques d'une colonne par groupe (NaN ignorés, comme np.nan*)."""
+    valid = codes >= 0
+    c, x = codes[valid], values[valid]
+    present = ~np.isnan(x)
+
+    size = np.bincount(c, minlength=n_groups)
+    count = np.bincount(c, weights=present, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(c, weights=np.where(present, x, 0.0), minlength=n_groups) / count
+        dev = np.where(present, x - mean[c], 0.0)
+        std = np.sqrt(np.bincount(c, weights=dev * dev, minlength=n_groups) / count)
+
+    # Tri par (groupe, valeur) : NaN en fin de chaque groupe
+    xs = x[np.lexsort((x, c))]
+    start = np.concatenate([[0], np.cumsum(size)[:-1]])
+    empty = count == 0
+
+    def at(pos):
+        out = xs[np.clip(pos, 0, max(len(xs) - 1, 0))] if len(xs) else np.full(n_groups, np.nan)
+        return np.where(empty, np.nan, out)
+
+    metrics = {"count": count.astype(np.int64), "mean": mean, "std": std,
+               "min": at(start), "max": at(start + count.astype(np.int64) - 1)}
+    for q in quantiles:
+        # Interpolation linéaire (méthode par défaut de numpy / pandas)
+        pos = q * np.maximum(count - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        frac = pos - lo
+        hi = np.minimum(lo + 1, np.maximum(count - 1, 0).astype(np.int64))
+        lo_v, hi_v = at(start + lo), at(start + hi)
+        metrics[q] = lo_v + (hi_v - lo_v) * frac
+    return metrics
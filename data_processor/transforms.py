@@ -0,0 +1,186 @@
+import unicodedata
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+
+# Registre global des transformations vectorisées : nom -> fonction(Series, **kwargs) -> Series
+TRANSFORMS: Dict[str, Callable[..., pd.Series]] = {}
+
+
+def register_transform(name: str):
+    """
+    Décorateur pour enregistrer une transformation vectorisée.
+
+    La fonction reçoit la Series complète (et non une valeur) et doit
+    retourner une Series de même index.
+
+    Example:
+        @register_transform("ttc")
+        def ttc(s, taux=0.2):
+            return s * (1 + taux)
+    """
+    def decorator(func: Callable[..., pd.Series]) -> Callable[..., pd.Series]:
+        TRANSFORMS[name] = func
+        return func
+    return decorator
+
+
+def register_ufunc(name: str, ufunc: np.ufunc, **ufunc_kwargs) -> None:
+    """
+    Enregistre un ufunc NumPy (np.log1p, np.round, ...) comme transformation.
+
+    Le ufunc est appliqué sur le tableau NumPy sous-jacent, en un seul appel C.
+    """
+    if not isinstance(ufunc, np.ufunc):
+        raise TypeError(f"{name!r} : un np.ufunc est attendu, reçu {type(ufunc).__name__}")
+
+    def transform(series: pd.Series, **kwargs) -> pd.Series:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.Series(ufunc(values, **{**ufunc_kwargs, **kwargs}), index=series.index, name=series.name)
+
+    TRANSFORMS[name] = transform
+
+
+def get_transform(name: str) -> Callable[..., pd.Series]:
+    """Retourne la transformation enregistrée sous `name` (KeyError sinon)."""
+    try:
+        return TRANSFORMS[name]
+    except KeyError:
+        raise KeyError(f"Transformation inconnue : {name!r}. Disponibles : {sorted(TRANSFORMS)}") from None
+
+
+# --------------------------------------------------------------
+# Transformations de chaînes (au niveau des catégories)
+# --------------------------------------------------------------
+def _map_categories(series: pd.Series, func: Callable[[pd.Index], pd.Index]) -> pd.Series:
+    """
+    Applique `func` sur les valeurs distinctes uniquement, puis ré-étend
+    le résultat via les codes. Le coût dépend du nombre de modalités,
+    pas du nombre de lignes.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = pd.Index(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        uniques = pd.Index(uniques)
+
+    if len(uniques) == 0:
+        return series
+
+    new_uniques = func(uniques.astype(str))
+    # Des modalités différentes peuvent fusionner (" Paris" / "paris") : on refactorise
+    new_codes_map, merged = pd.factorize(new_uniques)
+    out_codes = np.where(codes >= 0, new_codes_map[codes], -1)
+    result = pd.Categorical.from_codes(out_codes, categories=pd.Index(merged))
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.Series(result, index=series.index, name=series.name)
+    return pd.Series(result, index=series.index, name=series.name).astype(object)
+
+
+def _strip_accents(values: pd.Index) -> pd.Index:
+    return pd.Index(
+        [
+            "".join(ch for ch in unicodedata.normalize("NFKD", v) if not unicodedata.combining(ch))
+            for v in values
+        ]
+    )
+
+
+@register_transform("strip")
+def strip(series: pd.Series) -> pd.Series:
+    """Supprime les espaces en début et fin de chaîne."""
+    return _map_categories(series, lambda u: u.str.strip())
+
+
+@register_transform("lower")
+def lower(series: pd.Series) -> pd.Series:
+    """Met les chaînes en minuscules."""
+    return _map_categories(series, lambda u: u.str.lower())
+
+
+@register_transform("casefold")
+def casefold(series: pd.Series) -> pd.Series:
+    """Casefold Unicode (comparaison insensible à la casse)."""
+    return _map_categories(series, lambda u: u.str.casefold())
+
+
+@register_transform("title")
+def title(series: pd.Series) -> pd.Series:
+    """Met une majuscule en début de chaque mot ("paris" -> "Paris")."""
+    return _map_categories(series, lambda u: u.str.title())
+
+
+@register_transform("normalize")
+def normalize(series: pd.Series, case: str = "title", accents: bool = True) -> pd.Series:
+    """
+    Normalisation complète d'une colonne catégorielle :
+    strip + espaces multiples réduits + casse homogène (+ accents retirés
+    si `accents=False`).
+    """
+    def func(u: pd.Index) -> pd.Index:
+        u = u.str.strip().str.replace(r"\s+", " ", regex=True)
+        if not accents:
+            u = _strip_accents(u)
+        if case == "title":
+            return u.str.title()
+        if case == "lower":
+            return u.str.lower()
+        if case == "upper":
+            return u.str.upper()
+        return u
+
+    return _map_categories(series, func)
+
+
+# --------------------------------------------------------------
+# Coercitions de types
+# --------------------------------------------------------------
+@register_transform("to_numeric")
+def to_numeric(series: pd.Series, decimal: str = ".") -> pd.Series:
+    """
+    Convertit en nombre, les valeurs invalides deviennent NaN.
+    `decimal=","` gère le format français ("1,5" -> 1.5).
+    """
+    if decimal != "." and not pd.api.types.is_numeric_dtype(series):
+        series = _map_categories(series, lambda u: u.str.replace(" ", "").str.replace(decimal, ".", regex=False))
+    return pd.to_numeric(series, errors="coerce")
+
+
+@register_transform("to_datetime")
+def to_datetime(series: pd.Series, format: str = "%Y-%m-%d", dayfirst: bool = False) -> pd.Series:
+    """
+    Parse les dates avec un format explicite (chemin rapide de pandas),
+    les dates invalides deviennent NaT.
+    """
+    return pd.to_datetime(series, format=format, dayfirst=dayfirst, errors="coerce")
+
+
+# --------------------------------------------------------------
+# Conversions d'unités / devises
+# --------------------------------------------------------------
+@register_transform("scale")
+def scale(series: pd.Series, factor: float = 1.0, offset: float = 0.0) -> pd.Series:
+    """Conversion linéaire d'unité : x * factor + offset."""
+    return pd.to_numeric(series, errors="coerce") * factor + offset
+
+
+@register_transform("convert_currency")
+def convert_currency(series: pd.Series, rates, currency: pd.Series = None, default_rate: float = 1.0) -> pd.Series:
+    """
+    Conversion de devise.
+
+    - `rates` float : taux unique appliqué à toute la colonne.
+    - `rates` dict {devise: taux} + `currency` (Series des devises par ligne) :
+      le taux est résolu par modalité de devise puis appliqué en vectoriel.
+    """
+    values = pd.to_numeric(series, errors="coerce")
+    if currency is None:
+        return values * float(rates)
+
+    codes, uniques = pd.factorize(currency)
+    unique_rates = np.array([rates.get(c, default_rate) for c in uniques] + [np.nan], dtype=np.float64)
+    return values * unique_rates[codes]
@@ -1,78 +1,99 @@
-from config import setup_logger, CSV_FILE, REPORT_DIR
-from data_loader.csv_loader import CSVLoader
-from data_loader.data_validator import DataValidator 
-from data_processor.cleaner import DataCleaner
-from data_processor.aggregator import DataAggregator
-from data_processor.statistics import StatisticsCalculator
-from visualization.chart_builder import ChartBuilder
-from visualization.report_generator import ReportGenerator
+from config import setup_logger, ensure_dirs, CSV_FILE, DATA_DIR, REPORT_DIR, CACHE_DIR, CACHE_MAX_AGE, CACHE_MAX_BYTES
+from monitoring.logs import preview
+from monitoring.metrics import REGISTRY, profile_run
+from pipeline.stages import build_sales_pipeline
 
+import argparse
+import contextlib
 import os
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline d'analyse des ventes")
+    parser.add_argument("--csv", default=CSV_FILE, help="Fichier CSV à analyser")
+    parser.add_argument("--no-cache", action="store_true", help="Rejouer toutes les étapes")
+    parser.add_argument("--workers", type=int, default=4, help="Étapes exécutées en parallèle")
+    parser.add_argument("--profile", action="store_true",
+                        help="Capture cProfile + tracemalloc du run (dans reports/profile)")
+    parser.add_argument("--reports", nargs="+", metavar="TRANCHE",
+                        help="Rapports PDF par tranche, ex : ville=* categorie=* mois=* 'ville=Paris,mois=2025-03'")
+    parser.add_argument("--report-workers", type=int, default=None,
+                        help="Processus de rendu des rapports par tranche (défaut : nombre de CPU)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Mode démon : intègre en continu les CSV déposés / complétés dans DATA_DIR")
+    args = parser.parse_args(argv)
+    ensure_dirs()
+
     logger = setup_logger("main")
+    if args.watch:
+        return watch(logger)
     logger.info("=== DÉMARRAGE DU PIPELINE D'ANALYSE ===")
 
-    # 1) Chargement des données
-    logger.info("Chargement du fichier CSV...")
-    loader = CSVLoader(CSV_FILE)
-    df_raw = loader.load()
-    logger.info("df_raw: %d lignes", len(df_raw))
-    logger.info("Aperçu df_raw:\n%s", df_raw.head())
-
-    # 2) Validation des données
-    logger.info("Validation des données...")
-    validator = DataValidator(df_raw)
-    df_valid = validator.validate()
-    logger.info("df_valid: %d lignes", len(df_valid))
-    logger.info("Aperçu df_valid:\n%s", df_valid.head())
-
-    # 3) Nettoyage des données
-    logger.info("Nettoyage des données...")
-    cleaner = DataCleaner(df_valid)
-    df_clean = cleaner.clean()
-    logger.info("df_clean: %d lignes", len(df_clean))
-    logger.info("Aperçu df_clean:\n%s", df_clean.head())
-    logger.info("Colonnes df_clean : %s", list(df_clean.columns))
-
-    # 4) Agrégations
-    logger.info("Agrégation des données...")
-    aggregator = DataAggregator(df_clean)
-
-    ventes_par_categorie = aggregator.ventes_par_categorie_et_source()
-    ventes_par_ville = aggregator.chiffre_affaires_par_ville()
-    top_produits = aggregator.top_produits_par_revenu(n=10)
-
-    # 5) Statistiques
-    logger.info("Calcul des statistiques...")
-    stats = StatisticsCalculator(df_clean)
-    stats_resume = stats.basic_stats()
-
-    # 6) Visualisation
-    logger.info("Génération des graphiques...")
-    charts_output = os.path.join(REPORT_DIR, "charts")
-    os.makedirs(charts_output, exist_ok=True)
-
-    chart_builder = ChartBuilder(df_clean)
-    chart_builder.plot_sales_by_category(
-        save_path=os.path.join(charts_output, "ventes_par_categorie.png")
-    )
-    chart_builder.plot_sales_by_city(
-        save_path=os.path.join(charts_output, "ventes_par_ville.png")
+    # load -> validate -> clean -> (agrégations | stats | graphiques) -> rapport
+    # Les étapes dont les entrées n'ont pas changé sont reprises du cache.
+    pipeline = build_sales_pipeline(
+        cache_dir=None if args.no_cache else CACHE_DIR,
+        max_workers=args.workers,
+        cache_max_bytes=CACHE_MAX_BYTES,
+        cache_max_age=CACHE_MAX_AGE,
     )
-    chart_builder.plot_top_products(
-        n=10, save_path=os.path.join(charts_output, "top_produits.png")
-    )
-
-    # 7) Génération du rapport
-    logger.info("Génération du rapport PDF...")
-
-    report = ReportGenerator(df_clean, output_dir=REPORT_DIR)
-    report.generate_pdf_report("rapport_ventes.pdf", charts_dir=charts_output)
+    charts_output = os.path.join(REPORT_DIR, "charts")
+    profiling = profile_run(os.path.join(REPORT_DIR, "profile")) if args.profile else contextlib.nullcontext()
+    with profiling:
+        results = pipeline.run(csv_path=args.csv, charts_dir=charts_output, report_dir=REPORT_DIR)
+
+    # Résumé des mesures par étape, à côté du rapport
+    summary_path = REGISTRY.write_summary(os.path.join(REPORT_DIR, "run_summary.json"), pipeline.last_metrics)
+
+    for name in ("df_raw", "df_valid", "df_clean"):
+        logger.info("%s: %d lignes", name, len(results[name]), extra={"dataset": name, "rows": len(results[name])})
+        # Aperçu calculé seulement si DEBUG est actif
+        logger.debug("Aperçu %s:\n%s", name, preview(results[name]))
+    logger.debug("Colonnes df_clean : %s", list(results["df_clean"].columns))
+    logger.info("Étapes : %s", pipeline.last_run)
+
+    if args.reports:
+        from visualization.batch_reports import BatchReportGenerator
+
+        batch = BatchReportGenerator(results["df_clean"], output_dir=os.path.join(REPORT_DIR, "tranches"),
+                                     max_workers=args.report_workers).generate(args.reports)
+        results["slice_reports"] = batch.paths
+        logger.info("Rapports par tranche : %d en %.1fs (%.1f rapports/min)", len(batch.paths), batch.seconds,
+                    batch.reports_per_minute, extra={"reports": len(batch.paths)})
+        if batch.empty:
+            logger.warning("Tranches sans donnée : %s", ", ".join(batch.empty))
 
     logger.info("=== PIPELINE TERMINÉ AVEC SUCCÈS ===")
-    logger.info("Rapport disponible ici : %s", os.path.join(REPORT_DIR, "rapport_ventes.pdf"))
+    logger.info("Rapport disponible ici : %s", results["report_path"])
+    logger.info("Mesures du run : %s", summary_path)
+    return results
+
+
+def watch(logger):
+    """
+    Surveille DATA_DIR ; à chaque lot intégré, le jeu nettoyé est publié
+    pour les workers de l'API si PMN_SHARED_DATASET=1.
+    """
+    from config import SHARED_DATASET, SHARED_DATA_DIR
+    from pipeline.watcher import FolderWatcher
+
+    shared = None
+    if SHARED_DATASET:
+        from data_loader.shared_dataset import SharedDataset
+        shared = SharedDataset(SHARED_DATA_DIR)
+
+    def on_update(watcher):
+        rows = watcher.aggregates.rows
+        if shared is not None:
+            version = shared.publish(watcher.dataset())
+            logger.info("Jeu de données publié : %s (%d lignes)", version, rows, extra={"rows": rows})
+        else:
+            logger.info("Jeu de données : %d lignes", rows, extra={"rows": rows})
+
+    logger.info("=== SURVEILLANCE DE %s ===", DATA_DIR)
+    watcher = FolderWatcher(DATA_DIR, on_update=on_update)
+    watcher.run_forever()
+    return watcher
 
 
 if __name__ == "__main__":
@@ -0,0 +1,105 @@
+import atexit
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List
+
+
+# Attributs standard d'un LogRecord : le reste vient de `extra=` et est exporté en JSON
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Un enregistrement = une ligne JSON (ts, level, logger, message, + champs
+    passés via `extra=`), facile à indexer par un collecteur de logs.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class Lazy:
+    """
+    Argument de log calculé seulement si l'enregistrement est émis :
+        logger.debug("Aperçu :\\n%s", Lazy(lambda: df.head().to_string()))
+    Si le niveau DEBUG n'est pas actif, la fonction n'est jamais appelée.
+    """
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
+
+
+def preview(df, n: int = 5) -> Lazy:
+    """Aperçu paresseux des `n` premières lignes d'un DataFrame."""
+    return Lazy(lambda: df.head(n).to_string())
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler pour une file en mémoire (pas de pickle) : le message est
+    figé (les arguments peuvent changer après l'appel) mais l'enregistrement
+    n'est ni copié ni formaté ici ; exc_info est conservé pour les handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        return record
+
+
+# Un écouteur par logger configuré en mode asynchrone
+_LISTENERS: Dict[str, QueueListener] = {}
+
+
+def attach_queue(logger: logging.Logger, handlers: List[logging.Handler]) -> QueueListener:
+    """
+    Mode asynchrone : le logger ne fait que déposer l'enregistrement dans une
+    file ; un thread (QueueListener) formate et écrit via `handlers`. Les
+    écritures disque / console sortent du chemin critique.
+    """
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    logger.addHandler(_InProcessQueueHandler(records))
+    listener.start()
+    _LISTENERS[logger.name] = listener
+    return listener
+
+
+def detach_queue(logger: logging.Logger) -> None:
+    """Vide la file du logger, arrête son écouteur et retire le QueueHandler."""
+    listener = _LISTENERS.pop(logger.name, None)
+    if listener is not None:
+        listener.stop()
+    for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(handler)
+
+
+def stop_listeners() -> None:
+    """Vide les files et arrête les écouteurs (appelé à la sortie du programme)."""
+    while _LISTENERS:
+        _, listener = _LISTENERS.popitem()
+        listener.stop()
+
+
+atexit.register(stop_listeners)
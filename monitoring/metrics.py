@@ -0,0 +1,288 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Measurement:
+    """Mesure d'une exécution (étape du pipeline ou endpoint de l'API)."""
+
+    name: str
+    kind: str = "stage"
+    status: str = "ok"          # ok | error | cached
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_memory_bytes: Optional[int] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+
+
+def count_rows(value: Any) -> Optional[int]:
+    """Nombre de lignes d'un résultat (DataFrame, liste, tuple de DataFrames...)."""
+    if value is None or isinstance(value, (str, bytes, dict)):
+        return None
+    if isinstance(value, tuple):
+        counts = [c for c in (count_rows(v) for v in value) if c is not None]
+        return sum(counts) if counts else None
+    if hasattr(value, "shape") or isinstance(value, list):
+        return len(value)
+    return None
+
+
+def _read_proc_status(field_name: str) -> Optional[int]:
+    """Champ de /proc/self/status en octets (VmRSS, VmHWM...) ; None hors Linux."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field_name + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_proc_peak() -> bool:
+    """Remet le pic RSS (VmHWM) au RSS courant (Linux >= 4.0)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _PeakTracker:
+    """
+    Pic mémoire propre à chaque mesure : mémoire au plus haut pendant le
+    bloc, moins la mémoire à son entrée.
+
+    Le pic du processus (tracemalloc en mode profilage, sinon VmHWM sous
+    Linux) est remis à zéro à l'entrée de chaque bloc ; avant cette remise,
+    le pic courant est reporté dans tous les blocs encore ouverts (blocs
+    imbriqués, autres threads), qui gardent ainsi leur propre maximum.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: Dict[int, List[int]] = {}  # id -> [mémoire à l'entrée, pic vu]
+        self._next = 0
+
+    @staticmethod
+    def _usage():
+        """(mémoire courante, pic depuis la dernière remise à zéro, fonction de remise à zéro)."""
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            return current, peak, tracemalloc.reset_peak
+        current, peak = _read_proc_status("VmRSS"), _read_proc_status("VmHWM")
+        if current is None or peak is None:
+            return None, None, None
+        return current, peak, _reset_proc_peak
+
+    def _merge(self, peak: int) -> None:
+        for frame in self._open.values():
+            frame[1] = max(frame[1], peak)
+
+    def enter(self) -> Optional[int]:
+        with self._lock:
+            current, peak, reset = self._usage()
+            if current is None:
+                return None
+            self._merge(peak)
+            reset()
+            token = self._next
+            self._next += 1
+            self._open[token] = [current, current]
+            return token
+
+    def exit(self, token: Optional[int]) -> Optional[int]:
+        if token is None:
+            return None
+        with self._lock:
+            _, peak, _ = self._usage()
+            if peak is not None:
+                self._merge(peak)
+            start, seen = self._open.pop(token)
+            return max(0, seen - start)
+
+
+_PEAKS = _PeakTracker()
+
+
+class MetricsRegistry:
+    """
+    Collecte thread-safe des mesures : temps réel, temps CPU (du thread
+    qui exécute), pic mémoire du bloc (au-dessus de la mémoire à son entrée)
+    et lignes en entrée / sortie.
+
+    Expose un résumé JSON et le format texte Prometheus.
+    """
+
+    def __init__(self, prefix: str = "pmn", history: int = 1000):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._history: deque = deque(maxlen=history)
+        self._totals: Dict[tuple, Dict[str, float]] = {}
+
+    def record(self, m: Measurement) -> None:
+        with self._lock:
+            self._history.append(m)
+            t = self._totals.setdefault(
+                (m.kind, m.name),
+                {"calls": 0, "errors": 0, "cached": 0, "wall": 0.0, "cpu": 0.0,
+                 "rows_in": 0, "rows_out": 0, "peak_memory": 0, "last_wall": 0.0},
+            )
+            t["calls"] += 1
+            t["errors"] += m.status == "error"
+            t["cached"] += m.status == "cached"
+            t["wall"] += m.wall_s
+            t["cpu"] += m.cpu_s
+            t["rows_in"] += m.rows_in or 0
+            t["rows_out"] += m.rows_out or 0
+            t["peak_memory"] = max(t["peak_memory"], m.peak_memory_bytes or 0)
+            t["last_wall"] = m.wall_s
+
+    @contextmanager
+    def measure(self, name: str, kind: str = "stage", rows_in: Optional[int] = None) -> Iterator[Measurement]:
+        """
+        Mesure le bloc. Le code mesuré peut renseigner `m.rows_out`.
+
+        Example:
+            with REGISTRY.measure("clean", rows_in=len(df)) as m:
+                out = cleaner.clean()
+                m.rows_out = len(out)
+        """
+        m = Measurement(name=name, kind=kind, rows_in=rows_in)
+        peak_token = _PEAKS.enter()
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            yield m
+        except Exception:
+            m.status = "error"
+            raise
+        finally:
+            m.wall_s = time.perf_counter() - wall0
+            m.cpu_s = time.thread_time() - cpu0
+            m.peak_memory_bytes = _PEAKS.exit(peak_token)
+            self.record(m)
+
+    def measurements(self, kind: Optional[str] = None, since: float = 0.0) -> List[Measurement]:
+        """Dernières mesures (filtrées par type et date de début)."""
+        with self._lock:
+            return [m for m in self._history if (kind is None or m.kind == kind) and m.started_at >= since]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._history.clear()
+            self._totals.clear()
+
+    # --------------------------------------------------------------
+    # Exports
+    # --------------------------------------------------------------
+    def to_prometheus(self) -> str:
+        """Export au format texte Prometheus (exposition 0.0.4)."""
+        p = self.prefix
+        series = [
+            ("calls_total", "counter", "Nombre d'exécutions", "calls"),
+            ("errors_total", "counter", "Nombre d'exécutions en erreur", "errors"),
+            ("cache_hits_total", "counter", "Étapes servies depuis le cache", "cached"),
+            ("wall_seconds_total", "counter", "Temps réel cumulé", "wall"),
+            ("cpu_seconds_total", "counter", "Temps CPU cumulé", "cpu"),
+            ("rows_in_total", "counter", "Lignes en entrée", "rows_in"),
+            ("rows_out_total", "counter", "Lignes en sortie", "rows_out"),
+            ("peak_memory_bytes", "gauge", "Pic mémoire (au-dessus de l'entrée) le plus haut observé", "peak_memory"),
+            ("last_wall_seconds", "gauge", "Temps réel de la dernière exécution", "last_wall"),
+        ]
+        with self._lock:
+            totals = dict(self._totals)
+
+        lines = []
+        for metric, mtype, help_text, key in series:
+            lines.append(f"# HELP {p}_{metric} {help_text}")
+            lines.append(f"# TYPE {p}_{metric} {mtype}")
+            for (kind, name), t in sorted(totals.items()):
+                label_name = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{p}_{metric}{{kind="{kind}",name="{label_name}"}} {t[key]}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self, measurements: Optional[List[Measurement]] = None) -> Dict[str, Any]:
+        """Résumé JSON-sérialisable d'une liste de mesures (toutes par défaut)."""
+        if measurements is None:
+            measurements = self.measurements()
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_wall_s": sum(m.wall_s for m in measurements),
+            "measurements": [asdict(m) for m in measurements],
+        }
+
+    def write_summary(self, path: str, measurements: Optional[List[Measurement]] = None) -> str:
+        """Écrit le résumé JSON et retourne son chemin."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(measurements), f, indent=2, ensure_ascii=False)
+        return path
+
+
+# Registre global partagé par le pipeline et l'API
+REGISTRY = MetricsRegistry()
+
+
+def instrument_endpoint(name: str, registry: MetricsRegistry = REGISTRY,
+                        rows_in: Optional[Callable[[], Optional[int]]] = None):
+    """
+    Décorateur pour un endpoint FastAPI synchrone : la mesure s'exécute dans
+    le thread du pool, donc le temps CPU est celui de la requête.
+    `functools.wraps` conserve la signature utilisée par FastAPI.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with registry.measure(name, kind="endpoint", rows_in=rows_in() if rows_in else None) as m:
+                result = func(*args, **kwargs)
+                m.rows_out = count_rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile_run(output_dir: str, prefix: str = "profile", top: int = 30) -> Iterator[None]:
+    """
+    Capture cProfile + tracemalloc pour un run unique (mode opt-in, coûteux).
+
+    Écrit dans `output_dir` :
+    - `<prefix>.prof` : profil CPU (lisible avec pstats / snakeviz)
+    - `<prefix>_cpu.txt` : top des fonctions par temps cumulé
+    - `<prefix>_memory.txt` : top des allocations par ligne de code
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(output_dir, f"{prefix}.prof"))
+        with open(os.path.join(output_dir, f"{prefix}_cpu.txt"), "w", encoding="utf-8") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        with open(os.path.join(output_dir, f"{prefix}_memory.txt"), "w", encoding="utf-8") as f:
+            f.write(f"current={current} peak={peak}\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
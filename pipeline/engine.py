@@ -0,0 +1,329 @@
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from monitoring.metrics import REGISTRY, Measurement, MetricsRegistry, count_rows
+
+logger = logging.getLogger("pipeline")
+
+
+@dataclass
+class Stage:
+    """
+    Nœud du pipeline.
+
+    Parameters
+    ----------
+    name : str
+        Nom unique de l'étape.
+    func : Callable
+        Appelée avec les valeurs de `inputs` (dans l'ordre) puis `params`
+        en arguments nommés. Retourne une valeur, ou un tuple si plusieurs
+        `outputs` sont déclarées.
+    inputs : Sequence[str]
+        Noms des valeurs consommées (sorties d'autres étapes ou entrées du run).
+    outputs : Sequence[str]
+        Noms des valeurs produites (par défaut : le nom de l'étape).
+    params : dict
+        Paramètres fixes, inclus dans l'empreinte de cache.
+    cache : bool
+        False pour les étapes à effets de bord (fichiers écrits) qui doivent
+        toujours être rejouées.
+    version : str
+        À incrémenter quand le code de l'étape change, pour invalider le cache.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Sequence[str] = ()
+    outputs: Sequence[str] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    cache: bool = True
+    version: str = "1"
+
+    def __post_init__(self):
+        self.inputs = tuple(self.inputs)
+        self.outputs = tuple(self.outputs) or (self.name,)
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Empreinte d'une valeur d'entrée du pipeline.
+
+    - DataFrame : hash du contenu (colonnes, types, valeurs)
+    - chemin de fichier existant : chemin + taille + date de modification
+    - autre : repr()
+    """
+    h = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, str) and os.path.isfile(value):
+        st = os.stat(value)
+        h.update(f"file:{os.path.abspath(value)}:{st.st_size}:{st.st_mtime_ns}".encode())
+    else:
+        h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+class Pipeline:
+    """
+    Exécuteur de pipeline déclaratif (DAG d'étapes).
+
+    - les étapes indépendantes s'exécutent en parallèle (threads)
+    - chaque sortie est mémorisée par empreinte de ses entrées : l'empreinte
+      d'une étape dépend de son nom, sa version, ses paramètres et des
+      empreintes de ses entrées (sans re-hasher les résultats intermédiaires)
+    - avec `cache_dir`, le cache est persisté sur disque : un nouveau run ne
+      rejoue que les étapes dont une entrée a changé ; en fin de run, les
+      entrées plus vieilles que `cache_max_age` secondes sont supprimées, puis
+      les moins récemment utilisées tant que le dossier dépasse `cache_max_bytes`
+      (None = pas de limite)
+    - sans cache (ni `cache_dir`, ni cache mémoire), les entrées ne sont pas
+      hashées
+
+    Example:
+        pipeline = Pipeline([Stage("load", load, inputs=["csv_path"], outputs=["df_raw"]), ...])
+        results = pipeline.run(csv_path="data/ventes_2025.csv")
+    """
+
+    def __init__(self, stages: Iterable[Stage], cache_dir: Optional[str] = None, max_workers: int = 4,
+                 memory_cache_size: int = 32, metrics: MetricsRegistry = REGISTRY,
+                 cache_max_bytes: Optional[int] = 1 << 30, cache_max_age: Optional[float] = 30 * 86400.0):
+        self.stages: Dict[str, Stage] = {}
+        self.producers: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Étape dupliquée : {stage.name!r}")
+            self.stages[stage.name] = stage
+            for out in stage.outputs:
+                if out in self.producers:
+                    raise ValueError(f"Sortie {out!r} produite par plusieurs étapes")
+                self.producers[out] = stage
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_age = cache_max_age
+        self.max_workers = max_workers
+        self.memory_cache_size = memory_cache_size
+        self._memory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Statut de la dernière exécution terminée : {étape: "run" | "cached"}.
+        # Construits localement et assignés en fin de run : un même Pipeline
+        # peut être exécuté par plusieurs threads (API) sans mélanger les runs.
+        self.last_run: Dict[str, str] = {}
+        # Mesures (temps, CPU, mémoire, lignes) de la dernière exécution terminée
+        self.metrics = metrics
+        self.last_metrics: List[Measurement] = []
+
+    # --------------------------------------------------------------
+    # Planification
+    # --------------------------------------------------------------
+    def _required_stages(self, targets: Optional[Sequence[str]], available: Iterable[str]) -> List[Stage]:
+        """Étapes nécessaires pour produire `targets` (toutes si None)."""
+        if targets is None:
+            return list(self.stages.values())
+
+        available = set(available)
+        needed: Dict[str, Stage] = {}
+        todo = list(targets)
+        while todo:
+            value = todo.pop()
+            if value in available:
+                continue
+            stage = self.producers.get(value)
+            if stage is None:
+                raise KeyError(f"Aucune étape ne produit {value!r}")
+            if stage.name not in needed:
+                needed[stage.name] = stage
+                todo.extend(stage.inputs)
+        return [s for s in self.stages.values() if s.name in needed]
+
+    def _stage_key(self, stage: Stage, keys: Dict[str, str]) -> str:
+        h = hashlib.sha256()
+        h.update(f"{stage.name}:{stage.version}:{sorted(stage.params.items())!r}".encode())
+        for name in stage.inputs:
+            h.update(f"{name}={keys[name]}".encode())
+        return h.hexdigest()
+
+    # --------------------------------------------------------------
+    # Cache
+    # --------------------------------------------------------------
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _cache_get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            if key in self._memory_cache:
+                self._memory_cache.move_to_end(key)
+                return self._memory_cache[key]
+        if self.cache_dir and os.path.exists(self._cache_path(key)):
+            try:
+                with open(self._cache_path(key), "rb") as f:
+                    outputs = pickle.load(f)
+            except Exception:
+                logger.warning("Cache illisible ignoré : %s", self._cache_path(key))
+                return None
+            # Date de modification = dernier usage, pour l'éviction
+            with contextlib.suppress(OSError):
+                os.utime(self._cache_path(key))
+            self._remember(key, outputs)
+            return outputs
+        return None
+
+    def _remember(self, key: str, outputs: tuple) -> None:
+        # LRU borné : les DataFrames mémorisés peuvent être volumineux
+        if self.memory_cache_size <= 0:
+            return
+        with self._lock:
+            self._memory_cache[key] = outputs
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+
+    def _cache_put(self, key: str, outputs: tuple) -> None:
+        self._remember(key, outputs)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._cache_path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._cache_path(key))
+
+    def prune_disk_cache(self, now: Optional[float] = None) -> List[str]:
+        """
+        Supprime du cache disque les entrées expirées (`cache_max_age`), puis
+        les moins récemment utilisées au-delà de `cache_max_bytes`.
+        Retourne les fichiers supprimés.
+        """
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return []
+        now = time.time() if now is None else now
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith((".pkl", ".tmp")):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()  # plus anciens d'abord
+
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for mtime, size, path in entries:
+            expired = self.cache_max_age is not None and now - mtime > self.cache_max_age
+            too_big = self.cache_max_bytes is not None and total > self.cache_max_bytes
+            if not (expired or too_big):
+                break
+            with contextlib.suppress(FileNotFoundError):  # déjà supprimé par un autre run
+                os.remove(path)
+            total -= size
+            removed.append(path)
+        if removed:
+            logger.info("Cache disque : %d entrée(s) supprimée(s)", len(removed))
+        return removed
+
+    def clear_cache(self) -> None:
+        """Vide le cache mémoire (le cache disque est conservé)."""
+        with self._lock:
+            self._memory_cache.clear()
+
+    # --------------------------------------------------------------
+    # Exécution
+    # --------------------------------------------------------------
+    def _execute(self, stage: Stage, values: Dict[str, Any]) -> Tuple[tuple, Measurement]:
+        logger.info("Étape %s...", stage.name)
+        args = tuple(values[name] for name in stage.inputs)
+        with self.metrics.measure(stage.name, kind="stage", rows_in=count_rows(args)) as m:
+            result = stage.func(*args, **stage.params)
+            if len(stage.outputs) == 1:
+                result = (result,)
+            elif not isinstance(result, tuple) or len(result) != len(stage.outputs):
+                raise ValueError(f"L'étape {stage.name!r} doit retourner {len(stage.outputs)} valeurs")
+            m.rows_out = count_rows(result)
+        return result, m
+
+    def run(self, targets: Optional[Sequence[str]] = None, **inputs) -> Dict[str, Any]:
+        """
+        Exécute les étapes nécessaires et retourne toutes les valeurs
+        (entrées + sorties produites).
+
+        Parameters
+        ----------
+        targets : list, optional
+            Valeurs à produire ; seules les étapes nécessaires sont exécutées.
+        **inputs
+            Valeurs initiales (chemins, DataFrames, paramètres de run).
+        """
+        stages = self._required_stages(targets, inputs)
+        values: Dict[str, Any] = dict(inputs)
+        # Empreintes calculées seulement si une étape peut être lue ou écrite en cache
+        caching = (bool(self.cache_dir) or self.memory_cache_size > 0) and any(s.cache for s in stages)
+        keys: Dict[str, str] = {name: fingerprint(value) for name, value in inputs.items()} if caching else {}
+
+        for stage in stages:
+            missing = [n for n in stage.inputs if n not in self.producers and n not in inputs]
+            if missing:
+                raise KeyError(f"Entrées manquantes pour {stage.name!r} : {missing}")
+
+        pending = {s.name: s for s in stages}
+        last_run: Dict[str, str] = {}
+        last_metrics: List[Measurement] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # Lancer (ou servir depuis le cache) toutes les étapes prêtes
+                for name, stage in list(pending.items()):
+                    if not all(i in values for i in stage.inputs):
+                        continue
+                    del pending[name]
+                    key = self._stage_key(stage, keys) if caching else None
+                    cached = self._cache_get(key) if caching and stage.cache else None
+                    if cached is not None:
+                        logger.info("Étape %s : cache", stage.name)
+                        self._store(stage, key, cached, values, keys)
+                        last_run[stage.name] = "cached"
+                        m = Measurement(stage.name, status="cached", rows_out=count_rows(cached))
+                        self.metrics.record(m)
+                        last_metrics.append(m)
+                    else:
+                        running[executor.submit(self._execute, stage, values)] = (stage, key)
+
+                if not running:
+                    if pending:
+                        # Servir une étape depuis le cache peut en débloquer d'autres
+                        if any(all(i in values for i in s.inputs) for s in pending.values()):
+                            continue
+                        raise RuntimeError(f"Dépendances circulaires ou manquantes : {sorted(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, key = running.pop(future)
+                    outputs, m = future.result()
+                    last_metrics.append(m)
+                    if caching and stage.cache:
+                        self._cache_put(key, outputs)
+                    self._store(stage, key, outputs, values, keys)
+                    last_run[stage.name] = "run"
+
+        self.last_run, self.last_metrics = last_run, last_metrics
+        if caching and "run" in last_run.values():
+            self.prune_disk_cache()
+        return values
+
+    @staticmethod
+    def _store(stage: Stage, key: Optional[str], outputs: tuple, values: Dict[str, Any],
+               keys: Dict[str, str]) -> None:
+        for name, value in zip(stage.outputs, outputs):
+            values[name] = value
+            if key is not None:
+                keys[name] = f"{key}:{name}"
@@ -0,0 +1,105 @@
+import os
+from typing import Optional
+
+import pandas as pd
+
+from data_loader.loaders import open_loader
+from data_loader.data_validator import DataValidator
+from data_loader.schema import SALES_SCHEMA, apply_schema
+from data_processor.cleaner import DataCleaner
+from data_processor.aggregator import DataAggregator
+from data_processor.statistics import StatisticsCalculator
+
+from .engine import Pipeline, Stage
+
+
+# --------------------------------------------------------------
+# Fonctions d'étapes (une responsabilité chacune)
+# --------------------------------------------------------------
+def load_stage(csv_path: str) -> pd.DataFrame:
+    # Colonnes du schéma, valeurs brutes : les types sont appliqués après la validation
+    return open_loader(csv_path, schema=None).load()
+
+
+def validate_stage(df_raw: pd.DataFrame) -> pd.DataFrame:
+    return DataValidator(df_raw).validate()
+
+
+def clean_stage(df_valid: pd.DataFrame) -> pd.DataFrame:
+    # Après le ffill : une valeur invalide reste manquante (et comptée), pas recopiée
+    return apply_schema(DataCleaner(df_valid).clean(), SALES_SCHEMA)
+
+
+def ventes_par_categorie_stage(df_clean: pd.DataFrame) -> pd.DataFrame:
+    return DataAggregator(df_clean).ventes_par_categorie_et_source()
+
+
+def ventes_par_ville_stage(df_clean: pd.DataFrame) -> pd.DataFrame:
+    return DataAggregator(df_clean).chiffre_affaires_par_ville()
+
+
+def top_produits_stage(df_clean: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    return DataAggregator(df_clean).top_produits_par_revenu(n=n)
+
+
+def stats_stage(df_clean: pd.DataFrame) -> pd.DataFrame:
+    return StatisticsCalculator(df_clean).basic_stats()
+
+
+def charts_stage(df_clean: pd.DataFrame, charts_dir: str, n: int = 10) -> dict:
+    from visualization.chart_builder import ChartBuilder
+
+    os.makedirs(charts_dir, exist_ok=True)
+    paths = {
+        "ventes_par_categorie": os.path.join(charts_dir, "ventes_par_categorie.png"),
+        "ventes_par_ville": os.path.join(charts_dir, "ventes_par_ville.png"),
+        "top_produits": os.path.join(charts_dir, "top_produits.png"),
+    }
+    chart_builder = ChartBuilder(df_clean)
+    chart_builder.plot_sales_by_category(save_path=paths["ventes_par_categorie"])
+    chart_builder.plot_sales_by_city(save_path=paths["ventes_par_ville"])
+    chart_builder.plot_top_products(n=n, save_path=paths["top_produits"])
+    return paths
+
+
+def report_stage(df_clean: pd.DataFrame, chart_paths: dict, charts_dir: str, report_dir: str,
+                 filename: str = "rapport_ventes.pdf") -> str:
+    from visualization.report_generator import ReportGenerator
+
+    report = ReportGenerator(df_clean, output_dir=report_dir)
+    report.generate_pdf_report(filename, charts_dir=charts_dir)
+    return os.path.join(report_dir, filename)
+
+
+# --------------------------------------------------------------
+# Définitions de pipelines
+# --------------------------------------------------------------
+def preparation_stages() -> list:
+    """load -> validate -> clean (partagé par main.py et l'API)."""
+    return [
+        Stage("load", load_stage, inputs=["csv_path"], outputs=["df_raw"]),
+        Stage("validate", validate_stage, inputs=["df_raw"], outputs=["df_valid"]),
+        Stage("clean", clean_stage, inputs=["df_valid"], outputs=["df_clean"]),
+    ]
+
+
+def analysis_stages(top_n: int = 10, report_filename: str = "rapport_ventes.pdf") -> list:
+    """Branches indépendantes (agrégations, stats, graphiques) puis rapport."""
+    return [
+        Stage("ventes_par_categorie", ventes_par_categorie_stage, inputs=["df_clean"]),
+        Stage("ventes_par_ville", ventes_par_ville_stage, inputs=["df_clean"]),
+        Stage("top_produits", top_produits_stage, inputs=["df_clean"], params={"n": top_n}),
+        Stage("stats", stats_stage, inputs=["df_clean"], outputs=["stats_resume"]),
+        # Étapes à effets de bord (fichiers) : toujours rejouées
+        Stage("charts", charts_stage, inputs=["df_clean", "charts_dir"], outputs=["chart_paths"],
+              params={"n": top_n}, cache=False),
+        Stage("report", report_stage, inputs=["df_clean", "chart_paths", "charts_dir", "report_dir"],
+              outputs=["report_path"], params={"filename": report_filename}, cache=False),
+    ]
+
+
+def build_sales_pipeline(cache_dir: str = None, max_workers: int = 4, cache_max_bytes: Optional[int] = 1 << 30,
+                         cache_max_age: Optional[float] = 30 * 86400.0, **kwargs) -> Pipeline:
+    """Pipeline complet : load -> validate -> clean -> (agrégations | stats | graphiques) -> rapport."""
+    return Pipeline(preparation_stages() + analysis_stages(**kwargs), cache_dir=cache_dir, max_workers=max_workers,
+                    cache_max_bytes=cache_max_bytes, cache_max_age=cache_max_age)
@@ -0,0 +1,352 @@
+import fnmatch
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_loader.schema import SALES_COLUMNS, select_columns
+
+from .stages import clean_stage
+
+
+logger = logging.getLogger("pipeline.watcher")
+
+_TAIL_BYTES = 64
+
+
+@dataclass
+class _FileState:
+    """Suivi d'un fichier surveillé : octets déjà transmis, dernier état vu."""
+
+    inode: int = -1
+    offset: int = 0              # fin de la dernière ligne complète transmise
+    size: int = -1
+    mtime_ns: int = -1
+    changed_at: float = 0.0      # dernier changement observé (anti-rebond)
+    header: bytes = b""
+    tail: bytes = b""            # derniers octets transmis : détecte une réécriture sur place
+
+
+@dataclass
+class _ValidationState:
+    """Validation d'un fichier lot par lot, comme DataValidator sur le fichier entier."""
+
+    seen: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint64))  # empreintes des lignes brutes
+    last: Optional[pd.DataFrame] = None  # dernière ligne validée : reprise du ffill au lot suivant
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Empreinte 64 bits par ligne ; nombres en float64 (10 et 10.0 identiques d'un lot à l'autre)."""
+    numeric = {c: "float64" for c in df.columns if pd.api.types.is_numeric_dtype(df[c])}
+    return pd.util.hash_pandas_object(df.astype(numeric), index=False).to_numpy()
+
+
+@dataclass
+class Batch:
+    """Plage d'octets [start, stop) d'un fichier, à parser puis intégrer."""
+
+    path: str
+    start: int
+    stop: int
+    data: bytes
+    header: bytes
+    tail: bytes
+    reset: bool = False          # fichier remplacé / réécrit : ses données précédentes sont retirées
+
+
+class IncrementalAggregates:
+    """
+    Agrégats tenus à jour morceau par morceau (sommes additives) : ajout
+    d'un lot nettoyé, ou retrait (sign=-1) quand un fichier est remplacé.
+
+    Chaque clé garde aussi son nombre de lignes (entier, exact) : une clé
+    dont toutes les lignes ont été retirées disparaît, même si la somme en
+    flottants laisse un résidu (ex : 2.8e-17).
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.revenu_par_ville: Optional[pd.DataFrame] = None
+        self.quantite_par_categorie_et_source: Optional[pd.DataFrame] = None
+        self.revenu_par_produit: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def _add(total: Optional[pd.DataFrame], values: pd.Series, keys, sign: int) -> pd.DataFrame:
+        grouped = values.astype("float64").groupby(keys)
+        part = pd.DataFrame({"valeur": sign * grouped.sum(), "lignes": sign * grouped.size()})
+        if total is not None:
+            part = total.add(part, fill_value=0)
+        part = part[part["lignes"] > 0]
+        return part.astype({"lignes": "int64"})
+
+    @staticmethod
+    def _frame(total: Optional[pd.DataFrame], keys: List[str], name: str) -> pd.DataFrame:
+        if total is None:
+            return pd.DataFrame(columns=keys + [name])
+        return total["valeur"].rename_axis(keys).reset_index(name=name)
+
+    def add(self, df: pd.DataFrame, sign: int = 1) -> None:
+        revenu = df["prix"] * df["quantite"]
+        self.rows += sign * len(df)
+        self.revenu_par_ville = self._add(self.revenu_par_ville, revenu, df["ville"], sign)
+        self.quantite_par_categorie_et_source = self._add(
+            self.quantite_par_categorie_et_source, df["quantite"], [df["categorie"], df["source"]], sign
+        )
+        self.revenu_par_produit = self._add(self.revenu_par_produit, revenu, df["produit"], sign)
+
+    # Mêmes formes que DataAggregator
+    def chiffre_affaires_par_ville(self) -> pd.DataFrame:
+        return self._frame(self.revenu_par_ville, ["ville"], "revenu")
+
+    def ventes_par_categorie_et_source(self) -> pd.DataFrame:
+        return self._frame(self.quantite_par_categorie_et_source, ["categorie", "source"], "quantite")
+
+    def top_produits_par_revenu(self, n: int = 5) -> pd.DataFrame:
+        top = self._frame(self.revenu_par_produit, ["produit"], "revenu")
+        return top.nlargest(n, "revenu").reset_index(drop=True)
+
+
+class FolderWatcher:
+    """
+    Ingestion continue des CSV déposés dans un dossier (ex : DATA_DIR).
+
+    - scrutation périodique (`poll`) : seuls les nouveaux fichiers et les
+      octets ajoutés en fin de fichier sont lus (jusqu'à la dernière ligne
+      complète) ; un fichier remplacé, tronqué ou réécrit est relu entièrement,
+      un fichier supprimé est retiré du jeu de données et des agrégats
+    - anti-rebond : un fichier n'est lu qu'après `debounce` secondes sans
+      changement, une rafale d'écritures donne un seul lot
+    - contre-pression : les lots passent par une file bornée (`max_pending`) ;
+      file pleine = la lecture s'arrête et reprend au tour suivant, les
+      positions de lecture n'avançant qu'une fois le lot accepté
+    - chaque lot passe par validation + nettoyage, puis alimente le jeu de
+      données vivant et les agrégats incrémentaux ; `on_update(watcher)` est
+      appelé quand la file est vide
+    - validation par fichier : les doublons sont cherchés dans tous les lots
+      déjà lus du fichier et le ffill reprend sa dernière ligne ; comme pour
+      load_stage, seules les colonnes de SALES_COLUMNS sont lues (les colonnes
+      en plus ne comptent pas dans les doublons) et les types sont appliqués
+      par clean_stage après la validation : chaque fichier donne le même
+      résultat, aux mêmes types, que `main.py --csv <fichier>` ; en revanche
+      ni doublons ni ffill ne traversent la frontière entre deux fichiers
+
+    Example:
+        watcher = FolderWatcher(DATA_DIR, on_update=lambda w: print(w.aggregates.rows))
+        watcher.run_forever()
+    """
+
+    def __init__(self, directory: str, pattern: str = "*.csv", poll_interval: float = 1.0,
+                 debounce: float = 0.5, max_pending: int = 8, max_batch_bytes: int = 8 * 2 ** 20,
+                 separator: str = ",", on_update: Optional[Callable[["FolderWatcher"], None]] = None):
+        self.directory = directory
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_batch_bytes = max_batch_bytes
+        self.separator = separator
+        self.on_update = on_update
+
+        self.aggregates = IncrementalAggregates()
+        self.stats = {"batches": 0, "bytes": 0, "errors": 0, "backpressure": 0}
+        self._files: Dict[str, _FileState] = {}
+        self._frames: Dict[str, List[pd.DataFrame]] = {}
+        self._validation: Dict[str, _ValidationState] = {}
+        self._pending: "queue.Queue[Batch]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._snapshot: Optional[pd.DataFrame] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    # --------------------------------------------------------------
+    # Lecture (producteur)
+    # --------------------------------------------------------------
+    def poll(self) -> int:
+        """Un tour de scrutation ; retourne le nombre de lots mis en file."""
+        queued = 0
+        now = time.monotonic()
+        try:
+            entries = sorted(os.scandir(self.directory), key=lambda e: e.name)
+        except FileNotFoundError:
+            return 0
+        seen = set()
+        for entry in entries:
+            if not entry.is_file() or not fnmatch.fnmatch(entry.name, self.pattern):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue  # supprimé entre-temps : traité comme absent
+            seen.add(entry.path)
+            state = self._files.setdefault(entry.path, _FileState())
+            if (st.st_size, st.st_mtime_ns) != (state.size, state.mtime_ns):
+                state.size, state.mtime_ns, state.changed_at = st.st_size, st.st_mtime_ns, now
+            if now - state.changed_at < self.debounce:
+                continue  # encore en cours d'écriture
+
+            reset = st.st_ino != state.inode or st.st_size < state.offset
+            if not reset and st.st_size == state.offset:
+                continue
+            batch = self._read(entry.path, state, reset)
+            if batch is None:
+                continue
+            try:
+                self._pending.put_nowait(batch)
+            except queue.Full:
+                self.stats["backpressure"] += 1
+                return queued  # positions inchangées : relu au prochain tour
+            state.inode, state.offset, state.header, state.tail = st.st_ino, batch.stop, batch.header, batch.tail
+            queued += 1
+
+        # Fichiers disparus : leurs lignes sont retirées (lot vide avec reset)
+        for path in [p for p in self._files if p not in seen]:
+            try:
+                self._pending.put_nowait(Batch(path, 0, 0, b"", b"", b"", reset=True))
+            except queue.Full:
+                self.stats["backpressure"] += 1
+                break
+            del self._files[path]
+            queued += 1
+        return queued
+
+    def _read(self, path: str, state: _FileState, reset: bool) -> Optional[Batch]:
+        with open(path, "rb") as f:
+            if not reset:
+                # Les octets déjà lus doivent être inchangés, sinon relecture complète
+                f.seek(state.offset - len(state.tail))
+                reset = f.read(len(state.tail)) != state.tail
+            start = 0 if reset else state.offset
+            f.seek(start)
+            data = f.read(self.max_batch_bytes)
+        end = data.rfind(b"\n")
+        if end < 0:
+            return None  # pas encore de ligne complète
+        data = data[:end + 1]
+        header = state.header
+        if reset:
+            newline = data.find(b"\n") + 1
+            header, data = data[:newline], data[newline:]
+        stop = start + len(data) + (len(header) if reset else 0)
+        tail = ((header if reset else state.tail) + data)[-_TAIL_BYTES:]
+        return Batch(path, start, stop, data, header, tail, reset)
+
+    # --------------------------------------------------------------
+    # Intégration (consommateur)
+    # --------------------------------------------------------------
+    def process_pending(self, timeout: Optional[float] = None) -> int:
+        """Intègre les lots en file ; retourne le nombre de lots traités."""
+        processed = 0
+        while True:
+            try:
+                batch = self._pending.get(timeout=timeout) if timeout and not processed else self._pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._ingest(batch)
+                processed += 1
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception("Lot illisible : %s [%d, %d)", batch.path, batch.start, batch.stop)
+            finally:
+                self._pending.task_done()
+        if processed and self.on_update is not None:
+            self.on_update(self)
+        return processed
+
+    def _validate(self, path: str, raw: pd.DataFrame) -> pd.DataFrame:
+        """
+        Mêmes règles que DataValidator.validate (doublons supprimés puis ffill),
+        appliquées au fichier entier et non au seul lot.
+        """
+        state = self._validation.setdefault(path, _ValidationState())
+        hashes = _row_hashes(raw)
+        keep = ~pd.Series(hashes).duplicated().to_numpy() & ~np.isin(hashes, state.seen)
+        state.seen = np.union1d(state.seen, hashes)
+
+        valid = raw[keep]
+        if state.last is not None:
+            valid = pd.concat([state.last, valid], ignore_index=True).ffill().iloc[1:]
+        else:
+            valid = valid.ffill()
+        valid = valid.reset_index(drop=True)
+        if len(valid):
+            state.last = valid.tail(1)
+        return valid
+
+    def _ingest(self, batch: Batch) -> None:
+        df = None
+        if batch.reset:
+            self._validation.pop(batch.path, None)
+        if batch.data.strip():
+            wanted = set(SALES_COLUMNS)
+            raw = pd.read_csv(io.BytesIO(batch.header + batch.data), sep=self.separator,
+                              usecols=lambda name: name in wanted)
+            raw = select_columns(raw, SALES_COLUMNS, os.path.basename(batch.path))
+            df = clean_stage(self._validate(batch.path, raw))
+        with self._lock:
+            if batch.reset:
+                for old in self._frames.pop(batch.path, []):
+                    self.aggregates.add(old, sign=-1)
+            if df is not None and len(df):
+                self._frames.setdefault(batch.path, []).append(df)
+                self.aggregates.add(df)
+            self._snapshot = None
+            self.stats["batches"] += 1
+            self.stats["bytes"] += batch.stop - batch.start
+        logger.info("Lot intégré : %s [%d, %d) %d lignes", os.path.basename(batch.path), batch.start, batch.stop,
+                    0 if df is None else len(df), extra={"rows_total": self.aggregates.rows})
+
+    def dataset(self) -> pd.DataFrame:
+        """Jeu de données nettoyé vivant (tous les lots intégrés)."""
+        with self._lock:
+            if self._snapshot is None:
+                frames = [f for parts in self._frames.values() for f in parts]
+                self._snapshot = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            return self._snapshot
+
+    # --------------------------------------------------------------
+    # Démon
+    # --------------------------------------------------------------
+    def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.poll_interval)
+
+    def _process_loop(self) -> None:
+        while not self._stop.is_set():
+            self.process_pending(timeout=self.poll_interval)
+
+    def start(self) -> "FolderWatcher":
+        """Démarre les threads de scrutation et d'intégration."""
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._poll_loop, name="watcher-poll", daemon=True),
+            threading.Thread(target=self._process_loop, name="watcher-ingest", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.process_pending()
+
+    def run_forever(self) -> None:
+        """Bloque jusqu'à Ctrl+C."""
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            logger.info("Arrêt de la surveillance de %s", self.directory)
+        finally:
+            self.stop()
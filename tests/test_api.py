@@ -7,6 +7,8 @@ from api.app import app
 
 client = TestClient(app)
 
+HEADER_CSV = "date,produit,categorie,prix,quantite,ville,source\n"
+
 
 def test_health_ok():
     r = client.get("/health")
@@ -39,3 +41,124 @@ def test_upload_then_preview_then_stats():
     stats = r.json()["stats"]
     assert isinstance(stats, list)
     assert len(stats) > 0
+
+
+def test_upload_accepts_compressed_csv_and_rejects_unknown_formats():
+    import gzip
+
+    csv_content = (
+        "date,produit,categorie,prix,quantite,ville,source\n"
+        "2025-01-01,Stylo,Fournitures,1.5,10,Paris,web\n"
+        "2025-01-02,Souris,Electronique,25.0,2,Lyon,web\n"
+    )
+    files = {"file": ("ventes_test.csv.gz", gzip.compress(csv_content.encode()), "application/gzip")}
+    r = client.post("/upload", files=files)
+    assert r.status_code == 200
+    data = client.get("/data/preview").json()
+    assert data["rows"] == 2
+    # Même représentation que le CSV source : date en jour, quantité entière
+    assert data["preview"][0]["date"] == "2025-01-01"
+    assert data["preview"][0]["quantite"] == 10 and isinstance(data["preview"][0]["quantite"], int)
+    quantities = [row["quantite"] for row in client.get("/sales/by-category").json()]
+    assert all(isinstance(q, int) for q in quantities)
+
+    missing = "date,produit,prix\n2025-01-01,Stylo,1.5\n"
+    r = client.post("/upload", files={"file": ("incomplet.csv", missing, "text/csv")})
+    assert r.status_code == 400
+    assert "Colonnes manquantes dans incomplet.csv : categorie, quantite, ville, source" in r.json()["detail"]
+
+    r = client.post("/upload", files={"file": ("ventes.txt", csv_content, "text/plain")})
+    assert r.status_code == 400
+    assert "Format non supporté" in r.json()["detail"]
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client.get("/stats/basic")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert "# TYPE pmn_wall_seconds_total counter" in body
+    assert 'pmn_calls_total{kind="endpoint",name="/stats/basic"}' in body
+
+
+def test_api_startup_does_not_import_plotting_or_pdf_libraries():
+    from benchmarks.bench_startup import heavy_modules_loaded
+
+    assert heavy_modules_loaded("api.app", ["matplotlib", "plotly", "reportlab"]) == []
+
+
+def test_grouped_stats_endpoint():
+    csv_content = """date,produit,categorie,prix,quantite,ville,source
+2025-01-01,Stylo,Fournitures,1.5,10,Paris,web
+2025-01-01,Cahier,Fournitures,3.0,5,Lyon,magasin
+2025-01-02,Souris,Electronique,25.0,2,Paris,web
+"""
+    client.post("/upload", files={"file": ("ventes_test.csv", csv_content, "text/csv")})
+
+    r = client.get("/stats/grouped?by=categorie,source")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["by"] == ["categorie", "source"]
+    rows = {(s["categorie"], s["source"], s["colonne"]): s for s in data["stats"]}
+    assert rows[("Fournitures", "web", "prix")]["median"] == 1.5
+    assert rows[("Electronique", "web", "quantite")]["count"] == 1
+
+    assert client.get("/stats/grouped?by=inconnue").status_code == 400
+
+
+def test_shared_dataset_mode_serves_data_published_by_another_worker(tmp_path, monkeypatch):
+    import api.app as app_module
+    from data_loader.shared_dataset import SharedDataset
+
+    monkeypatch.setattr(app_module, "SHARED", SharedDataset(str(tmp_path)))
+    monkeypatch.setattr(app_module, "STATE", {"df_raw": None, "df_valid": None, "df_clean": None, "version": None})
+
+    # Un autre worker publie un jeu de données nettoyé
+    df = pd.DataFrame(
+        {"produit": ["Stylo", "Cahier"], "categorie": ["Fournitures"] * 2, "prix": [1.5, 3.0],
+         "quantite": [10, 5], "ville": ["Paris", "Lyon"], "source": ["web", "magasin"]}
+    )
+    SharedDataset(str(tmp_path)).publish(df)
+
+    r = client.get("/sales/by-city")
+    assert r.status_code == 200
+    assert {row["ville"]: row["revenu"] for row in r.json()} == {"Lyon": 15.0, "Paris": 15.0}
+    assert client.get("/data/preview").json()["rows"] == 2
+
+    # Chargement dans ce worker : publié, sans copie privée dans le cache du pipeline
+    csv_content = HEADER_CSV + "2025-01-03,Souris,Electronique,25.0,2,Paris,web\n"
+    r = client.post("/upload", files={"file": ("ventes_partage.csv", csv_content, "text/csv")})
+    assert r.status_code == 200
+    assert not app_module.PREPARATION_UNCACHED._memory_cache
+    assert app_module.STATE["df_valid"] is None
+    assert client.get("/data/preview").json()["rows"] == 1
+
+
+def test_sql_backend_query_parameter(tmp_path, monkeypatch):
+    import api.app as app_module
+    from data_loader.sql_store import SQLStore
+
+    monkeypatch.setattr(app_module, "SQL_STORE", SQLStore(str(tmp_path / "ventes.sqlite")))
+    csv_content = """date,produit,categorie,prix,quantite,ville,source
+2025-01-01,Stylo,Fournitures,1.5,10,Paris,web
+2025-01-01,Cahier,Fournitures,3.0,5,Lyon,magasin
+2025-01-02,Souris,Electronique,25.0,2,Paris,web
+"""
+    client.post("/upload", files={"file": ("ventes_test.csv", csv_content, "text/csv")})
+
+    for endpoint in ("/sales/by-city", "/sales/by-category", "/sales/top-products?n=2", "/stats/basic",
+                     "/stats/grouped?by=categorie,source"):
+        separator = "&" if "?" in endpoint else "?"
+        pandas_r = client.get(endpoint)
+        sql_r = client.get(f"{endpoint}{separator}backend=sql")
+        assert sql_r.status_code == 200, endpoint
+        pandas_data, sql_data = pandas_r.json(), sql_r.json()
+        if isinstance(pandas_data, dict):
+            pandas_data, sql_data = pandas_data["stats"], sql_data["stats"]
+        pd.testing.assert_frame_equal(pd.DataFrame(sql_data), pd.DataFrame(pandas_data), check_dtype=False)
+
+    assert client.get("/stats/grouped?by=inconnue&backend=sql").status_code == 400
+    assert client.get("/sales/by-city?backend=duckdb").status_code == 422
+    monkeypatch.setattr(app_module, "SQL_STORE", None)
+    assert client.get("/sales/by-city?backend=sql").status_code == 400
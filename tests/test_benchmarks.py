@@ -0,0 +1,104 @@
+import pandas as pd
+
+from benchmarks.common import BenchResult, compare_to_baseline, save_baseline
+from benchmarks.data_generator import COLUMNS, SalesDataGenerator
+
+
+def test_generator_is_reproducible_and_matches_schema(tmp_path):
+    df = SalesDataGenerator(n_products=50, n_cities=5, n_categories=4, seed=42).generate(2_000)
+    again = SalesDataGenerator(n_products=50, n_cities=5, n_categories=4, seed=42).generate(2_000)
+
+    assert list(df.columns) == COLUMNS
+    assert len(df) == 2_000
+    pd.testing.assert_frame_equal(df, again)
+    assert df["ville"].nunique() <= 5
+    assert df["categorie"].nunique() <= 4
+    assert (df["prix"] > 0).all()
+
+    csv_path = SalesDataGenerator(n_products=50, n_cities=5, n_categories=4, seed=42).write_csv(
+        str(tmp_path / "ventes.csv"), 2_000
+    )
+    assert len(pd.read_csv(csv_path)) == 2_000
+
+
+def test_compare_to_baseline_flags_regressions(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline([BenchResult("stage", 10, 1.0, 100)], path=path)
+
+    assert compare_to_baseline([BenchResult("stage", 10, 1.2, 100)], tolerance=1.5, path=path) == []
+    regressions = compare_to_baseline([BenchResult("stage", 10, 2.0, 100)], tolerance=1.5, path=path)
+    assert len(regressions) == 1
+
+
+def test_memory_report_compares_dataframe_and_sales_table(tmp_path):
+    from benchmarks.bench_memory import format_report, memory_report
+
+    csv_path = SalesDataGenerator(seed=1).write_csv(str(tmp_path / "ventes.csv"), 5_000)
+    report = memory_report(csv_path, chunksize=2_000)
+
+    assert report.attrs["rows"] == 5_000
+    assert report.loc["TOTAL", "ratio"] > 5
+    assert "SalesTable" in format_report(report)
+
+
+def test_logging_benchmark_runs():
+    from benchmarks.bench_logging import run_benchmarks
+
+    results = {r.name: r for r in run_benchmarks(records=200, repeat=1)}
+    assert "logging async JSON" in results
+    assert results["logging aperçu DEBUG paresseux (désactivé)"].seconds < results["logging aperçu INFO (formaté)"].seconds
+
+
+def test_sql_benchmark_compares_both_backends(tmp_path):
+    from benchmarks.bench_sql import run_benchmarks
+
+    names = {r.name for r in run_benchmarks(2_000, str(tmp_path), repeat=1, with_api=False)}
+    assert {"pandas:grouped_stats", "sql:grouped_stats"} <= names
+
+
+def test_load_test_percentiles_and_threshold_check(tmp_path):
+    from benchmarks.bench_load import Sample, TOTAL, check_thresholds, save_thresholds, summarize
+
+    samples = [Sample("GET /sales/by-city", ms / 1000, True) for ms in range(1, 101)]
+    summary = summarize(samples, elapsed=10.0)
+    assert summary[TOTAL]["requests"] == 100
+    assert summary["GET /sales/by-city"]["rps"] == 10.0
+    assert 50 <= summary["GET /sales/by-city"]["p50_ms"] <= 51
+    assert summary["GET /sales/by-city"]["p99_ms"] > summary["GET /sales/by-city"]["p95_ms"]
+
+    path = str(tmp_path / "thresholds.json")
+    save_thresholds(summary, rows=1_000, headroom=1.5, path=path)
+    assert check_thresholds(summary, rows=1_000, path=path) == []
+
+    slower = summarize([Sample(s.endpoint, s.seconds * 2, s.ok) for s in samples], elapsed=20.0)
+    failures = check_thresholds(slower, rows=1_000, path=path)
+    assert any("p95_ms" in f for f in failures)
+    assert any("req/s" in f for f in failures)
+
+    errors = summarize(samples + [Sample("POST /report/pdf", 1.0, False)], elapsed=10.0)
+    assert any("en erreur" in f for f in check_thresholds(errors, rows=1_000, path=path))
+
+    # Seuils propres à la concurrence et au nombre de workers mesurés
+    assert check_thresholds(slower, rows=1_000, path=path, concurrency=16) == []
+    assert check_thresholds(slower, rows=1_000, path=path, workers=4) == []
+
+
+def _outputs(root):
+    import os
+
+    return {os.path.join(d, f): os.path.getmtime(os.path.join(d, f))
+            for d, _, files in os.walk(root) for f in files}
+
+
+def test_load_test_end_to_end_smoke():
+    import os
+
+    from benchmarks.bench_load import ROOT, TOTAL, load_test
+
+    before = {d: _outputs(os.path.join(ROOT, d)) for d in ("reports", "logs")}
+    summary = load_test(rows=200, concurrency=2, duration=1.0, warmup=0)
+    # Rapports et logs du serveur écrits dans le dossier temporaire, pas dans le dépôt
+    assert {d: _outputs(os.path.join(ROOT, d)) for d in ("reports", "logs")} == before
+    assert summary[TOTAL]["requests"] > 0
+    assert summary[TOTAL]["errors"] == 0
+    assert summary[TOTAL]["p50_ms"] > 0
@@ -29,3 +29,29 @@ def test_setup_logger_creates_log_file(tmp_path, monkeypatch):
 
     # le fichier doit exister 
     assert os.path.exists(cfg.LOG_FILE)
+
+
+def test_async_json_logger_and_lazy_previews(tmp_path, monkeypatch):
+    import json
+    import config as cfg
+    from monitoring.logs import Lazy, detach_queue
+
+    monkeypatch.setattr(cfg, "LOG_FILE", str(tmp_path / "app.log"))
+    # pytest ajoute un handler au logger racine : sans propagation, setup_logger attache les siens
+    logging.getLogger("test_async_json").propagate = False
+    logger = setup_logger("test_async_json", async_mode=True, json_format=True)
+
+    calls = []
+    logger.setLevel(logging.INFO)
+    logger.debug("aperçu %s", Lazy(lambda: calls.append(1)))
+    assert calls == []  # DEBUG désactivé : l'aperçu n'est jamais calculé
+
+    logger.info("étape %s", "clean", extra={"rows": 42})
+    detach_queue(logger)  # vide la file
+    for h in logger.handlers:
+        h.close()
+
+    lines = (tmp_path / "app.log").read_text(encoding="utf-8").splitlines()
+    record = json.loads(lines[-1])
+    assert record["message"] == "étape clean"
+    assert record["level"] == "INFO" and record["rows"] == 42
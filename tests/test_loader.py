@@ -26,6 +26,119 @@ def test_csv_loader_missing_file_raises(tmp_path):
         CSVLoader(str(missing)).load()
 
 
+_EXPORT = (
+    "date,produit,categorie,prix,quantite,ville,source,commentaire\n"
+    "2024-01-15,Stylo,Fournitures,1.5,10,Paris,web,a\n"
+    "2024-02-03,Cahier,Fournitures,3,,Lyon,magasin,b\n"
+    "2024-03-20,Souris,Electronique,25.0,2,Paris,web,c\n"
+)
+
+
+@pytest.mark.parametrize("suffix, opener", [(".csv.gz", "gzip"), (".csv.bz2", "bz2")])
+def test_open_loader_reads_compressed_csv_with_typed_schema(tmp_path, suffix, opener):
+    from importlib import import_module
+
+    from data_loader.loaders import open_loader
+    from data_loader.schema import SALES_SCHEMA
+
+    path = tmp_path / f"export{suffix}"
+    with import_module(opener).open(path, "wt", encoding="utf-8") as f:
+        f.write(_EXPORT)
+
+    df = open_loader(str(path)).load()
+    # Seules les colonnes gardées par le nettoyage, toujours aux mêmes types
+    assert df.dtypes.astype(str).to_dict() == SALES_SCHEMA
+    assert df["quantite"].isna().sum() == 1
+
+    chunks = list(open_loader(str(path), date_range=("2024-02-01", "2024-02-29")).iter_chunks(chunksize=1))
+    assert [c["produit"].tolist() for c in chunks] == [["Cahier"]]
+
+
+def test_open_loader_date_range_and_unsupported_format(tmp_path):
+    from data_loader.loaders import open_loader
+
+    path = tmp_path / "export.csv"
+    path.write_text(_EXPORT, encoding="utf-8")
+    df = open_loader(str(path), date_range=("2024-02-01", None)).load()
+    assert df["produit"].tolist() == ["Cahier", "Souris"]
+    assert open_loader(str(path), date_range=("2030-01-01", None)).load().empty
+
+    with pytest.raises(ValueError, match="Format non supporté"):
+        open_loader(str(tmp_path / "export.txt"))
+
+
+def test_open_loader_integer_quantities_and_missing_columns(tmp_path):
+    from data_loader.loaders import open_loader
+
+    path = tmp_path / "export.csv"
+    path.write_text(_EXPORT.replace(",2,Paris", ",2.5,Paris"), encoding="utf-8")
+    df = open_loader(str(path)).load()
+    # Int64 nullable : manquante et non entière -> <NA>, les autres restent entières
+    assert str(df["quantite"].dtype) == "Int64"
+    assert df["quantite"].tolist()[0] == 10 and df["quantite"].isna().sum() == 2
+
+    with pytest.raises(ValueError, match="Colonnes manquantes dans export.csv : remise"):
+        open_loader(str(path), columns=["date", "remise"]).load()
+
+
+def test_pipeline_invalid_values_not_forward_filled(tmp_path, caplog):
+    from pipeline.stages import clean_stage, load_stage, validate_stage
+
+    path = tmp_path / "export.csv"
+    path.write_text(
+        "date,produit,categorie,prix,quantite,ville,source\n"
+        "2024-01-15,Stylo,Fournitures,1.5,10,Paris,web\n"
+        "2024-02-03,Cahier,Fournitures,3,2.5,Lyon,magasin\n"
+        "2024-02-04,Gomme,Fournitures,abc,dix,Lyon,magasin\n"
+        "pas-une-date,Souris,Electronique,25.0,2,Paris,web\n",
+        encoding="utf-8",
+    )
+    # La validation voit les valeurs brutes ; le ffill ne les remplace pas
+    valid = validate_stage(load_stage(str(path)))
+    assert valid["quantite"].tolist() == ["10", "2.5", "dix", "2"]
+
+    with caplog.at_level("WARNING", logger="data_loader.schema"):
+        df = clean_stage(valid)
+    assert df["quantite"].isna().tolist() == [False, True, True, False]
+    assert df["quantite"].tolist()[3] == 2
+    assert df["prix"].isna().tolist() == [False, False, True, False]
+    assert df["date"].isna().tolist() == [False, False, False, True]
+    assert "quantite : 2 valeur(s) invalide(s)" in caplog.text
+
+
+def test_parquet_loader_prunes_columns_and_row_groups(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from data_loader.loaders import open_loader
+
+    csv_path = tmp_path / "export.csv"
+    csv_path.write_text(_EXPORT, encoding="utf-8")
+    df = pd.read_csv(csv_path, parse_dates=["date"])
+    path = tmp_path / "export.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=1)
+
+    loader = open_loader(str(path), date_range=("2024-03-01", "2024-03-31"))
+    assert loader.row_groups() == [2]
+    out = loader.load()
+    assert "commentaire" not in out.columns
+    assert out["produit"].tolist() == ["Souris"]
+    # Même schéma typé que le CSV d'origine
+    pd.testing.assert_frame_equal(open_loader(str(path)).load(), open_loader(str(csv_path)).load())
+
+
+def test_excel_loader_same_schema_as_csv(tmp_path):
+    pytest.importorskip("openpyxl")
+    from data_loader.loaders import open_loader
+
+    csv_path = tmp_path / "export.csv"
+    csv_path.write_text(_EXPORT, encoding="utf-8")
+    xlsx_path = tmp_path / "export.xlsx"
+    pd.read_csv(csv_path).to_excel(xlsx_path, index=False)
+
+    pd.testing.assert_frame_equal(open_loader(str(xlsx_path)).load(), open_loader(str(csv_path)).load())
+
+
 def test_data_validator_drops_duplicates_and_fills_na():
     df = pd.DataFrame(
         [
@@ -38,3 +151,53 @@ def test_data_validator_drops_duplicates_and_fills_na():
     out = DataValidator(df).validate()
     assert len(out) == 2  # doublon supprimé
     assert out["quantite"].isna().sum() == 0  # NaN rempli (ffill)
+
+
+def test_shared_dataset_publish_and_map_read_only(tmp_path):
+    import numpy as np
+    from data_loader.shared_dataset import SharedDataset
+
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-01-01", "2025-01-02", None]),
+            "produit": ["Stylo", "Cahier", "Stylo"],
+            "prix": [1.5, 3.0, np.nan],
+            "quantite": pd.array([10, None, 2], dtype="Int64"),
+        }
+    )
+    store = SharedDataset(str(tmp_path), keep_versions=1)
+    assert store.current_version() is None
+
+    first = store.publish(df)
+    mapped = store.open()
+    pd.testing.assert_frame_equal(mapped.astype({"produit": object}), df)
+    # Vues en lecture seule sur les fichiers, y compris les codes du dictionnaire
+    assert not mapped["prix"].to_numpy().flags.writeable
+    assert not mapped["produit"].cat.codes.to_numpy().flags.writeable
+
+    second = store.publish(df.head(2))
+    assert store.current_version() == second != first
+    assert len(store.open()) == 2
+    # L'ancienne version, déjà projetée, reste lisible après nettoyage
+    assert mapped["prix"].sum() == 4.5
+
+
+def test_shared_dataset_cleanup_grace_and_reader_retry(tmp_path):
+    import os
+    from data_loader.shared_dataset import SharedDataset
+
+    df = pd.DataFrame({"prix": [1.0, 2.0]})
+    store = SharedDataset(str(tmp_path), keep_versions=1)
+    first = store.publish(df)
+    second = store.publish(df.head(1))
+    # Remplacée à l'instant : conservée pendant le délai de grâce
+    assert os.path.isdir(tmp_path / first)
+
+    # Un lecteur a lu l'ancien pointeur, puis la version est supprimée : il relit le pointeur
+    SharedDataset(str(tmp_path), keep_versions=1, grace_seconds=0).publish(df)
+    assert not os.path.isdir(tmp_path / first) and not os.path.isdir(tmp_path / second)
+    pointers = iter([first, store.current_version()])
+    store.current_version = lambda: next(pointers)
+    version, mapped = store.open_current()
+    assert version != first and len(mapped) == 2
+
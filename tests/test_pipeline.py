@@ -0,0 +1,342 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from pipeline.engine import Pipeline, Stage
+
+
+def _counting_pipeline(calls, cache_dir=None):
+    def record(name, func):
+        def wrapper(*args, **kwargs):
+            calls.append(name)
+            return func(*args, **kwargs)
+        return wrapper
+
+    return Pipeline(
+        [
+            Stage("double", record("double", lambda df: df * 2), inputs=["df"], outputs=["df2"]),
+            Stage("total", record("total", lambda df: float(df["x"].sum())), inputs=["df2"]),
+            Stage("maximum", record("maximum", lambda df: float(df["x"].max())), inputs=["df2"]),
+        ],
+        cache_dir=cache_dir,
+    )
+
+
+def test_pipeline_runs_stages_in_dependency_order():
+    calls = []
+    out = _counting_pipeline(calls).run(df=pd.DataFrame({"x": [1, 2, 3]}))
+
+    assert out["total"] == 12.0
+    assert out["maximum"] == 6.0
+    assert calls[0] == "double"
+    assert sorted(calls[1:]) == ["maximum", "total"]
+
+
+def test_pipeline_memoizes_by_input_fingerprint(tmp_path):
+    calls = []
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    _counting_pipeline(calls, cache_dir=str(tmp_path)).run(df=df)
+
+    # Nouveau moteur, même cache disque : reprise sans rien rejouer
+    calls.clear()
+    pipeline = _counting_pipeline(calls, cache_dir=str(tmp_path))
+    pipeline.run(df=df.copy())
+    assert calls == []
+    assert set(pipeline.last_run.values()) == {"cached"}
+
+    # Entrée modifiée : tout ce qui en dépend est rejoué
+    pipeline.run(df=pd.DataFrame({"x": [1, 2, 4]}))
+    assert sorted(calls) == ["double", "maximum", "total"]
+
+
+def test_pipeline_disk_cache_is_pruned_by_age_and_size(tmp_path):
+    import os
+    import time
+
+    pipeline = _counting_pipeline([], cache_dir=str(tmp_path))
+    pipeline.run(df=pd.DataFrame({"x": [1, 2, 3]}))
+    first = sorted(tmp_path.iterdir())
+    assert len(first) == 3
+
+    # Entrées inutilisées depuis plus longtemps que cache_max_age : supprimées
+    old = time.time() - 3600
+    for path in first:
+        os.utime(path, (old, old))
+    pipeline.cache_max_age = 60
+    pipeline.run(df=pd.DataFrame({"x": [4, 5, 6]}))
+    assert len(list(tmp_path.iterdir())) == 3
+    assert not any(p.exists() for p in first)
+
+    # Taille bornée : les moins récemment utilisées partent d'abord
+    pipeline.cache_max_bytes = sum(p.stat().st_size for p in tmp_path.iterdir())
+    pipeline.run(df=pd.DataFrame({"x": [7, 8, 9]}))
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= pipeline.cache_max_bytes
+
+
+def test_pipeline_concurrent_runs_keep_their_own_records():
+    gate = threading.Event()
+
+    def slow(df, wait):
+        if wait:
+            gate.wait(10)
+        return df
+
+    pipeline = Pipeline(
+        [
+            Stage("slow", slow, inputs=["df", "wait"], outputs=["df2"]),
+            Stage("total", lambda df: float(df["x"].sum()), inputs=["df2"]),
+        ],
+        memory_cache_size=0,
+    )
+    # Un run reste en cours pendant qu'un autre thread exécute le même Pipeline
+    first = threading.Thread(target=pipeline.run, kwargs={"df": pd.DataFrame({"x": [1]}), "wait": True})
+    first.start()
+    pipeline.run(df=pd.DataFrame({"x": [2]}), wait=False)
+    assert pipeline.last_run == {"slow": "run", "total": "run"}
+
+    gate.set()
+    first.join()
+    assert pipeline.last_run == {"slow": "run", "total": "run"}
+    assert [m.name for m in pipeline.last_metrics] == ["slow", "total"]
+
+
+def test_pipeline_without_cache_skips_fingerprints(monkeypatch):
+    import pipeline.engine as engine
+
+    hashed = []
+    monkeypatch.setattr(engine, "fingerprint", lambda value: hashed.append(value) or "x")
+    calls = []
+    pipeline = _counting_pipeline(calls)
+    pipeline.memory_cache_size = 0
+    out = pipeline.run(df=pd.DataFrame({"x": [1, 2, 3]}))
+    assert out["total"] == 12.0 and hashed == []
+
+    _counting_pipeline(calls).run(df=pd.DataFrame({"x": [1, 2, 3]}))
+    assert len(hashed) == 1
+
+
+def test_pipeline_runs_independent_branches_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(value):
+        barrier.wait()  # bloquerait si les deux branches étaient séquentielles
+        return value
+
+    pipeline = Pipeline(
+        [
+            Stage("a", branch, inputs=["v"]),
+            Stage("b", branch, inputs=["v"]),
+        ]
+    )
+    out = pipeline.run(v=1)
+    assert out["a"] == out["b"] == 1
+
+
+def test_pipeline_targets_only_run_needed_stages():
+    calls = []
+    out = _counting_pipeline(calls).run(targets=["df2"], df=pd.DataFrame({"x": [1]}))
+    assert calls == ["double"]
+    assert "total" not in out
+
+    with pytest.raises(KeyError):
+        _counting_pipeline(calls).run(targets=["inconnu"], df=pd.DataFrame({"x": [1]}))
+
+
+def test_pipeline_records_stage_metrics(tmp_path):
+    import json
+
+    from monitoring.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    calls = []
+    pipeline = _counting_pipeline(calls)
+    pipeline.metrics = registry
+    pipeline.run(df=pd.DataFrame({"x": [1, 2, 3]}))
+
+    by_name = {m.name: m for m in pipeline.last_metrics}
+    assert by_name["double"].rows_in == 3
+    assert by_name["double"].rows_out == 3
+    assert by_name["double"].wall_s >= 0.0
+
+    path = registry.write_summary(str(tmp_path / "run_summary.json"), pipeline.last_metrics)
+    summary = json.loads(open(path, encoding="utf-8").read())
+    assert {m["name"] for m in summary["measurements"]} == {"double", "total", "maximum"}
+    assert 'pmn_calls_total{kind="stage",name="double"} 1' in registry.to_prometheus()
+
+
+@pytest.mark.parametrize("tracing", [True, False])
+def test_stage_peak_memory_is_per_stage(tracing):
+    import os
+    import tracemalloc
+
+    import numpy as np
+    from monitoring.metrics import MetricsRegistry
+
+    if not tracing and not os.path.exists("/proc/self/clear_refs"):
+        pytest.skip("pic RSS réinitialisable uniquement sous Linux")
+    if tracing:
+        tracemalloc.start()
+    try:
+        registry = MetricsRegistry()
+        with registry.measure("run"):
+            with registry.measure("grosse"):
+                big = np.ones(40_000_000 // 8)  # 40 Mo, pages écrites
+                del big
+            with registry.measure("petite"):
+                small = np.ones(1_000_000 // 8)  # 1 Mo
+                del small
+    finally:
+        if tracing:
+            tracemalloc.stop()
+
+    peaks = {m.name: m.peak_memory_bytes for m in registry.measurements()}
+    assert peaks["grosse"] >= 30_000_000
+    # Étape suivante, plus petite : son propre pic, pas le maximum du processus
+    assert peaks["petite"] < 10_000_000
+    assert peaks["run"] >= peaks["grosse"]
+
+
+HEADER = "date,produit,categorie,prix,quantite,ville,source\n"
+
+
+def _watcher(directory, **kwargs):
+    from pipeline.watcher import FolderWatcher
+
+    return FolderWatcher(str(directory), poll_interval=0.01, debounce=0.0, **kwargs)
+
+
+def test_watcher_reads_only_appended_complete_lines(tmp_path):
+    csv_path = tmp_path / "ventes.csv"
+    csv_path.write_text(HEADER + "2025-01-01,Stylo,Fournitures,1.5,10,Paris,web\n", encoding="utf-8")
+    updates = []
+    watcher = _watcher(tmp_path, on_update=lambda w: updates.append(w.aggregates.rows))
+
+    assert watcher.poll() == 1
+    watcher.process_pending()
+    assert updates == [1]
+
+    # Ajout d'une ligne complète + une ligne en cours d'écriture
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("2025-01-02,Cahier,Fournitures,3.0,5,Lyon,magasin\n2025-01-03,Sty")
+    assert watcher.poll() == 1
+    watcher.process_pending()
+    assert len(watcher.dataset()) == 2
+
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("lo,Fournitures,1.5,4,Paris,web\n")
+    watcher.poll()
+    watcher.process_pending()
+
+    assert watcher.poll() == 0
+    assert updates == [1, 2, 3]
+    ca = watcher.aggregates.chiffre_affaires_par_ville().set_index("ville")["revenu"]
+    assert ca.to_dict() == {"Lyon": 15.0, "Paris": 21.0}
+    assert watcher.stats["bytes"] == csv_path.stat().st_size
+
+
+def test_watcher_replaced_file_resets_its_contribution(tmp_path):
+    csv_path = tmp_path / "ventes.csv"
+    csv_path.write_text(HEADER + "2025-01-01,Stylo,Fournitures,1.5,10,Paris,web\n", encoding="utf-8")
+    watcher = _watcher(tmp_path)
+    watcher.poll()
+    watcher.process_pending()
+
+    csv_path.write_text(HEADER + "2025-01-01,Cahier,Fournitures,3.0,1,Lyon,magasin\n", encoding="utf-8")
+    watcher.poll()
+    watcher.process_pending()
+
+    assert watcher.aggregates.rows == 1
+    assert watcher.aggregates.chiffre_affaires_par_ville()["ville"].tolist() == ["Lyon"]
+    assert watcher.dataset()["produit"].tolist() == ["Cahier"]
+
+
+def test_watcher_validation_spans_batches_of_a_file(tmp_path):
+    from pipeline.stages import clean_stage, load_stage, validate_stage
+
+    csv_path = tmp_path / "ventes.csv"
+    csv_path.write_text(HEADER.replace("\n", ",id\n") + "2025-01-01,Stylo,Fournitures,1.5,10,Paris,web,1\n",
+                        encoding="utf-8")
+    watcher = _watcher(tmp_path)
+    watcher.poll()
+    watcher.process_pending()
+
+    # Doublon d'une ligne du lot précédent (seul l'id diffère, colonne hors schéma)
+    # + quantité manquante (ffill depuis ce lot)
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("2025-01-01,Stylo,Fournitures,1.5,10,Paris,web,2\n2025-01-02,Cahier,Fournitures,3.0,,Lyon,magasin,3\n")
+    watcher.poll()
+    watcher.process_pending()
+
+    # Même résultat, aux mêmes types, que main.py --csv
+    expected = clean_stage(validate_stage(load_stage(str(csv_path)))).reset_index(drop=True)
+    pd.testing.assert_frame_equal(watcher.dataset(), expected)
+    assert watcher.aggregates.rows == 2
+
+
+def test_watcher_retracted_groups_leave_no_float_residue(tmp_path):
+    a, b = tmp_path / "ventes_a.csv", tmp_path / "ventes_b.csv"
+    a.write_text(HEADER + "2025-01-01,Stylo,Fournitures,0.1,1,Paris,web\n", encoding="utf-8")
+    b.write_text(HEADER + "2025-01-01,Cahier,Fournitures,0.2,1,Paris,web\n", encoding="utf-8")
+    watcher = _watcher(tmp_path)
+    watcher.poll()
+    watcher.process_pending()
+
+    # 0.1 + 0.2 - 0.1 - 0.2 != 0 en flottants : Paris ne doit pas rester
+    for path in (a, b):
+        path.write_text(HEADER + "2025-01-02,Souris,Electronique,2.0,1,Lyon,magasin\n", encoding="utf-8")
+        watcher.poll()
+        watcher.process_pending()
+
+    assert watcher.aggregates.chiffre_affaires_par_ville().to_dict("records") == [{"ville": "Lyon", "revenu": 4.0}]
+    assert watcher.aggregates.top_produits_par_revenu()["produit"].tolist() == ["Souris"]
+
+
+def test_watcher_deleted_file_is_withdrawn(tmp_path):
+    kept, deleted = tmp_path / "ventes_a.csv", tmp_path / "ventes_b.csv"
+    kept.write_text(HEADER + "2025-01-01,Stylo,Fournitures,1.5,10,Paris,web\n", encoding="utf-8")
+    deleted.write_text(HEADER + "2025-01-01,Cahier,Fournitures,3.0,1,Lyon,magasin\n", encoding="utf-8")
+    watcher = _watcher(tmp_path)
+    watcher.poll()
+    watcher.process_pending()
+    assert watcher.aggregates.rows == 2
+
+    deleted.unlink()
+    assert watcher.poll() == 1
+    watcher.process_pending()
+    assert watcher.aggregates.rows == 1
+    assert watcher.dataset()["produit"].tolist() == ["Stylo"]
+    assert watcher.aggregates.chiffre_affaires_par_ville()["ville"].tolist() == ["Paris"]
+    assert watcher.poll() == 0
+
+
+def test_watcher_debounce_and_backpressure(tmp_path):
+    for i in range(3):
+        (tmp_path / f"ventes_{i}.csv").write_text(HEADER + f"2025-01-0{i + 1},P{i},C,1.0,1,Paris,web\n",
+                                                   encoding="utf-8")
+    watcher = _watcher(tmp_path, max_pending=2)
+    watcher.debounce = 60.0
+    assert watcher.poll() == 0  # fichiers trop récents
+
+    watcher.debounce = 0.0
+    assert watcher.poll() == 2
+    assert watcher.stats["backpressure"] == 1
+    watcher.process_pending()
+    assert watcher.poll() == 1  # le fichier refusé est repris au tour suivant
+    watcher.process_pending()
+    assert watcher.aggregates.rows == 3
+
+
+def test_watcher_daemon_threads(tmp_path):
+    import time
+
+    watcher = _watcher(tmp_path).start()
+    try:
+        (tmp_path / "ventes.csv").write_text(HEADER + "2025-01-01,Stylo,Fournitures,1.5,10,Paris,web\n",
+                                             encoding="utf-8")
+        deadline = time.monotonic() + 5
+        while watcher.aggregates.rows == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert watcher.aggregates.rows == 1
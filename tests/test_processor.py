@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 from data_processor.aggregator import DataAggregator
 from data_processor.statistics import StatisticsCalculator
@@ -85,3 +86,393 @@ def test_statistics_basic_stats_returns_expected_columns():
     # Doit inclure au moins prix et quantite
     assert "prix" in stats.index
     assert "quantite" in stats.index
+
+
+def test_cleaner_vectorized_transforms():
+    import numpy as np
+    from data_processor.cleaner import DataCleaner
+
+    df = pd.DataFrame(
+        {
+            "ville": [" paris", "Paris ", "lyon", None],
+            "prix": ["1,5", "3", "abc", "2,0"],
+            "date": ["2025-01-01", "2025-01-02", "bad", "2025-01-04"],
+        }
+    )
+    cleaner = (
+        DataCleaner(df)
+        .transform("ville", "normalize")
+        .transform("prix", "to_numeric", decimal=",")
+        .transform("date", "to_datetime")
+        .apply_transform("prix", np.sqrt)
+    )
+    out = cleaner.get()
+
+    assert out["ville"].tolist()[:3] == ["Paris", "Paris", "Lyon"]
+    assert pd.isna(out["ville"].iloc[3])
+    assert out["prix"].iloc[1] == pytest.approx(np.sqrt(3.0))
+    assert np.isnan(out["prix"].iloc[2])
+    assert out["date"].isna().sum() == 1
+
+
+@pytest.fixture
+def transforms_registry():
+    """Registre global des transformations, restauré après le test."""
+    from data_processor.transforms import TRANSFORMS
+
+    saved = dict(TRANSFORMS)
+    yield TRANSFORMS
+    TRANSFORMS.clear()
+    TRANSFORMS.update(saved)
+
+
+def test_cleaner_register_custom_ufunc(transforms_registry):
+    import numpy as np
+    from data_processor.cleaner import DataCleaner
+    from data_processor.transforms import register_ufunc
+
+    register_ufunc("log1p", np.log1p)
+    assert "log1p" in transforms_registry
+    out = DataCleaner(pd.DataFrame({"quantite": [0, 1, None]})).transform("quantite", "log1p").get()
+    assert out["quantite"].iloc[0] == 0.0
+    assert np.isnan(out["quantite"].iloc[2])
+
+
+def _make_outlier_df():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    prix = np.concatenate([rng.normal(10, 1, 200), rng.normal(500, 20, 200)])
+    df = pd.DataFrame({"categorie": ["A"] * 200 + ["B"] * 200, "prix": prix})
+    df.loc[5, "prix"] = 100.0   # extrême pour A, normal globalement
+    df.loc[7, "prix"] = None
+    return df
+
+
+@pytest.mark.parametrize("method", ["zscore", "mad", "iqr"])
+def test_outliers_per_group_flags_rows(method):
+    from data_processor.cleaner import DataCleaner
+
+    df = _make_outlier_df()
+    flagged = DataCleaner(df).flag_outliers("prix", method=method, by="categorie")
+    assert 5 in flagged.index
+    assert 7 not in flagged.index  # NaN jamais signalé
+
+    cleaner = DataCleaner(df)
+    kept = cleaner.remove_outliers("prix", method=method, by="categorie")
+    assert 5 not in kept.index
+    assert len(kept) == len(df) - len(flagged)
+
+
+@pytest.mark.parametrize("method", ["zscore", "mad", "iqr"])
+def test_outliers_streaming_matches_in_memory(method):
+    from data_processor.outliers import OutlierDetector
+
+    df = _make_outlier_df()
+    exact = OutlierDetector("prix", method=method, by="categorie").fit(df)
+
+    streaming = OutlierDetector("prix", method=method, by="categorie")
+    for start in range(0, len(df), 64):
+        streaming.partial_fit(df.iloc[start:start + 64])
+    pd.testing.assert_frame_equal(exact.bounds(), streaming.bounds())
+    pd.testing.assert_series_equal(exact.flag(df), streaming.flag(df))
+
+    flagged = pd.concat([f for _, f in streaming.filter_chunks([df.iloc[:100], df.iloc[100:]])])
+    assert flagged.index.tolist() == exact.split(df)[1].index.tolist()
+
+
+@pytest.mark.parametrize("method", ["zscore", "mad", "iqr"])
+def test_outliers_streaming_memory_is_linear(method):
+    import tracemalloc
+
+    import numpy as np
+    from data_processor.outliers import OutlierDetector
+
+    rng = np.random.default_rng(1)
+    n = 100_000
+    df = pd.DataFrame({"categorie": rng.choice(["A", "B", "C"], n).astype(object), "prix": rng.normal(10, 1, n)})
+
+    streaming = OutlierDetector("prix", method=method, by="categorie")
+    tracemalloc.start()
+    try:
+        for start in range(0, n, 1_000):
+            streaming.partial_fit(df.iloc[start:start + 1_000])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Mode exact : au plus ~une copie (clé + valeur, 16 octets par ligne), jamais
+    # l'accumulé recopié à chaque morceau
+    assert peak < 1.5 * 16 * n
+    exact = OutlierDetector("prix", method=method, by="categorie").fit(df)
+    pd.testing.assert_frame_equal(streaming.bounds(), exact.bounds())
+
+
+def test_out_of_core_aggregator_matches_in_memory(tmp_path):
+    from benchmarks.data_generator import SalesDataGenerator
+    from data_processor.out_of_core import OutOfCoreAggregator
+
+    df = SalesDataGenerator(n_products=40, n_cities=6, n_categories=5, duplicate_rate=0.02, seed=1).generate(3_000)
+    csv_path = str(tmp_path / "ventes.csv")
+    df.to_csv(csv_path, index=False)
+    df = pd.read_csv(csv_path)
+
+    ooc = OutOfCoreAggregator(csv_path, n_partitions=4, chunksize=700, spill_dir=str(tmp_path))
+    mem = DataAggregator(df)
+
+    def same(a, b, sort_by):
+        a = a.sort_values(sort_by).reset_index(drop=True)
+        b = b.sort_values(sort_by).reset_index(drop=True)
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
+
+    same(ooc.chiffre_affaires_par_ville(), mem.chiffre_affaires_par_ville(), ["ville"])
+    same(ooc.ventes_par_categorie_et_source(), mem.ventes_par_categorie_et_source(), ["categorie", "source"])
+    same(ooc.total_quantite_par_produit(), mem.total_quantite_par_produit(), ["produit"])
+    same(ooc.top_produits_par_revenu(5), mem.top_produits_par_revenu(5), ["produit"])
+
+    agg_dict = {"prix": ["mean", "median"], "quantite": ["sum"]}
+    same(ooc.groupby_multiple(["ville", "categorie"], agg_dict),
+         mem.groupby_multiple(["ville", "categorie"], agg_dict), [("ville", ""), ("categorie", "")])
+
+    pd.testing.assert_frame_equal(ooc.pivot_quantite("ville", "categorie"), mem.pivot_quantite("ville", "categorie"),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(ooc.pivot_chiffre_affaires("ville", "categorie"),
+                                  mem.pivot_chiffre_affaires("ville", "categorie"), check_dtype=False)
+    pd.testing.assert_frame_equal(ooc.detecter_doublons(), mem.detecter_doublons(), check_dtype=False)
+    pd.testing.assert_frame_equal(ooc.taux_valeurs_manquantes(), mem.taux_valeurs_manquantes())
+    assert ooc.quantity_distribution() == mem.quantity_distribution()
+    assert list(tmp_path.glob("ooc_*")) == []  # fichiers de débordement supprimés
+
+
+def test_parallel_aggregator_and_statistics_match_single_core():
+    import numpy as np
+    from benchmarks.data_generator import SalesDataGenerator
+    from data_processor.parallel import ParallelAggregator, ParallelStatistics
+
+    df = SalesDataGenerator(n_products=30, n_cities=5, n_categories=4, seed=3).generate(4_000)
+    df.loc[10, "ville"] = None
+    mem = DataAggregator(df)
+
+    with ParallelAggregator(df, n_workers=2, min_rows_per_partition=500) as agg:
+        pd.testing.assert_frame_equal(agg.chiffre_affaires_par_ville(), mem.chiffre_affaires_par_ville())
+        pd.testing.assert_frame_equal(agg.ventes_par_categorie_et_source(), mem.ventes_par_categorie_et_source(),
+                                      check_dtype=False)
+        top = agg.top_produits_par_revenu(5)
+        expected = mem.top_produits_par_revenu(5).reset_index(drop=True)
+        assert top["produit"].tolist() == expected["produit"].tolist()
+        assert np.allclose(top["revenu"], expected["revenu"])
+
+    with ParallelStatistics(df, n_workers=2, min_rows_per_partition=500) as stats:
+        parallel = stats.basic_stats()
+    expected = StatisticsCalculator(df).basic_stats()
+    pd.testing.assert_frame_equal(parallel[expected.columns], expected, check_names=False)
+
+
+def test_shared_columns_unlinked_without_close():
+    import gc
+    from multiprocessing import shared_memory
+
+    import numpy as np
+    from data_processor.parallel import SharedColumns
+
+    def attach(name):
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    shared = SharedColumns({"prix": np.arange(10.0)})
+    names = [shm_name for shm_name, _, _ in shared.spec.values()]
+    del shared  # close() oublié (chemin d'exception) : le finaliseur libère les segments
+    gc.collect()
+    for name in names:
+        attach(name)
+
+    with SharedColumns({"prix": np.arange(10.0)}) as shared:
+        assert shared.arrays["prix"].sum() == 45.0
+        name = shared.spec["prix"][0]
+    attach(name)
+    shared.close()  # idempotent
+
+
+def test_approximate_top_products_and_distinct_counts():
+    import numpy as np
+    from benchmarks.data_generator import SalesDataGenerator
+    from data_processor.sketches import HyperLogLog, SpaceSaving
+
+    df = SalesDataGenerator(n_products=3_000, n_cities=4, seed=5).generate(30_000)
+    agg = DataAggregator(df)
+
+    exact = agg.top_produits_par_revenu(n=5)
+    approx = agg.top_produits_par_revenu(n=5, approx=True, capacity=500)
+    assert approx["produit"].tolist() == exact["produit"].tolist()
+    true = exact.set_index("produit")["revenu"]
+    est = approx.set_index("produit")
+    assert (est["revenu"] >= true - 1e-6).all()
+    assert (est["revenu"] - est["erreur_max"] <= true + 1e-6).all()
+
+    # Sketches fusionnables : deux moitiés == tout le fichier
+    half = len(df) // 2
+    revenu = df["prix"] * df["quantite"]
+    merged = SpaceSaving(500).update(df["produit"][:half], revenu[:half])
+    merged.merge(SpaceSaving(500).update(df["produit"][half:], revenu[half:]))
+    assert merged.top(5)["cle"].tolist() == exact["produit"].tolist()
+
+    distinct = agg.produits_distincts_par("ville", approx=True)
+    truth = agg.produits_distincts_par("ville").set_index("ville")["produits_distincts"]
+    rel = (distinct.set_index("ville")["produits_distincts"] - truth).abs() / truth
+    assert (rel < 4 * distinct["erreur_relative"].iloc[0]).all()
+
+    hll = HyperLogLog(p=12).update(df["produit"][:half]).merge(HyperLogLog(p=12).update(df["produit"][half:]))
+    assert abs(hll.estimate().iloc[0] - df["produit"].nunique()) / df["produit"].nunique() < 0.1
+    assert np.isclose(hll.relative_error, 1.04 / 64)
+
+
+def test_correlation_pairwise_nan_incremental_and_grouped():
+    import numpy as np
+    from data_processor.correlation import CorrelationAccumulator
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "ville": rng.choice(["Paris", "Lyon", "Nice"], 600),
+            "prix": rng.normal(1e6, 5, 600),  # grand décalage : test de stabilité
+            "quantite": rng.poisson(5, 600).astype(float),
+        }
+    )
+    df["remise"] = df["prix"] * 0.1 + rng.normal(0, 1, 600)
+    df.loc[rng.choice(600, 60, replace=False), "prix"] = np.nan
+    df.loc[rng.choice(600, 40, replace=False), "quantite"] = np.nan
+    cols = ["prix", "quantite", "remise"]
+    stats = StatisticsCalculator(df)
+
+    pd.testing.assert_frame_equal(stats.correlation_matrix(), df[cols].corr())
+    pd.testing.assert_frame_equal(stats.covariance_matrix(), df[cols].cov())
+    pd.testing.assert_frame_equal(stats.correlation_matrix("spearman"), df[cols].corr("spearman"))
+
+    # Par morceaux (avec fusion) == en une fois
+    acc = CorrelationAccumulator(cols).partial_fit(df[:250])
+    acc.merge(CorrelationAccumulator(cols).partial_fit(df[250:400]).partial_fit(df[400:]))
+    pd.testing.assert_frame_equal(acc.correlation(), df[cols].corr())
+
+    grouped = stats.correlation_by_group("ville", cols)
+    for ville, part in df.groupby("ville"):
+        pd.testing.assert_frame_equal(grouped.loc[ville], part[cols].corr(), check_names=False)
+
+
+def test_revenue_quantity_correlation_uses_price_times_quantity():
+    df = _make_df()
+    expected = (df["prix"] * df["quantite"]).corr(df["quantite"])
+    assert StatisticsCalculator(df).revenue_quantity_correlation() == pytest.approx(expected)
+
+
+def test_grouped_stats_matches_pandas_groupby():
+    import numpy as np
+
+    df = _make_df()
+    df.loc[0, "prix"] = np.nan
+    out = StatisticsCalculator(df).grouped_stats("ville").set_index(["ville", "colonne"])
+    for ville, part in df.groupby("ville"):
+        for col in ["prix", "quantite"]:
+            row = out.loc[(ville, col)]
+            values = part[col].dropna()
+            assert row["count"] == len(values)
+            assert row["mean"] == pytest.approx(values.mean())
+            assert row["std"] == pytest.approx(values.std(ddof=0))
+            assert row["median"] == pytest.approx(values.median())
+            assert row["q25"] == pytest.approx(values.quantile(0.25))
+            assert (row["min"], row["max"]) == (values.min(), values.max())
+
+
+def test_sales_table_is_compact_and_supported_by_aggregator_and_stats():
+    import numpy as np
+    from benchmarks.data_generator import SalesDataGenerator
+    from data_processor.sales_table import SalesTable
+
+    df = SalesDataGenerator(n_products=200, seed=9).generate(20_000)
+    table = SalesTable.from_chunks([df[:7_000], df[7_000:]])
+
+    assert len(table) == len(df)
+    assert table.codes["source"].dtype == np.int8
+    assert table.days["date"].dtype == np.int32
+    assert table.nbytes * 5 < df.memory_usage(deep=True).sum()
+    # Encodage par morceaux == encodage en une fois
+    whole = SalesTable.from_dataframe(df)
+    for name, codes in whole.codes.items():
+        np.testing.assert_array_equal(table.codes[name], codes)
+
+    frame = table.to_frame()
+    assert frame["date"].dt.strftime("%Y-%m-%d").tolist() == df["date"].tolist()
+
+    for name in ["chiffre_affaires_par_ville", "ventes_par_categorie_et_source", "top_produits_par_revenu"]:
+        compact = getattr(DataAggregator(table), name)().reset_index(drop=True)
+        expected = getattr(DataAggregator(df), name)().reset_index(drop=True)
+        compact = compact.astype({c: object for c in compact.columns if c in table.codes})
+        pd.testing.assert_frame_equal(compact, expected)
+
+    pd.testing.assert_frame_equal(StatisticsCalculator(table).basic_stats(), StatisticsCalculator(df).basic_stats())
+
+
+def test_sql_backend_matches_pandas(tmp_path):
+    from benchmarks.data_generator import SalesDataGenerator
+    from data_loader.sql_store import SQLStore
+    from data_processor.sql_backend import SQLAggregator, SQLStatistics
+
+    df = SalesDataGenerator(n_products=30, n_cities=5, n_categories=4, seed=7).generate(3_000)
+    df.loc[::50, "prix"] = float("nan")
+    store = SQLStore(str(tmp_path / "ventes.sqlite"))
+    store.load(df)
+    assert len(store) == 3_000
+
+    pandas_agg, sql_agg = DataAggregator(df), SQLAggregator(store)
+    for name in ("chiffre_affaires_par_ville", "ventes_par_categorie_et_source", "taux_valeurs_manquantes"):
+        pd.testing.assert_frame_equal(getattr(pandas_agg, name)().reset_index(drop=True), getattr(sql_agg, name)(),
+                                      check_dtype=False)
+    pd.testing.assert_frame_equal(pandas_agg.top_produits_par_revenu(5).reset_index(drop=True),
+                                  sql_agg.top_produits_par_revenu(5), check_dtype=False)
+    pd.testing.assert_frame_equal(pandas_agg.pivot_chiffre_affaires("ville", "categorie"),
+                                  sql_agg.pivot_chiffre_affaires("ville", "categorie"), check_dtype=False)
+    spec = (["ville", "source"], {"prix": ["mean", "std"], "quantite": ["sum"]})
+    pd.testing.assert_frame_equal(pandas_agg.groupby_multiple(*spec), sql_agg.groupby_multiple(*spec),
+                                  check_dtype=False)
+
+    pandas_stats, sql_stats = StatisticsCalculator(df), SQLStatistics(store)
+    pd.testing.assert_frame_equal(pandas_stats.basic_stats(), sql_stats.basic_stats(), check_dtype=False)
+    pd.testing.assert_frame_equal(pandas_stats.grouped_stats(["categorie", "ville"]),
+                                  sql_stats.grouped_stats(["categorie", "ville"]), check_dtype=False)
+
+    with pytest.raises(ValueError):
+        sql_agg.produits_distincts_par("ville; DROP TABLE ventes")
+
+
+def test_sql_std_large_mean_small_spread(tmp_path):
+    from data_loader.sql_store import SQLStore
+    from data_processor.sql_backend import SQLAggregator
+
+    df = pd.DataFrame({
+        "ville": ["Paris"] * 3 + ["Lyon"],
+        "categorie": ["A", "A", "B", "A"],
+        "prix": [1e8 + 0.1, 1e8 + 0.2, 1e8 + 0.3, 5.0],
+        "quantite": [1.0, 2.0, 3.0, 4.0],
+    })
+    store = SQLStore(str(tmp_path / "ventes.sqlite"))
+    store.load(df)
+    spec = (["ville"], {"prix": ["std", "mean"]})
+    out = SQLAggregator(store).groupby_multiple(*spec)
+    pd.testing.assert_frame_equal(DataAggregator(df).groupby_multiple(*spec), out, check_dtype=False)
+    assert out[("prix", "std")].iloc[1] == pytest.approx(0.1, rel=1e-6)
+
+
+def test_sql_store_concurrent_loads_use_separate_temp_files(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from data_loader.sql_store import SQLStore
+
+    store = SQLStore(str(tmp_path / "ventes.sqlite"))
+    frames = [pd.DataFrame({"ville": ["Paris"] * n, "prix": [1.0] * n}) for n in range(1, 9)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(store.load, frames)) == [store.path] * len(frames)
+    # Une base complète (celle d'un des appels), aucun fichier temporaire restant
+    assert store.scalar("SELECT COUNT(*) FROM ventes") in range(1, 9)
+    assert [p.name for p in tmp_path.iterdir()] == ["ventes.sqlite"]
+
+    with pytest.raises(Exception):
+        store.load(pd.DataFrame({"a": [object()]}))
+    assert [p.name for p in tmp_path.iterdir()] == ["ventes.sqlite"]
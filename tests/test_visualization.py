@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+import pytest
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
@@ -58,6 +59,19 @@ def test_chart_builder_saves_pie(tmp_path, monkeypatch):
     assert out.exists()    
     
 
+
+def test_chart_builder_accepts_sales_table(tmp_path, monkeypatch):
+    from data_processor.sales_table import SalesTable
+
+    monkeypatch.setattr(plt, "show", lambda: None)
+
+    cb = ChartBuilder(SalesTable.from_dataframe(_make_df()))
+
+    out = tmp_path / "villes.png"
+    cb.plot_sales_by_city(save_path=str(out))
+    assert out.exists()
+    assert set(cb.df["ville"]) == {"Paris", "Lyon"}
+
 def test_report_generator_creates_pdf(tmp_path):
     df = _make_df()
 
@@ -75,3 +89,136 @@ def test_report_generator_creates_pdf(tmp_path):
     pdf = tmp_path / "rapport_test.pdf"
     assert pdf.exists()
     assert pdf.stat().st_size > 0
+
+
+def test_html_report_is_self_contained_and_bounded(tmp_path):
+    from benchmarks.data_generator import SalesDataGenerator
+
+    sizes = []
+    for n_rows in (1_000, 50_000):
+        df = SalesDataGenerator(seed=4).generate(n_rows)
+        report = ReportGenerator(df, output_dir=str(tmp_path))
+        before = report.chart_builder.df.copy()
+
+        path = report.generate_html_report(f"rapport_{n_rows}.html", max_points=100)
+        content = open(path, encoding="utf-8").read()
+        sizes.append(len(content))
+
+        assert str(tmp_path) not in content  # aucun chemin absolu
+        assert "Histogramme Quantité" in content and "Chiffre d&#x27;affaires par jour" in content
+        pd.testing.assert_frame_equal(report.chart_builder.df, before)  # pas d'effet de bord
+
+    assert sizes[1] < 1.5 * sizes[0]
+
+    static = ReportGenerator(_make_df(), output_dir=str(tmp_path)).generate_html_report("statique.html", interactive=False)
+    assert 'src="data:image/png;base64,' in open(static, encoding="utf-8").read()
+
+
+@pytest.mark.parametrize("interactive", [False, True])
+def test_html_report_column_without_finite_values(tmp_path, interactive):
+    import numpy as np
+
+    df = _make_df().assign(prix=np.nan)
+    path = ReportGenerator(df, output_dir=str(tmp_path)).generate_html_report(
+        f"vide_{interactive}.html", interactive=interactive)
+    content = open(path, encoding="utf-8").read()
+    assert "Distribution des prix" in content
+    assert "3 valeurs non représentées" in content
+    if interactive:
+        assert content.count("cdn.plot.ly") == 1  # plotly.js chargé une seule fois
+
+
+def test_data_reduction_histogram_and_point_cap():
+    import numpy as np
+    from visualization.data_reduction import binned_histogram, cap_points
+
+    counts, edges, excluded = binned_histogram([0, -1, 1, 10, 100, np.nan], bins=2, log=True)
+    assert counts.sum() == 3 and excluded == 3
+    assert np.allclose(edges, [1, 10, 100])
+
+    x, y = cap_points(np.arange(10_000), np.ones(10_000), max_points=100)
+    assert len(x) == 100 and np.allclose(y, 1)
+
+
+def test_chart_builder_reduces_large_inputs(tmp_path, monkeypatch):
+    import numpy as np
+    import plotly.graph_objects as go
+    from benchmarks.data_generator import SalesDataGenerator
+
+    monkeypatch.setattr(plt, "show", lambda: None)
+    monkeypatch.setattr(go.Figure, "show", lambda self, *a, **k: None)
+
+    df = SalesDataGenerator(n_products=300, seed=2).generate(50_000)
+    cb = ChartBuilder(df, max_points=500, max_categories=10)
+
+    bars = cb._bars("produit", "prix")
+    assert len(bars) == 11 and bars.index[-1] == "Autres"
+    assert bars.sum() == pytest.approx(df["prix"].sum())
+
+    series = pd.DataFrame({"t": np.arange(100_000), "y": np.sin(np.arange(100_000) / 500)})
+    series.loc[70_000, "y"] = 50.0
+    fig = ChartBuilder(series, max_points=500).interactive_line("t", "y")
+    assert len(fig.data[0].x) == 500
+    assert max(fig.data[0].y) == 50.0  # LTTB conserve les pics
+
+    fig = cb.interactive_bar("ville", "prix")
+    assert len(fig.data[0].x) <= 11
+
+    out = tmp_path / "bar.png"
+    cb.plot_bar("produit", "quantite", save_path=str(out))
+    assert out.exists()
+
+
+def test_plot_bar_numeric_x_with_many_values(tmp_path, monkeypatch):
+    import numpy as np
+
+    monkeypatch.setattr(plt, "show", lambda: None)
+    df = pd.DataFrame({"quantite": np.arange(60) % 30, "prix": np.ones(60)})
+    cb = ChartBuilder(df, max_categories=20)
+
+    bars = cb._bars("quantite", "prix")
+    assert len(bars) == 21 and bars.index[-1] == "Autres"
+    assert all(isinstance(label, str) for label in bars.index)
+
+    out = tmp_path / "bar_num.png"
+    cb.plot_bar("quantite", "prix", save_path=str(out))
+    assert out.exists()
+
+
+def test_batch_reports_one_pdf_per_slice(tmp_path):
+    from visualization.batch_reports import BatchReportGenerator, compute_slice_aggregates, expand_slices
+
+    df = _make_df()
+    slices = expand_slices(df, ["ville=*", "mois=*", "ville=Paris,categorie=Electronique"])
+    assert [s.name for s in slices] == [
+        "ville-Lyon", "ville-Paris", "mois-2025-01", "ville-Paris_categorie-Electronique",
+    ]
+
+    paris = compute_slice_aggregates(df, slices)[1]
+    assert paris.rows == 2
+    assert paris.revenue == pytest.approx(1.5 * 10 + 25.0 * 2)
+    assert paris.by_dimension["produit"].index[0] == "Souris"
+
+    result = BatchReportGenerator(df, output_dir=str(tmp_path), max_workers=1).generate(slices + ["ville=Nice"])
+    assert len(result.paths) == 4
+    assert result.empty == ["ville-Nice"]
+    assert all(os.path.getsize(path) > 0 for path in result.paths.values())
+    assert result.reports_per_minute > 0
+
+    with pytest.raises(ValueError):
+        expand_slices(df, ["inconnue=*"])
+
+
+def test_slice_aggregates_keep_rows_with_missing_dimensions():
+    from visualization.batch_reports import ReportSlice, compute_slice_aggregates
+
+    df = _make_df()
+    df.loc[0, "categorie"] = None
+    df.loc[2, "produit"] = None
+    paris = compute_slice_aggregates(df, [ReportSlice((("ville", "Paris"),))])[0]
+    # Totaux complets ; seule la répartition par dimension ignore les manquants
+    assert paris.rows == 2
+    assert paris.revenue == pytest.approx(1.5 * 10 + 25.0 * 2)
+    assert paris.quantity == 12
+    assert paris.by_dimension["categorie"].to_dict() == {"Electronique": 50.0}
+    assert paris.by_dimension["produit"].to_dict() == {"Stylo": 15.0}
@@ -0,0 +1,291 @@
+"""
+Rapports PDF en lot : un rapport par tranche (ville, catégorie, mois...).
+
+Au lieu d'un ReportGenerator + ChartBuilder par tranche (chacun copie et
+reparcourt tout le jeu de données), les agrégats de toutes les tranches
+sont calculés en un seul groupby par combinaison de colonnes de découpage,
+puis chaque rapport (graphiques + PDF) est produit à partir de ses seuls
+agrégats, en parallèle dans un pool de processus.
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processor.sales_table import SalesTable
+
+from .data_reduction import top_n_with_other
+
+
+logger = logging.getLogger("visualization.batch_reports")
+
+# Dimensions des graphiques d'un rapport (mêmes que le rapport complet)
+_DIMENSIONS = ("categorie", "ville", "produit")
+
+
+def _month_column(df: pd.DataFrame) -> pd.Series:
+    """AAAA-MM de la colonne date ; conversion faite une fois par date distincte."""
+    codes, uniques = pd.factorize(df["date"])
+    months = pd.to_datetime(pd.Series(uniques), errors="coerce").dt.strftime("%Y-%m")
+    return pd.Series(_recode(codes, months), index=df.index, name="mois")
+
+
+def _recode(codes: np.ndarray, labels: pd.Series) -> pd.Categorical:
+    """Categorical des `labels[codes]` (code -1 / label manquant -> NaN), sans passer par des objets ligne à ligne."""
+    label_codes, categories = pd.factorize(labels)
+    label_codes = np.append(label_codes, -1)  # position -1 : valeur manquante
+    return pd.Categorical.from_codes(label_codes[codes], categories=categories)
+
+
+# Colonnes de découpage calculées à partir des données
+DERIVED_COLUMNS = {"mois": _month_column}
+
+
+@dataclass(frozen=True)
+class ReportSlice:
+    """
+    Tranche du jeu de données : égalités colonne = valeur (toutes vraies).
+
+    Example:
+        ReportSlice.parse("ville=Paris,mois=2025-03")
+    """
+
+    filters: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "ReportSlice":
+        filters = []
+        for part in spec.split(","):
+            column, sep, value = part.partition("=")
+            if not sep or not column.strip():
+                raise ValueError(f"Tranche invalide : {spec!r} (attendu colonne=valeur[,colonne=valeur])")
+            filters.append((column.strip(), value.strip()))
+        return cls(tuple(filters))
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(c for c, _ in self.filters)
+
+    @property
+    def values(self) -> Tuple[str, ...]:
+        return tuple(v for _, v in self.filters)
+
+    @property
+    def name(self) -> str:
+        return "_".join(f"{c}-{v}" for c, v in self.filters)
+
+    @property
+    def filename(self) -> str:
+        return "rapport_" + re.sub(r"[^\w.-]+", "_", self.name) + ".pdf"
+
+    @property
+    def title(self) -> str:
+        return "Rapport de Ventes - " + ", ".join(f"{c} {v}" for c, v in self.filters)
+
+
+def expand_slices(df: pd.DataFrame, specs: Sequence[str]) -> List[ReportSlice]:
+    """
+    Tranches à partir de spécifications texte ; `*` = une tranche par valeur
+    présente (ex : "ville=*" -> un rapport par ville, "ville=*,mois=*" ->
+    un rapport par couple ville / mois observé).
+    """
+    slices: List[ReportSlice] = []
+    for spec in specs:
+        pattern = ReportSlice.parse(spec)
+        wildcard = [c for c, v in pattern.filters if v == "*"]
+        if not wildcard:
+            slices.append(pattern)
+            continue
+        keys = _key_frame(df, list(pattern.columns))
+        fixed = {c: v for c, v in pattern.filters if v != "*"}
+        for c, v in fixed.items():
+            keys = keys[keys[c] == v]
+        combos = keys[wildcard].dropna().astype(object).drop_duplicates().sort_values(wildcard)
+        for row in combos.itertuples(index=False):
+            values = dict(zip(wildcard, row))
+            slices.append(ReportSlice(tuple((c, values.get(c, fixed.get(c))) for c in pattern.columns)))
+    # Sans doublons, ordre conservé
+    return list(dict.fromkeys(slices))
+
+
+def _key_frame(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Colonnes de découpage (dérivées au besoin), valeurs en texte."""
+    out = {}
+    for col in columns:
+        if col in df.columns:
+            values = df[col]
+        elif col in DERIVED_COLUMNS:
+            values = DERIVED_COLUMNS[col](df)
+        else:
+            raise ValueError(f"Colonne de découpage inconnue : {col!r}")
+        # Texte via les valeurs distinctes seulement
+        codes, uniques = pd.factorize(values)
+        labels = pd.Series(pd.Index(uniques).astype(str))
+        out[col] = _recode(codes, labels)
+    return pd.DataFrame(out, index=df.index)
+
+
+@dataclass
+class SliceAggregates:
+    """Tout ce qu'il faut pour dessiner le rapport d'une tranche (quelques Ko)."""
+
+    slice: ReportSlice
+    rows: int
+    revenue: float
+    quantity: float
+    by_dimension: Dict[str, pd.Series] = field(default_factory=dict)
+
+
+def compute_slice_aggregates(df: pd.DataFrame, slices: Sequence[ReportSlice]) -> List[SliceAggregates]:
+    """
+    Agrégats de toutes les tranches : un seul groupby (colonnes de découpage
+    + categorie, ville, produit) par combinaison de colonnes de découpage,
+    puis les totaux de chaque tranche sont repliés à partir de ce résultat.
+    Les lignes sans categorie, ville ou produit comptent dans les totaux,
+    seule la répartition par dimension les ignore.
+    """
+    revenue = df["prix"] * df["quantite"].fillna(0)
+    by_columns: Dict[Tuple[str, ...], List[ReportSlice]] = {}
+    for s in slices:
+        by_columns.setdefault(s.columns, []).append(s)
+
+    results: Dict[ReportSlice, SliceAggregates] = {}
+    for columns, group in by_columns.items():
+        keys = _key_frame(df, list(columns))
+        keys.columns = [f"_tranche_{c}" for c in columns]
+        data = pd.concat([keys, df[list(_DIMENSIONS)], revenue.rename("revenu"),
+                          df["quantite"].rename("quantite")], axis=1)
+        base = (
+            data.groupby(list(keys.columns) + list(_DIMENSIONS), observed=True, sort=False, dropna=False)
+            .agg(revenu=("revenu", "sum"), quantite=("quantite", "sum"), lignes=("revenu", "size"))
+            .reset_index()
+        )
+        wanted = set(group)
+        # Tranches à valeur manquante écartées ici (dropna par défaut), pas avant
+        for values, part in base.groupby(list(keys.columns), observed=True, sort=False):
+            values = values if isinstance(values, tuple) else (values,)
+            current = ReportSlice(tuple(zip(columns, (str(v) for v in values))))
+            if current not in wanted:
+                continue
+            results[current] = SliceAggregates(
+                slice=current,
+                rows=int(part["lignes"].sum()),
+                revenue=float(part["revenu"].sum()),
+                quantity=float(part["quantite"].sum()),
+                by_dimension={
+                    dim: part.groupby(dim, observed=True)["revenu"].sum().sort_values(ascending=False)
+                    for dim in _DIMENSIONS
+                },
+            )
+
+    return [results.get(s) or SliceAggregates(s, 0, 0.0, 0.0) for s in slices]
+
+
+# --------------------------------------------------------------
+# Rendu (exécuté dans les processus du pool)
+# --------------------------------------------------------------
+def _bar_chart(series: pd.Series, title: str, xlabel: str, rotation: int = 45):
+    """Graphique en barres rendu en mémoire (image PIL), sans fichier PNG intermédiaire."""
+    # API objet de matplotlib (pas de pyplot) : aucun état global partagé
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    # Mise en page calculée au rendu : un seul dessin (bbox_inches="tight" en fait deux)
+    fig = Figure(figsize=(8, 5), layout="tight")
+    ax = fig.subplots()
+    ax.bar([str(i) for i in series.index], series.to_numpy(), edgecolor="black")
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Chiffre d'affaires")
+    ax.tick_params(axis="x", labelrotation=rotation)
+    ax.grid(axis="y")
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    return Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba()).convert("RGB")
+
+
+def render_slice_report(aggregates: SliceAggregates, output_dir: str, top_n: int = 10,
+                        max_categories: int = 20) -> str:
+    """Graphiques puis PDF d'une tranche ; retourne le chemin du PDF."""
+    from .report_generator import write_pdf
+
+    s = aggregates.slice
+    dims = aggregates.by_dimension
+
+    def others(series: pd.Series) -> pd.Series:
+        return top_n_with_other(pd.Series(series.index), series.to_numpy(), max_categories)
+
+    charts = [
+        ("Ventes par catégorie", _bar_chart(others(dims["categorie"]), "Chiffre d'affaires par catégorie", "Catégorie")),
+        ("Ventes par ville", _bar_chart(others(dims["ville"]), "Chiffre d'affaires par ville", "Ville")),
+        ("Top produits", _bar_chart(dims["produit"].head(top_n), f"Top {top_n} produits par chiffre d'affaires",
+                                    "Produit")),
+    ]
+    return write_pdf(os.path.join(output_dir, s.filename), charts, title=s.title)
+
+
+@dataclass
+class BatchResult:
+    paths: Dict[str, str]
+    empty: List[str]
+    seconds: float
+
+    @property
+    def reports_per_minute(self) -> float:
+        return len(self.paths) * 60.0 / self.seconds if self.seconds > 0 else float("inf")
+
+
+class BatchReportGenerator:
+    """
+    Génère un rapport PDF par tranche.
+
+    - agrégats de toutes les tranches en un passage groupé sur les données
+    - graphiques + PDF de chaque tranche dans un pool de processus
+      (`max_workers`, 1 = séquentiel) : seuls les agrégats, quelques Ko par
+      tranche, sont transmis aux processus
+    - les tranches sans ligne sont ignorées (listées dans `empty`)
+
+    Example:
+        gen = BatchReportGenerator(df_clean, output_dir="reports/tranches")
+        result = gen.generate(expand_slices(df_clean, ["ville=*", "mois=*"]))
+        print(f"{result.reports_per_minute:.0f} rapports/min")
+    """
+
+    def __init__(self, df: pd.DataFrame, output_dir: str = "reports", top_n: int = 10,
+                 max_workers: Optional[int] = None):
+        if isinstance(df, SalesTable):
+            df = df.to_frame()
+        self.df = df
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def generate(self, slices: Sequence) -> BatchResult:
+        """`slices` : ReportSlice ou spécifications texte ("ville=Paris", "mois=*"...)."""
+        start = time.perf_counter()
+        specs = [s for s in slices if isinstance(s, str)]
+        slices = [s for s in slices if isinstance(s, ReportSlice)] + expand_slices(self.df, specs)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        aggregates = compute_slice_aggregates(self.df, slices)
+        todo = [a for a in aggregates if a.rows > 0]
+        empty = [a.slice.name for a in aggregates if a.rows == 0]
+
+        if self.max_workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(todo))) as pool:
+                paths = list(pool.map(render_slice_report, todo, [self.output_dir] * len(todo),
+                                      [self.top_n] * len(todo)))
+        else:
+            paths = [render_slice_report(a, self.output_dir, self.top_n) for a in todo]
+
+        result = BatchResult(dict(zip((a.slice.name for a in todo), paths)), empty, time.perf_counter() - start)
+        logger.info("%d rapports en %.1fs (%.1f rapports/min), %d tranches vides", len(result.paths),
+                    result.seconds, result.reports_per_minute, len(empty))
+        return result
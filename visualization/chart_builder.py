@@ -1,8 +1,23 @@
-import matplotlib.pyplot as plt
-import plotly.express as px
+import numpy as np
 import pandas as pd
 from typing import Optional
 
+from data_processor.sales_table import SalesTable
+
+from .data_reduction import aggregate_by, binned_histogram, lttb, top_n_with_other
+
+
+def _pyplot():
+    """Import différé de matplotlib (coûteux) : chargé au premier graphique."""
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _plotly_express():
+    """Import différé de plotly : chargé uniquement pour les graphiques interactifs."""
+    import plotly.express as px
+    return px
+
 
 class ChartBuilder:
     """
@@ -11,10 +26,21 @@ class ChartBuilder:
 
     df est supposé contenir au minimum :
     - date, produit, categorie, prix, quantite, ville, source
+    (DataFrame ou SalesTable compacte)
+
+    Les données sont réduites avant d'être tracées (voir data_reduction) :
+    histogrammes pré-calculés, une barre par valeur de x (au plus
+    `max_categories`, le reste regroupé dans "Autres"), courbes réduites à
+    `max_points` points par LTTB. Le coût du rendu dépend donc de la taille
+    du graphique, pas du nombre de lignes.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, max_points: int = 2000, max_categories: int = 20):
+        if isinstance(df, SalesTable):
+            df = df.to_frame()
         self.df = df.copy()
+        self.max_points = max_points
+        self.max_categories = max_categories
 
         # Si la colonne total n'existe pas, on la calcule (CA = prix * quantite)
         if "total" not in self.df.columns and {"prix", "quantite"}.issubset(self.df.columns):
@@ -24,8 +50,10 @@ class ChartBuilder:
 
     def plot_histogram(self, column: str, bins: int = 10, save_path: Optional[str] = None):
         """Génère un histogramme d'une colonne numérique."""
+        plt = _pyplot()
+        counts, edges, _ = binned_histogram(self.df[column], bins=bins)
         plt.figure(figsize=(8, 5))
-        plt.hist(self.df[column].dropna(), bins=bins, edgecolor="black")
+        plt.bar(edges[:-1], counts, width=np.diff(edges), align="edge", edgecolor="black")
         plt.title(f"Histogramme de {column}")
         plt.xlabel(column)
         plt.ylabel("Fréquence")
@@ -34,10 +62,26 @@ class ChartBuilder:
             plt.savefig(save_path, bbox_inches="tight")
         plt.show()
 
-    def plot_bar(self, x_col: str, y_col: str, save_path: Optional[str] = None):
-        """Génère un graphique en barres simple."""
+    def _bars(self, x_col: str, y_col: str, agg: str = "sum") -> pd.Series:
+        """
+        Valeurs des barres : les lignes telles quelles si x est déjà unique
+        (données agrégées), sinon `agg` de y par x, limité à max_categories.
+        """
+        x = self.df[x_col]
+        if len(x) <= self.max_categories and x.is_unique:
+            return pd.Series(self.df[y_col].to_numpy(), index=x.to_numpy())
+        grouped = aggregate_by(self.df, x_col, y_col, agg)
+        if agg == "sum":
+            return top_n_with_other(grouped[x_col], grouped[y_col], self.max_categories)
+        grouped = grouped.sort_values(y_col, ascending=False).head(self.max_categories)
+        return pd.Series(grouped[y_col].to_numpy(), index=grouped[x_col].astype(str).to_numpy())
+
+    def plot_bar(self, x_col: str, y_col: str, save_path: Optional[str] = None, agg: str = "sum"):
+        """Génère un graphique en barres simple (une barre par valeur de x)."""
+        plt = _pyplot()
+        bars = self._bars(x_col, y_col, agg)
         plt.figure(figsize=(8, 5))
-        plt.bar(self.df[x_col], self.df[y_col], edgecolor="black")
+        plt.bar(bars.index, bars.to_numpy(), edgecolor="black")
         plt.title(f"{y_col} par {x_col}")
         plt.xlabel(x_col)
         plt.ylabel(y_col)
@@ -49,7 +93,9 @@ class ChartBuilder:
 
     def plot_pie(self, column: str, save_path: Optional[str] = None):
         """Génère un camembert pour une colonne catégorielle."""
+        plt = _pyplot()
         counts = self.df[column].value_counts()
+        counts = top_n_with_other(pd.Series(counts.index), counts.to_numpy(), self.max_categories)
         plt.figure(figsize=(6, 6))
         plt.pie(
             counts,
@@ -68,17 +114,14 @@ class ChartBuilder:
         """
         Graphique en barres : chiffre d'affaires par catégorie.
         """
+        plt = _pyplot()
         if "categorie" not in self.df.columns or "total" not in self.df.columns:
             raise ValueError("Colonnes 'categorie' ou 'total' manquantes pour plot_sales_by_category().")
 
-        grouped = (
-            self.df.groupby("categorie", as_index=False)
-            .agg(total_revenue=("total", "sum"))
-            .sort_values("total_revenue", ascending=False)
-        )
+        totals = top_n_with_other(self.df["categorie"], self.df["total"], self.max_categories)
 
         plt.figure(figsize=(8, 5))
-        plt.bar(grouped["categorie"], grouped["total_revenue"], edgecolor="black")
+        plt.bar(totals.index, totals.to_numpy(), edgecolor="black")
         plt.title("Chiffre d'affaires par catégorie")
         plt.xlabel("Catégorie")
         plt.ylabel("Chiffre d'affaires")
@@ -93,17 +136,14 @@ class ChartBuilder:
         """
         Graphique en barres : chiffre d'affaires par ville.
         """
+        plt = _pyplot()
         if "ville" not in self.df.columns or "total" not in self.df.columns:
             raise ValueError("Colonnes 'ville' ou 'total' manquantes pour plot_sales_by_city().")
 
-        grouped = (
-            self.df.groupby("ville", as_index=False)
-            .agg(total_revenue=("total", "sum"))
-            .sort_values("total_revenue", ascending=False)
-        )
+        totals = top_n_with_other(self.df["ville"], self.df["total"], self.max_categories)
 
         plt.figure(figsize=(8, 5))
-        plt.bar(grouped["ville"], grouped["total_revenue"], edgecolor="black")
+        plt.bar(totals.index, totals.to_numpy(), edgecolor="black")
         plt.title("Chiffre d'affaires par ville")
         plt.xlabel("Ville")
         plt.ylabel("Chiffre d'affaires")
@@ -118,11 +158,12 @@ class ChartBuilder:
         """
         Graphique en barres : top N produits par chiffre d'affaires.
         """
+        plt = _pyplot()
         if "produit" not in self.df.columns or "total" not in self.df.columns:
             raise ValueError("Colonnes 'produit' ou 'total' manquantes pour plot_top_products().")
 
         grouped = (
-            self.df.groupby("produit", as_index=False)
+            self.df.groupby("produit", as_index=False, observed=True)
             .agg(total_revenue=("total", "sum"))
             .sort_values("total_revenue", ascending=False)
             .head(n)
@@ -142,12 +183,26 @@ class ChartBuilder:
 
     #  Plotly pour interactivité 
 
-    def interactive_line(self, x_col: str, y_col: str):
-        """Graphique interactif de type ligne avec Plotly."""
-        fig = px.line(self.df, x=x_col, y=y_col, title=f"{y_col} par {x_col}")
+    def interactive_line(self, x_col: str, y_col: str, agg: str = "sum"):
+        """
+        Graphique interactif de type ligne avec Plotly : y agrégé par x
+        (si x se répète), trié, puis réduit à max_points points (LTTB).
+        """
+        px = _plotly_express()
+        data = self.df[[x_col, y_col]].dropna(subset=[x_col])
+        if data[x_col].is_unique:
+            data = data.sort_values(x_col)
+        else:
+            data = aggregate_by(data, x_col, y_col, agg)
+        x, y = lttb(data[x_col].to_numpy(), data[y_col].to_numpy(), self.max_points)
+        fig = px.line(x=x, y=y, title=f"{y_col} par {x_col}", labels={"x": x_col, "y": y_col})
         fig.show()
+        return fig
 
-    def interactive_bar(self, x_col: str, y_col: str):
-        """Graphique interactif de type barres avec Plotly."""
-        fig = px.bar(self.df, x=x_col, y=y_col, title=f"{y_col} par {x_col}")
+    def interactive_bar(self, x_col: str, y_col: str, agg: str = "sum"):
+        """Graphique interactif de type barres avec Plotly (une barre par valeur de x)."""
+        px = _plotly_express()
+        bars = self._bars(x_col, y_col, agg)
+        fig = px.bar(x=bars.index, y=bars.to_numpy(), title=f"{y_col} par {x_col}", labels={"x": x_col, "y": y_col})
         fig.show()
+        return fig
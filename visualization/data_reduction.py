@@ -0,0 +1,115 @@
+"""
+Réduction des données avant affichage : les graphiques reçoivent des
+tableaux dont la taille dépend du nombre de barres / points affichables,
+jamais du nombre de lignes du jeu de données.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def binned_histogram(values, bins: int = 50, log: bool = False) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Histogramme pré-calculé avec `np.histogram`.
+
+    log=True : classes espacées géométriquement (distributions très
+    asymétriques, ex : prix) ; seules les valeurs > 0 sont représentables.
+
+    Returns
+    -------
+    (counts, edges, excluded)
+        `excluded` = nombre de valeurs non représentées (NaN, infinies, ou
+        <= 0 en échelle log), à signaler plutôt que de faire échouer le graphique.
+    """
+    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    keep = np.isfinite(values)
+    if log:
+        keep &= values > 0
+    kept = values[keep]
+    excluded = int(len(values) - len(kept))
+    if len(kept) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), excluded
+
+    low, high = kept.min(), kept.max()
+    if log:
+        edges = np.geomspace(low, high, bins + 1) if high > low else np.array([low, low * 10])
+    else:
+        edges = np.histogram_bin_edges(kept, bins=bins)
+    counts, edges = np.histogram(kept, bins=edges)
+    return counts, edges, excluded
+
+
+def aggregate_by(df: pd.DataFrame, x_col: str, y_col: str, agg: str = "sum") -> pd.DataFrame:
+    """Une ligne par valeur de `x_col` (somme, moyenne... de `y_col`)."""
+    return df.groupby(x_col, observed=True, sort=True)[y_col].agg(agg).reset_index()
+
+
+def cap_points(x, y, max_points: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Au plus `max_points` points : la série (triée par x) est découpée en
+    paquets consécutifs de même taille, remplacés par leur premier x et
+    la moyenne de leurs y.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return x, y
+    bounds = np.linspace(0, len(x), max_points + 1).astype(np.int64)
+    starts = bounds[:-1]
+    sizes = np.diff(bounds)
+    with np.errstate(invalid="ignore"):
+        means = np.add.reduceat(np.nan_to_num(y), starts) / np.add.reduceat(~np.isnan(y), starts)
+    return x[starts], np.where(sizes > 0, means, np.nan)
+
+
+def lttb(x, y, n_out: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013) : `n_out` points qui
+    conservent la forme visuelle d'une courbe (pics et creux), contrairement
+    à une moyenne par paquet. x doit être trié ; les y manquants sont ignorés.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # Les dates sont traitées comme des entiers (ns) pour le calcul des aires
+    if x.dtype.kind == "M":
+        xf = x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    elif x.dtype.kind in "iuf":
+        xf = x.astype(np.float64)
+    else:
+        xf = np.arange(n, dtype=np.float64)  # libellés : positions régulières
+    # Premier et dernier points conservés ; n_out - 2 paquets entre les deux
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xf[stop:next_stop].mean(), y[stop:next_stop].mean()
+        areas = np.abs((xf[a] - avg_x) * (y[start:stop] - y[a]) - (xf[a] - xf[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return x[selected], y[selected]
+
+
+def top_n_with_other(labels, values, n: int = 20, other_label: str = "Autres") -> pd.Series:
+    """
+    Somme de `values` par libellé, triée ; au-delà des `n` premiers, les
+    libellés sont regroupés dans une seule entrée `other_label`. Les
+    libellés sont renvoyés en texte.
+    """
+    # Les Series (catégorielles notamment) sont regroupées sans conversion en objets
+    keys = labels.reset_index(drop=True) if isinstance(labels, pd.Series) else np.asarray(labels, dtype=object)
+    totals = pd.Series(np.asarray(values, dtype=np.float64)).groupby(keys, observed=True).sum()
+    # Libellés en texte : "Autres" côtoie des valeurs numériques (ex : quantite)
+    totals.index = totals.index.astype(str)
+    totals = totals.sort_values(ascending=False, kind="stable")
+    if len(totals) <= n:
+        return totals
+    head = totals.iloc[:n]
+    return pd.concat([head, pd.Series({other_label: totals.iloc[n:].sum()})])
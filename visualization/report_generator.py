@@ -1,12 +1,12 @@
+import base64
+import io
 import os
+from html import escape
+
+import numpy as np
 import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from .chart_builder import ChartBuilder
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+from .chart_builder import ChartBuilder, _pyplot
+from .data_reduction import aggregate_by, binned_histogram, lttb, top_n_with_other
 
 
 class ReportGenerator:
@@ -30,9 +30,6 @@ class ReportGenerator:
 
     def generate_pdf_report(self, filename: str = "rapport_ventes.pdf", charts_dir: str = None):
         pdf_path = os.path.join(self.output_dir, filename)
-        c = canvas.Canvas(pdf_path, pagesize=A4)
-        width, height = A4
-
         if charts_dir is None:
             charts_dir = os.path.join(self.output_dir, "charts")
 
@@ -41,68 +38,179 @@ class ReportGenerator:
             ("Ventes par ville", os.path.join(charts_dir, "ventes_par_ville.png")),
             ("Top produits", os.path.join(charts_dir, "top_produits.png")),
          ]
+        write_pdf(pdf_path, charts)
+        print(f"[INFO] PDF généré : {pdf_path}")
 
-        def header(title: str):
-            c.setFont("Helvetica-Bold", 18)
-            c.drawString(50, height - 50, "Rapport de Ventes 2025")
-            c.setFont("Helvetica-Bold", 13)
-            c.drawString(50, height - 80, title)
 
-        for title, img_path in charts:
-            if not os.path.exists(img_path):
+    # ---------------------- HTML ----------------------
+    def generate_html_report(self, filename: str = "rapport_ventes.html", interactive: bool = True,
+                             bins: int = 50, max_points: int = 1000, top_n: int = 20,
+                             include_plotlyjs: str = "cdn") -> str:
+        """
+        Rapport HTML autonome, de taille bornée quel que soit le nombre de lignes.
+
+        Les données sont agrégées avant affichage (histogrammes calculés par
+        NumPy, une barre par groupe, séries réduites à `max_points` points par LTTB) et
+        embarquées dans le fichier : graphiques Plotly (interactive=True) ou
+        images PNG en base64, sans chemin absolu. Le fichier est écrit au
+        fur et à mesure, section par section.
+
+        include_plotlyjs : "cdn" (léger) ou "inline" (consultable hors ligne).
+        """
+        html_path = os.path.join(self.output_dir, filename)
+        render = self._plotly_html if interactive else self._png_html
+
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Rapport Ventes</title></head><body>')
+            f.write("<h1>Rapport de Ventes 2025</h1>")
+            f.write(self._summary_html())
+            first_chart = True
+            for section in self._html_sections(bins, max_points, top_n):
+                f.write(f"<h2>{escape(section['title'])}</h2>")
+                if section.get("note"):
+                    f.write(f"<p><em>{escape(section['note'])}</em></p>")
+                if section["kind"] == "empty":
+                    continue  # aucune donnée représentable : la note seule
+                # plotly.js est embarqué avec le premier graphique effectivement rendu
+                f.write(render(section, include_plotlyjs if first_chart else False))
+                first_chart = False
+            f.write("</body></html>")
+
+        print(f"[INFO] HTML généré : {html_path}")
+        return html_path
+
+    def _summary_html(self) -> str:
+        rows = [
+            ("Lignes", f"{len(self.df):,}"),
+            ("Chiffre d'affaires", f"{float(np.nansum(self.df['total_ventes'])):,.2f}"),
+        ]
+        for col, label in (("produit", "Produits distincts"), ("ville", "Villes")):
+            if col in self.df.columns:
+                rows.append((label, f"{self.df[col].nunique():,}"))
+        cells = "".join(f"<tr><th>{escape(k)}</th><td>{escape(v)}</td></tr>" for k, v in rows)
+        return f"<table>{cells}</table>"
+
+    def _html_sections(self, bins: int, max_points: int, top_n: int):
+        """Données pré-agrégées de chaque graphique (tailles indépendantes du nombre de lignes)."""
+        for col, title, log in (("quantite", "Histogramme Quantité", False), ("prix", "Distribution des prix (échelle log)", True)):
+            if col not in self.df.columns:
+                continue
+            counts, edges, excluded = binned_histogram(self.df[col], bins=bins, log=log)
+            if len(edges) == 0:
+                yield {"title": title, "kind": "empty", "note": f"{excluded:,} valeurs non représentées"}
                 continue
+            yield {
+                "title": title, "kind": "hist", "x": edges, "y": counts, "xlabel": col, "ylabel": "Fréquence",
+                "log_x": log, "note": f"{excluded:,} valeurs non représentées" if excluded else None,
+            }
 
-            header(title)
+        for col, title in (("categorie", "Total ventes par catégorie"), ("ville", "Total ventes par ville")):
+            if col not in self.df.columns:
+                continue
+            totals = top_n_with_other(self.df[col], self.df["total_ventes"], top_n)
+            yield {"title": title, "kind": "bar", "x": totals.index.astype(str).to_numpy(), "y": totals.to_numpy(),
+                   "xlabel": col, "ylabel": "Chiffre d'affaires"}
+
+        if "date" in self.df.columns:
+            days = pd.to_datetime(self.df["date"], errors="coerce").dt.normalize()
+            daily = aggregate_by(pd.DataFrame({"jour": days, "total_ventes": self.df["total_ventes"]}), "jour", "total_ventes")
+            if len(daily):
+                x, y = lttb(daily["jour"].to_numpy(), daily["total_ventes"].to_numpy(), max_points)
+                yield {"title": "Chiffre d'affaires par jour", "kind": "line", "x": x, "y": y,
+                       "xlabel": "date", "ylabel": "Chiffre d'affaires"}
+
+    @staticmethod
+    def _plotly_html(section: dict, include_plotlyjs) -> str:
+        import plotly.graph_objects as go
+
+        if section["kind"] == "hist":
+            edges = section["x"]
+            trace = go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=section["y"], width=np.diff(edges))
+        elif section["kind"] == "bar":
+            trace = go.Bar(x=section["x"], y=section["y"])
+        else:
+            trace = go.Scatter(x=section["x"], y=section["y"], mode="lines")
+        fig = go.Figure(trace)
+        fig.update_layout(xaxis_title=section["xlabel"], yaxis_title=section["ylabel"], bargap=0)
+        if section.get("log_x"):
+            fig.update_xaxes(type="log")
+        return fig.to_html(full_html=False, include_plotlyjs=include_plotlyjs)
+
+    @staticmethod
+    def _png_html(section: dict, include_plotlyjs=None) -> str:
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(8, 5))
+        if section["kind"] == "hist":
+            edges = section["x"]
+            ax.stairs(section["y"], edges, fill=True)
+            if section.get("log_x"):
+                ax.set_xscale("log")
+        elif section["kind"] == "bar":
+            ax.bar(section["x"], section["y"], edgecolor="black")
+            ax.tick_params(axis="x", labelrotation=45)
+        else:
+            ax.plot(section["x"], section["y"])
+        ax.set_xlabel(section["xlabel"])
+        ax.set_ylabel(section["ylabel"])
+        ax.grid(axis="y")
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+        plt.close(fig)
+        data = base64.b64encode(buffer.getvalue()).decode("ascii")
+        return f'<img src="data:image/png;base64,{data}" width="600">'
+
+
+def write_pdf(pdf_path: str, charts, title: str = "Rapport de Ventes 2025") -> str:
+    """
+    PDF d'une page par graphique : `charts` = [(titre de section, image)],
+    image = chemin PNG (ignoré s'il n'existe pas) ou image PIL déjà en
+    mémoire. Utilisé par ReportGenerator et par les rapports en lot.
+    """
+    # reportlab n'est chargé qu'à la génération d'un PDF
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.utils import ImageReader
 
-        # Zone image (marges)
-            left = 50
-            bottom = 90
-            available_w = width - 2 * left
-            available_h = height - 140  # laisse de l'air pour titres + bas de page
+    c = canvas.Canvas(pdf_path, pagesize=A4)
+    width, height = A4
 
-            img = ImageReader(img_path)
-            iw, ih = img.getSize()
+    def header(section: str):
+        c.setFont("Helvetica-Bold", 18)
+        c.drawString(50, height - 50, title)
+        c.setFont("Helvetica-Bold", 13)
+        c.drawString(50, height - 80, section)
 
-        # conserve le ratio
-            scale = min(available_w / iw, available_h / ih)
-            draw_w = iw * scale
-            draw_h = ih * scale
+    for section, img_path in charts:
+        if isinstance(img_path, str) and not os.path.exists(img_path):
+            continue
 
-            x = left + (available_w - draw_w) / 2
-            y = bottom + (available_h - draw_h) / 2
+        header(section)
 
-            c.drawImage(img, x, y, width=draw_w, height=draw_h, preserveAspectRatio=True, mask='auto')
+        # Zone image (marges)
+        left = 50
+        bottom = 90
+        available_w = width - 2 * left
+        available_h = height - 140  # laisse de l'air pour titres + bas de page
 
-        # numéro de page (optionnel)
-            c.setFont("Helvetica", 9)
-            c.drawRightString(width - 50, 30, f"Page {c.getPageNumber()}")
+        img = ImageReader(img_path)
+        iw, ih = img.getSize()
 
-            c.showPage()
+        # conserve le ratio
+        scale = min(available_w / iw, available_h / ih)
+        draw_w = iw * scale
+        draw_h = ih * scale
 
-        c.save()
-        print(f"[INFO] PDF généré : {pdf_path}")
+        x = left + (available_w - draw_w) / 2
+        y = bottom + (available_h - draw_h) / 2
 
+        c.drawImage(img, x, y, width=draw_w, height=draw_h, preserveAspectRatio=True, mask='auto')
 
-    # ---------------------- HTML ----------------------
-    def generate_html_report(self, filename: str = "rapport_ventes.html"):
-        html_path = os.path.join(self.output_dir, filename)
-        html_content = "<html><head><title>Rapport Ventes</title></head><body>"
-        html_content += "<h1>Rapport de Ventes 2025</h1>"
-
-        # Ajouter histogramme
-        hist_path = os.path.join(self.output_dir, "hist_quantite.png")
-        self.chart_builder.plot_histogram("quantite", save_path=hist_path)
-        html_content += f'<h2>Histogramme Quantité</h2><img src="{hist_path}" width="600">'
-
-        # Ajouter bar chart
-        bar_path = os.path.join(self.output_dir, "bar_categorie.png")
-        agg_df = self.df.groupby("categorie")["total_ventes"].sum().reset_index()
-        self.chart_builder.df = agg_df
-        self.chart_builder.plot_bar("categorie", "total_ventes", save_path=bar_path)
-        html_content += f'<h2>Total ventes par catégorie</h2><img src="{bar_path}" width="600">'
-
-        html_content += "</body></html>"
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # numéro de page (optionnel)
+        c.setFont("Helvetica", 9)
+        c.drawRightString(width - 50, 30, f"Page {c.getPageNumber()}")
 
-        print(f"[INFO] HTML généré : {html_path}")
+        c.showPage()
+
+    c.save()
+    return pdf_path